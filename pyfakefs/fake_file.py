@@ -20,11 +20,15 @@ import errno
 import io
 import os
 import sys
+import threading
 import traceback
 import weakref
 from stat import (
     S_IFREG,
     S_IFDIR,
+    S_ISDIR,
+    S_ISLNK,
+    S_ISREG,
 )
 from types import TracebackType
 from typing import (
@@ -37,12 +41,13 @@ from typing import (
     TYPE_CHECKING,
 )
 
-from collections.abc import Callable, Iterator
+from collections.abc import Callable, Iterable, Iterator
 
 from pyfakefs import helpers
 from pyfakefs.helpers import (
     FakeStatResult,
     BinaryBufferIO,
+    OffsetBinaryBufferIO,
     TextBufferIO,
     is_int_type,
     is_unicode_string,
@@ -65,6 +70,7 @@ io_open = io.open
 
 AnyFileWrapper = Union[
     "FakeFileWrapper",
+    "FakeFileIO",
     "FakeDirWrapper",
     "StandardStreamWrapper",
     "FakePipeWrapper",
@@ -180,11 +186,14 @@ class FakeFile:
         self.st_size: int = 0
         self.encoding: str | None = real_encoding(encoding)
         self.errors: str = errors or "strict"
-        self._byte_contents: bytes | None = self._encode_contents(contents)
+        # may temporarily be a bytearray while the file is written incrementally
+        self._byte_contents: bytes | bytearray | None = self._encode_contents(contents)
         self.stat_result.st_size = (
             len(self._byte_contents) if self._byte_contents is not None else 0
         )
         self.epoch: int = 0
+        # the epoch of the last change that did not only append contents
+        self._rewrite_epoch: int = 0
         self.parent_dir: weakref.ReferenceType | None = None
         # Linux specific: extended file system attributes
         self.xattr: dict = {}
@@ -216,6 +225,8 @@ class FakeFile:
     @property
     def byte_contents(self) -> bytes | None:
         """Return the contents as raw byte array."""
+        if isinstance(self._byte_contents, bytearray):
+            self._byte_contents = bytes(self._byte_contents)
         return self._byte_contents
 
     @property
@@ -292,6 +303,10 @@ class FakeFile:
         """
         return self._byte_contents is None
 
+    def check_metadata_writable(self) -> None:
+        """Raise `OSError` if the permissions, owner or times of the file
+        cannot be changed."""
+
     def _encode_contents(self, contents: str | bytes | None) -> bytes | None:
         if is_unicode_string(contents):
             contents = bytes(
@@ -326,6 +341,7 @@ class FakeFile:
         self._byte_contents = byte_contents
         self.st_size = st_size
         self.epoch += 1
+        self._rewrite_epoch = self.epoch
         return changed
 
     def set_contents(self, contents: AnyStr, encoding: str | None = None) -> bool:
@@ -351,6 +367,61 @@ class FakeFile:
             self._side_effect(self)
         return changed
 
+    def update_contents(
+        self,
+        contents: bytes | memoryview,
+        offset: int,
+        encoding: str | None = None,
+        truncate: bool = True,
+    ) -> bool:
+        """Replaces the file contents starting at `offset` with the given
+        contents, and increases the modification time. Also executes the
+        side_effects if available.
+        As opposed to :py:meth:`set_contents`, only the replaced part of the
+        contents is compared and copied, which makes writing large files
+        in chunks much faster.
+
+        Args:
+          contents: The new contents starting at `offset`.
+          offset: The position of the new contents, must not be greater
+                  than the current size.
+          encoding: The encoding of the contents, see :py:meth:`set_contents`.
+          truncate: If `False`, any contents after the replaced part
+                  are kept, otherwise they are removed.
+
+        Returns:
+            `True` if the contents have been changed.
+
+        Raises:
+          OSError: if the new size exceeds the available file system space.
+        """
+        if not isinstance(self._byte_contents, bytearray):
+            self._byte_contents = bytearray(self.byte_contents or b"")
+        byte_contents = self._byte_contents
+        current_size = len(byte_contents)
+        end = offset + len(contents)
+        if truncate or end >= current_size:
+            st_size = end
+            end = current_size
+        else:
+            st_size = current_size
+        # only appending new bytes always changes the contents
+        changed = offset == current_size and st_size > current_size
+        if not changed:
+            changed = byte_contents[offset:end] != contents
+        self.filesystem.change_disk_usage(
+            st_size - current_size, self.name, self.st_dev
+        )
+        byte_contents[offset:end] = contents
+        self.st_size = st_size
+        self.epoch += 1
+        if offset < current_size:
+            self._rewrite_epoch = self.epoch
+        self.encoding = real_encoding(encoding)
+        if self._side_effect is not None:
+            self._side_effect(self)
+        return changed
+
     @property
     def size(self) -> int:
         """Return the size in bytes of the file contents."""
@@ -374,13 +445,112 @@ class FakeFile:
         self.filesystem.change_disk_usage(
             st_size - current_size, self.name, self.st_dev
         )
-        if self._byte_contents:
+        if self._byte_contents is not None:
             if st_size < current_size:
                 self._byte_contents = self._byte_contents[:st_size]
             else:
                 self._byte_contents += b"\0" * (st_size - current_size)
         self.st_size = st_size
         self.epoch += 1
+        if st_size < current_size:
+            self._rewrite_epoch = self.epoch
+
+    def appended_contents(self, epoch: int, offset: int) -> bytes | None:
+        """Return the contents after `offset` if the contents have only
+        been appended to since the given epoch, so that a stream holding
+        the contents of that epoch can be updated without copying all
+        contents.
+
+        Args:
+          epoch: The epoch of the contents known by the caller.
+          offset: The size of the contents known by the caller.
+
+        Returns:
+            The contents after `offset`, or `None` if the contents have
+            been changed otherwise since `epoch`.
+        """
+        contents = self._byte_contents
+        if self._rewrite_epoch > epoch or contents is None or offset > len(contents):
+            return None
+        if isinstance(contents, bytearray):
+            with memoryview(contents) as view:
+                return bytes(view[offset:])
+        return contents[offset:]
+
+    def view(self) -> memoryview:
+        """Return a read-only view of the contents, e.g. to inspect or hash
+        the contents of a large file in a test.
+        The view is a snapshot of the current contents, later changes
+        of the file are not reflected in it. The contents are copied once
+        if they have been changed by writing since they were last accessed,
+        otherwise the view shares the contents with the file.
+        """
+        return memoryview(self.byte_contents or b"")
+
+    def read_into(self, buffer: Any, offset: int) -> int:
+        """Copy the contents starting at `offset` directly into `buffer`.
+
+        Args:
+          buffer: A writable object supporting the buffer protocol.
+          offset: The position of the first byte to copy.
+
+        Returns:
+            The number of copied bytes.
+        """
+        contents = self._byte_contents
+        if not isinstance(contents, bytearray):
+            contents = self.byte_contents or b""
+        # contents currently written are not converted to bytes
+        with memoryview(buffer) as target, memoryview(contents) as source:
+            with target.cast("B") as target_bytes:
+                start = min(offset, len(source))
+                size = min(len(target_bytes), len(source) - start)
+                target_bytes[:size] = source[start : start + size]
+        return size
+
+    def copy_from(
+        self,
+        source: FakeFile,
+        offset: int = 0,
+        position: int = 0,
+        count: int | None = None,
+    ) -> int:
+        """Copy the contents of `source` starting at `offset` to `position`
+        in this file. If all contents of `source` are copied into an empty
+        file, both files share the contents instead of copying them, until
+        one of the files is changed.
+
+        Args:
+          source: The file to copy from, may be this file.
+          offset: The position of the first byte to copy from `source`.
+          position: The position of the copied contents in this file. A gap
+                  after the end of this file is filled with zero bytes.
+          count: The maximum number of bytes to copy, all remaining bytes
+                  if `None`.
+
+        Returns:
+            The number of copied bytes.
+
+        Raises:
+          OSError: if the new size exceeds the available file system space.
+        """
+        contents = source.byte_contents or b""
+        size = len(contents)
+        end = size if count is None else min(offset + count, size)
+        if offset >= end:
+            return 0
+        if offset == 0 and end == size and position == 0 and not self.st_size:
+            # the contents are immutable, and are replaced by a copy
+            # as soon as any of the files is written
+            self.set_contents(contents, self.encoding)
+        else:
+            if position > self.st_size:
+                self.size = position
+            with memoryview(contents) as view:
+                self.update_contents(
+                    view[offset:end], position, self.encoding, truncate=False
+                )
+        return end - offset
 
     @property
     def path(self) -> AnyStr:  # type: ignore[type-var]
@@ -451,6 +621,15 @@ class FakeNullFile(FakeFile):
     def set_initial_contents(self, contents: AnyStr) -> bool:
         return False
 
+    def update_contents(
+        self,
+        contents: bytes | memoryview,
+        offset: int,
+        encoding: str | None = None,
+        truncate: bool = True,
+    ) -> bool:
+        return False
+
 
 class FakeFileFromRealFile(FakeFile):
     """Represents a fake file copied from the real file system.
@@ -488,7 +667,7 @@ class FakeFileFromRealFile(FakeFile):
                 self._byte_contents = f.read()
         # On MacOS and BSD, the above io.open() updates atime on the real file
         self.st_atime = os.stat(self.file_path).st_atime
-        return self._byte_contents
+        return super().byte_contents
 
     def set_contents(self, contents, encoding=None):
         self.contents_read = True
@@ -755,6 +934,315 @@ class FakeDirectoryFromRealDirectory(FakeDirectory):
         raise self.filesystem.raise_os_error(errno.EISDIR, self.path)
 
 
+class FakeOverlayDirectory(FakeDirectory):
+    """Represents a fake directory in overlay mode, which is backed by the
+    real directory with the same path.
+
+    The real directory is only listed if the directory entries are accessed,
+    and the real entries are added as fake objects that read their contents
+    on demand only. As the listing is done only once, paths not existing in
+    the real directory are not looked up again. All changes are done in the
+    fake filesystem only; removed or renamed real entries do not reappear.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        source_path: str,
+        filesystem: FakeFilesystem,
+        real_stat: os.stat_result | None = None,
+    ):
+        """
+        Args:
+            name: The name of the directory.
+            source_path: Full path of the real directory.
+            filesystem: The fake filesystem where the directory is created.
+            real_stat: The stat result of the real directory, if available.
+        """
+        super().__init__(name=name, filesystem=filesystem)
+        if real_stat is not None:
+            self.stat_result.set_from_stat_result(real_stat)
+        self.source_path = source_path
+        self.contents_read = False
+
+    @property
+    def entries(self) -> dict[str, FakeFile]:
+        """Return the list of contained directory entries, adding the real
+        entries if not already done."""
+        if not self.contents_read:
+            self.contents_read = True
+            try:
+                with os.scandir(self.source_path) as scanned_entries:
+                    real_entries = list(scanned_entries)
+            except OSError:
+                real_entries = []
+            if self.filesystem.is_case_sensitive:
+                fake_names = set(self._entries)
+            else:
+                fake_names = {name.lower() for name in self._entries}
+            for real_entry in real_entries:
+                name = real_entry.name
+                if self.filesystem.is_case_sensitive:
+                    if name in fake_names:
+                        continue
+                elif name.lower() in fake_names:
+                    continue
+                self._add_real_entry(real_entry)
+        return self._entries
+
+    def _add_real_entry(self, real_entry: os.DirEntry) -> None:
+        try:
+            real_stat = real_entry.stat(follow_symlinks=False)
+        except OSError:
+            return
+        entry: FakeFile
+        if S_ISDIR(real_stat.st_mode):
+            entry = FakeOverlayDirectory(
+                real_entry.name, real_entry.path, self.filesystem, real_stat
+            )
+        else:
+            if S_ISREG(real_stat.st_mode):
+                entry = FakeFileFromRealFile(real_entry.path, self.filesystem)
+                entry.file_path = real_entry.path
+            elif S_ISLNK(real_stat.st_mode):
+                entry = FakeFile(
+                    real_entry.name,
+                    contents=os.readlink(real_entry.path),
+                    filesystem=self.filesystem,
+                )
+            else:
+                # special files like devices or sockets have no contents
+                entry = FakeFile(
+                    real_entry.name, contents=b"", filesystem=self.filesystem
+                )
+            entry.stat_result.set_from_stat_result(real_stat)
+        self._entries[real_entry.name] = entry
+        entry.parent_dir = weakref.ref(self)
+        self.filesystem.last_ino += 1
+        entry.st_ino = self.filesystem.last_ino
+        self.st_nlink += 1
+        entry.st_nlink += 1
+        entry.st_dev = self.st_dev
+        self.filesystem.change_disk_usage(entry.size, entry.name, entry.st_dev)
+
+    @property
+    def size(self) -> int:
+        # we cannot get the size until the contents are loaded
+        if not self.contents_read:
+            return 0
+        return super().size
+
+    @size.setter
+    def size(self, st_size: int) -> None:
+        raise self.filesystem.raise_os_error(errno.EISDIR, self.path)
+
+
+class FrozenTree:
+    """An immutable snapshot of a file or directory tree in the real
+    file system that is not bound to a specific fake filesystem.
+
+    The real file system is only accessed on demand, and the results
+    (directory listings, stat results and file contents) are cached in the
+    frozen tree itself. This means that a frozen tree can be created once,
+    for example on module or session level, and mounted into any number of
+    fake filesystems using
+    :py:meth:`add_frozen_tree()<pyfakefs.fake_filesystem.FakeFilesystem.add_frozen_tree>`
+    without reading the real file system again.
+    Changes in the real file system after the first access are not seen.
+    """
+
+    def __init__(self, source_path: AnyPath, follow_symlinks: bool = True) -> None:
+        """
+        Args:
+            source_path: Path to the existing file or directory in the real
+                file system.
+            follow_symlinks: If `True` (default) and `source_path` is a
+                symlink, the symlink target is frozen instead of the link.
+
+        Raises:
+            OSError: if the path does not exist in the real file system.
+        """
+        self.source_path: str = to_string(helpers.make_string_path(source_path))
+        self.name: str = os.path.basename(self.source_path.rstrip(os.sep))
+        self.stat_result: os.stat_result = (
+            os.stat(self.source_path) if follow_symlinks else os.lstat(self.source_path)
+        )
+        self._entries: dict[str, FrozenTree] | None = None
+        self._byte_contents: bytes | None = None
+
+    def is_dir(self) -> bool:
+        """Return `True` if the frozen path is a directory."""
+        return S_ISDIR(self.stat_result.st_mode)
+
+    def is_symlink(self) -> bool:
+        """Return `True` if the frozen path is a symlink."""
+        return S_ISLNK(self.stat_result.st_mode)
+
+    @property
+    def entries(self) -> dict[str, FrozenTree]:
+        """Return the frozen directory entries, reading them from the real
+        file system on first access."""
+        if self._entries is None:
+            entries = {}
+            if self.is_dir():
+                for name in sorted(os.listdir(self.source_path)):
+                    entries[name] = FrozenTree(
+                        os.path.join(self.source_path, name), follow_symlinks=False
+                    )
+            self._entries = entries
+        return self._entries
+
+    @property
+    def byte_contents(self) -> bytes:
+        """Return the file contents (or the link target for symlinks),
+        reading them from the real file system on first access."""
+        if self._byte_contents is None:
+            if self.is_symlink():
+                self._byte_contents = os.readlink(self.source_path).encode(
+                    get_locale_encoding()
+                )
+            else:
+                with io_open(self.source_path, "rb") as f:
+                    self._byte_contents = f.read()
+        return self._byte_contents
+
+
+def _raise_read_only(file_object: FakeFile) -> NoReturn:
+    file_object.filesystem.raise_os_error(errno.EROFS, file_object.path)
+
+
+class FakeFrozenFile(FakeFile):
+    """Represents a file or symlink inside a frozen tree mounted into
+    a fake filesystem.
+
+    The contents are shared with all other fake filesystems where the same
+    frozen tree is mounted, and cannot be changed.
+    """
+
+    def __init__(
+        self,
+        frozen_tree: FrozenTree,
+        filesystem: FakeFilesystem,
+        name: str | None = None,
+    ) -> None:
+        """
+        Args:
+            frozen_tree: The frozen tree node representing the file.
+            filesystem: The fake filesystem where the file is mounted.
+            name: The name of the file, if it differs from the name
+                of the frozen tree node.
+        """
+        super().__init__(name=name or frozen_tree.name, filesystem=filesystem)
+        self.stat_result.set_from_stat_result(frozen_tree.stat_result)
+        if not frozen_tree.is_symlink():
+            self.st_mode &= 0o777444
+        self.frozen_tree = frozen_tree
+
+    @property
+    def byte_contents(self) -> bytes:
+        return self.frozen_tree.byte_contents
+
+    def is_large_file(self) -> bool:
+        """The contents are never faked."""
+        return False
+
+    def set_initial_contents(self, contents: AnyStr) -> bool:
+        _raise_read_only(self)
+
+    def update_contents(
+        self,
+        contents: bytes | memoryview,
+        offset: int,
+        encoding: str | None = None,
+        truncate: bool = True,
+    ) -> bool:
+        _raise_read_only(self)
+
+    def set_large_file_size(self, st_size: int) -> None:
+        _raise_read_only(self)
+
+    def check_metadata_writable(self) -> None:
+        _raise_read_only(self)
+
+    @property
+    def size(self) -> int:
+        return self.st_size
+
+    @size.setter
+    def size(self, st_size: int) -> None:
+        _raise_read_only(self)
+
+
+class FakeFrozenDirectory(FakeDirectory):
+    """Represents a directory inside a frozen tree mounted into
+    a fake filesystem.
+
+    The fake entries are created on demand from the shared frozen tree,
+    adding or removing entries is not possible.
+    """
+
+    def __init__(
+        self,
+        frozen_tree: FrozenTree,
+        filesystem: FakeFilesystem,
+        name: str | None = None,
+    ) -> None:
+        """
+        Args:
+            frozen_tree: The frozen tree node representing the directory.
+            filesystem: The fake filesystem where the directory is mounted.
+            name: The name of the directory, if it differs from the name
+                of the frozen tree node.
+        """
+        super().__init__(
+            name=name or frozen_tree.name,
+            perm_bits=frozen_tree.stat_result.st_mode,
+            filesystem=filesystem,
+        )
+        self.stat_result.set_from_stat_result(frozen_tree.stat_result)
+        self.frozen_tree = frozen_tree
+        self.contents_read = False
+
+    @property
+    def entries(self) -> dict[str, FakeFile]:
+        """Return the list of contained directory entries, creating them
+        from the frozen tree if not already done."""
+        if not self.contents_read:
+            self.contents_read = True
+            for name, frozen_entry in self.frozen_tree.entries.items():
+                entry: FakeFile
+                if frozen_entry.is_dir():
+                    entry = FakeFrozenDirectory(frozen_entry, self.filesystem)
+                else:
+                    entry = FakeFrozenFile(frozen_entry, self.filesystem)
+                self._entries[name] = entry
+                entry.parent_dir = weakref.ref(self)
+                self.filesystem.last_ino += 1
+                entry.st_ino = self.filesystem.last_ino
+                self.st_nlink += 1
+                entry.st_nlink += 1
+                entry.st_dev = self.st_dev
+        return self._entries
+
+    def add_entry(self, path_object: FakeFile) -> None:
+        _raise_read_only(self)
+
+    def remove_entry(self, pathname_name: str, recursive: bool = True) -> None:
+        _raise_read_only(self)
+
+    def check_metadata_writable(self) -> None:
+        _raise_read_only(self)
+
+    @property
+    def size(self) -> int:
+        # frozen trees do not count towards the file system size
+        return 0
+
+    @size.setter
+    def size(self, st_size: int) -> None:
+        raise self.filesystem.raise_os_error(errno.EISDIR, self.path)
+
+
 class FakeFileWrapper:
     """Wrapper for a stream object for use by a FakeFile object.
 
@@ -799,21 +1287,42 @@ class FakeFileWrapper:
             self._buffer_size = io.DEFAULT_BUFFER_SIZE
         self._use_line_buffer = not binary and buffering == 1
 
-        contents = file_object.byte_contents
         self._encoding = encoding or get_locale_encoding()
         errors = errors or "strict"
-        self._io: BinaryBufferIO | TextBufferIO = (
-            BinaryBufferIO(contents)
-            if binary
-            else TextBufferIO(
-                contents, encoding=encoding, newline=newline, errors=errors
-            )
+        # the existing contents of files opened for appending only are
+        # never read, so they are not added to the stream
+        self._append_only = (
+            open_modes.append
+            and not open_modes.can_read
+            and not file_object.is_large_file()
         )
+        self._io: BinaryBufferIO | TextBufferIO
+        if self._append_only:
+            size = file_object.st_size
+            self._io = (
+                OffsetBinaryBufferIO(size)
+                if binary
+                else TextBufferIO(
+                    encoding=encoding, newline=newline, errors=errors, offset=size
+                )
+            )
+        else:
+            contents = file_object.byte_contents
+            size = len(contents) if contents else 0
+            self._io = (
+                BinaryBufferIO(contents)
+                if binary
+                else TextBufferIO(
+                    contents, encoding=encoding, newline=newline, errors=errors
+                )
+            )
         self._read_whence = 0
         self._read_seek = 0
         self._flush_pos = 0
-        if contents:
-            self._flush_pos = len(contents)
+        # the byte position of the first write since the last flush
+        self._dirty_pos: int | None = None
+        if size:
+            self._flush_pos = size
             if self.allow_update:
                 if not self.open_modes.append:
                     self._io.seek(0)
@@ -948,19 +1457,22 @@ class FakeFileWrapper:
             return
 
         self._check_open_file()
+        self._flush()
 
+    def _flush(self) -> None:
         if self.allow_update:
-            if self.open_modes.append:
-                contents = self._io.getvalue()
+            if self._dirty_pos is None and not self.open_modes.append:
+                # nothing has been written, but the file may have been
+                # changed otherwise (e.g. via a memory map)
                 self._sync_io()
-                old_contents = self.file_object.byte_contents
-                assert old_contents is not None
-                contents = old_contents + contents[self._flush_pos :]
-                self._set_stream_contents(contents)
+            if self._is_flushed():
+                self.update_flush_pos()
+                return
+            self._io.flush()
+            if self.open_modes.append:
+                changed = self._flush_appended_contents()
             else:
-                self._io.flush()
-                contents = self._io.getvalue()
-            changed = self.file_object.set_contents(contents, self._encoding)
+                changed = self._flush_changed_contents()
             self.update_flush_pos()
             if changed:
                 if self.filesystem.is_windows_fs:
@@ -972,20 +1484,91 @@ class FakeFileWrapper:
             self._file_epoch = self.file_object.epoch
             self._flush_related_files()
         else:
-            buf_length = len(self._io.getvalue())
+            buf_length = self._io.byte_size()
             content_length = 0
-            if self.file_object.byte_contents is not None:
-                content_length = len(self.file_object.byte_contents)
+            if not self.file_object.is_large_file():
+                content_length = self.file_object.st_size
             # an error is only raised if there is something to flush
             if content_length != buf_length:
                 self.filesystem.raise_os_error(errno.EBADF)
 
+    def _is_flushed(self) -> bool:
+        """Return `True` if nothing has been written or truncated since
+        the last flush of a file not opened for appending."""
+        if (
+            self._dirty_pos is not None
+            or self.open_modes.append
+            or self._file_epoch != self.file_object.epoch
+            or self.file_object.is_large_file()
+        ):
+            return False
+        return self._io.byte_size() == self.file_object.st_size
+
+    def _flush_appended_contents(self) -> bool:
+        """Append the stream contents written since the last flush to the
+        file object. Falls back to rebuilding the stream from the file
+        contents if the file has been changed otherwise in the meantime."""
+        file_object = self.file_object
+        appended = self._io.bytes_from(self._flush_pos)
+        self._dirty_pos = None
+        if (
+            self._file_epoch != file_object.epoch
+            or file_object.is_large_file()
+            or self._flush_pos != file_object.st_size
+        ):
+            old_contents = file_object.byte_contents
+            assert old_contents is not None
+            contents = old_contents + appended
+            changed = file_object.set_contents(contents, self._encoding)
+            self._set_stream_contents(contents)
+            return changed
+        if not appended:
+            return False
+        # the stream already holds the file contents followed by
+        # the appended contents
+        changed = file_object.update_contents(
+            appended, file_object.st_size, self._encoding
+        )
+        if self._append_only:
+            self._rebase_io(file_object.st_size)
+        return changed
+
+    def _flush_changed_contents(self) -> bool:
+        """Write the stream contents changed since the last flush to the
+        file object. Falls back to writing the whole stream contents if the
+        file has been changed otherwise, or the stream has been truncated."""
+        file_object = self.file_object
+        dirty_pos = self._dirty_pos
+        with self._io.getbuffer() as buffer:
+            if (
+                self._file_epoch != file_object.epoch
+                or file_object.is_large_file()
+                or len(buffer) < file_object.st_size
+                or (dirty_pos is None and len(buffer) != file_object.st_size)
+                or (dirty_pos is not None and dirty_pos > file_object.st_size)
+            ):
+                changed = file_object.set_contents(bytes(buffer), self._encoding)
+            elif dirty_pos is None:
+                changed = False
+            else:
+                with buffer[dirty_pos:] as changed_contents:
+                    changed = file_object.update_contents(
+                        changed_contents, dirty_pos, self._encoding
+                    )
+        self._dirty_pos = None
+        return changed
+
+    def _mark_dirty(self) -> None:
+        position = self._io.byte_position()
+        if self._dirty_pos is None or position < self._dirty_pos:
+            self._dirty_pos = position
+
     def update_flush_pos(self) -> None:
         self._flush_pos = self._io.tell()
 
     def _flush_related_files(self) -> None:
-        for open_files in self.filesystem.open_files[3:]:
-            if open_files is not None:
+        for open_files in self.filesystem.open_files.values():
+            if open_files:
                 for open_file in open_files:
                     if (
                         open_file is not self
@@ -1035,21 +1618,45 @@ class FakeFileWrapper:
         """Returns the writable state of the file."""
         return self.open_modes.can_write
 
+    def _rebase_io(self, offset: int) -> None:
+        """Let the stream of an append-only file start at `offset`."""
+        cast(OffsetBinaryBufferIO | TextBufferIO, self._io).rebase(offset)
+
     def _sync_io(self) -> None:
         """Update the stream with changes to the file object contents."""
-        if self._file_epoch == self.file_object.epoch:
+        file_object = self.file_object
+        if self._file_epoch == file_object.epoch:
             return
 
-        contents = self.file_object.byte_contents
+        if self._dirty_pos is None:
+            if self._append_only:
+                self._rebase_io(file_object.st_size)
+                self._file_epoch = file_object.epoch
+                return
+            # if contents have only been appended by another writer,
+            # only the new contents are added to the stream
+            stream_size = self._io.byte_size()
+            appended = file_object.appended_contents(self._file_epoch, stream_size)
+            if appended is not None:
+                self._io.appendvalue(appended)
+                if self.open_modes.append:
+                    self._io.seek(0, io.SEEK_END)
+                self._file_epoch = file_object.epoch
+                return
+
+        contents = file_object.byte_contents
         assert contents is not None
         self._set_stream_contents(contents)
-        self._file_epoch = self.file_object.epoch
+        self._file_epoch = file_object.epoch
 
     def _set_stream_contents(self, contents: bytes) -> None:
+        if self._append_only:
+            self._rebase_io(len(contents))
+            self._dirty_pos = None
+            return
         whence = self._io.tell()
-        self._io.seek(0)
-        self._io.truncate()
-        self._io.putvalue(contents)
+        self._io.setvalue(contents)
+        self._dirty_pos = None
         if not self.open_modes.append:
             self._io.seek(whence)
 
@@ -1080,15 +1687,75 @@ class FakeFileWrapper:
             Returns:
                 Wrapped stream object method
             """
-            self._io.seek(self._read_seek, self._read_whence)
-            ret_value = io_attr(*args, **kwargs)
-            self._read_seek = self._io.tell()
-            self._read_whence = 0
-            self._io.seek(0, 2)
-            return ret_value
+            return self._read_appended(io_attr, *args, **kwargs)
 
         return read_wrapper
 
+    def _read_appended(self, io_attr: Callable, *args, **kwargs) -> Any:
+        """Call the stream read method `io_attr` at the read position
+        of a file opened for appending."""
+        self._io.seek(self._read_seek, self._read_whence)
+        ret_value = io_attr(*args, **kwargs)
+        self._read_seek = self._io.tell()
+        self._read_whence = 0
+        self._io.seek(0, 2)
+        return ret_value
+
+    def _prepare_read(self, sync: bool = True) -> bool:
+        """Check that the file can be read, and update the stream and
+        the access time before reading.
+
+        Args:
+            sync: If `False`, the stream is not updated.
+
+        Returns:
+            `False` if the file is not open for reading.
+        """
+        if self.file_object.is_large_file():
+            raise FakeLargeFileIoException(self.file_path)
+        self._check_open_file()
+        if not self.readable():
+            return False
+        if sync:
+            self._sync_io()
+            if not self.is_stream:
+                self._flush()
+        if not self.filesystem.is_windows_fs:
+            self.file_object.st_atime = helpers.now()
+        return True
+
+    def _read(self, io_attr: Callable, *args) -> Any:
+        """Read from the stream using the stream method `io_attr`."""
+        if not self._prepare_read():
+            return self._read_error()(*args)
+        if self.open_modes.append:
+            return self._read_appended(io_attr, *args)
+        return io_attr(*args)
+
+    def _write(self, io_attr: Callable, *args) -> Any:
+        """Write to the stream using the stream method `io_attr`."""
+        if self.file_object.is_large_file():
+            raise FakeLargeFileIoException(self.file_path)
+        self._check_open_file()
+        if not self.opened_as_fd and not self.allow_update:
+            return self._write_error()(*args)
+        return self._write_to_stream(io_attr, *args)
+
+    def read(self, size: int | None = -1) -> AnyString:
+        return self._read(self._io.read, size)
+
+    def readline(self, size: int | None = -1) -> AnyString:
+        return self._read(self._io.readline, size)
+
+    def readlines(self, hint: int | None = -1) -> list[AnyString]:
+        return self._read(self._io.readlines, hint)
+
+    def write(self, contents: AnyString) -> int:
+        return self._write(self._io.write, contents)
+
+    def writelines(self, lines: Iterable[AnyString]) -> None:
+        return self._write(self._io.writelines, lines)
+
     def _other_wrapper(self, name: str) -> Callable:
         """Wrap a stream attribute in an other_wrapper.
 
@@ -1149,33 +1816,40 @@ class FakeFileWrapper:
             Returns:
                 Wrapped stream object method.
             """
-            old_pos = self._io.tell()
-            ret_value = io_attr(*args, **kwargs)
-            new_pos = self._io.tell()
-
-            # if the buffer size is exceeded, we flush
-            use_line_buf = self._use_line_buffer and "\n" in args[0]
-            if new_pos - self._flush_pos > self._buffer_size or use_line_buf:
-                flush_all = new_pos - old_pos > self._buffer_size or use_line_buf
-                # if the current write does not exceed the buffer size,
-                # we revert to the previous position and flush that,
-                # otherwise we flush all
-                if not flush_all:
-                    self._io.seek(old_pos)
-                    self._io.truncate()
-                self._try_flush(old_pos)
-                if not flush_all:
-                    ret_value = io_attr(*args, **kwargs)
-            if self.open_modes.append:
-                self._read_seek = self._io.tell()
-                self._read_whence = 0
-            return ret_value
+            return self._write_to_stream(io_attr, *args, **kwargs)
 
         return write_wrapper
 
+    def _write_to_stream(self, io_attr: Callable, *args, **kwargs) -> Any:
+        """Call the stream write method `io_attr`, and flush the written
+        contents if the buffer size is exceeded."""
+        old_pos = self._io.tell()
+        self._mark_dirty()
+        ret_value = io_attr(*args, **kwargs)
+        new_pos = self._io.tell()
+
+        # if the buffer size is exceeded, we flush
+        use_line_buf = self._use_line_buffer and "\n" in args[0]
+        if new_pos - self._flush_pos > self._buffer_size or use_line_buf:
+            flush_all = new_pos - old_pos > self._buffer_size or use_line_buf
+            # if the current write does not exceed the buffer size,
+            # we revert to the previous position and flush that,
+            # otherwise we flush all
+            if not flush_all:
+                self._io.seek(old_pos)
+                self._io.truncate()
+            self._try_flush(old_pos)
+            if not flush_all:
+                self._mark_dirty()
+                ret_value = io_attr(*args, **kwargs)
+        if self.open_modes.append:
+            self._read_seek = self._io.tell()
+            self._read_whence = 0
+        return ret_value
+
     def _adapt_size_for_related_files(self, size: int) -> None:
-        for open_files in self.filesystem.open_files[3:]:
-            if open_files is not None:
+        for open_files in self.filesystem.open_files.values():
+            if open_files:
                 for open_file in open_files:
                     if (
                         open_file is not self
@@ -1195,9 +1869,17 @@ class FakeFileWrapper:
 
         def truncate_wrapper(*args, **kwargs):
             """Wrap truncate call to call flush after truncate."""
+            if self._append_only:
+                # the stream only holds the appended contents up to now
+                self.flush()
+                self._io.load_prefix(self.file_object.byte_contents or b"")
+                self._append_only = False
             if self.open_modes.append:
                 self._io.seek(self._read_seek, self._read_whence)
             size = io_attr(*args, **kwargs)
+            stream_size = self._io.byte_size()
+            if self._dirty_pos is None or stream_size < self._dirty_pos:
+                self._dirty_pos = stream_size
             self.flush()
             if not self.is_stream:
                 self.file_object.size = size
@@ -1273,7 +1955,7 @@ class FakeFileWrapper:
         return write_error
 
     def _is_open(self) -> bool:
-        if self.filedes is not None and self.filedes < len(self.filesystem.open_files):
+        if self.filedes is not None:
             open_files = self.filesystem.open_files[self.filedes]
             if open_files is not None and self in open_files:
                 return True
@@ -1284,16 +1966,53 @@ class FakeFileWrapper:
             raise ValueError("I/O operation on closed file")
 
     def __iter__(self) -> Iterator[str] | Iterator[bytes]:
-        if not self.readable():
+        if not self._prepare_read():
             self._raise("File is not open for reading")
+        if self.open_modes.append:
+            # the read position is tracked in __next__
+            return self  # type: ignore[return-value]
         return self._io.__iter__()  # type: ignore[return-value]
 
     def __next__(self):
         if not self.readable():
             self._raise("File is not open for reading")
+        if self.open_modes.append:
+            line = self.readline()
+            if not line:
+                raise StopIteration
+            return line
         return next(self._io)
 
 
+class _StreamAttribute:
+    """Forwards an attribute defined by an `io` base class of a file wrapper
+    to `FakeFileWrapper.__getattr__`, instead of using the base class
+    implementation."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, instance: FakeFileWrapper | None, owner: type | None = None):
+        if instance is None:
+            return self
+        return instance.__getattr__(self.name)
+
+
+def _forward_io_attributes(cls: type) -> type:
+    """Class decorator for file wrappers deriving from an `io` base class.
+    All public attributes of the base class not implemented in the wrapper
+    are delegated to the wrapped stream."""
+    for name in dir(cls):
+        if (
+            not name.startswith("_")
+            and name not in vars(cls)
+            and not hasattr(FakeFileWrapper, name)
+        ):
+            setattr(cls, name, _StreamAttribute(name))
+    return cls
+
+
+@_forward_io_attributes
 class FakeTextFileWrapper(FakeFileWrapper, io.TextIOBase):  # type: ignore[misc]
     """Represents a text file wrapper.
     Derives from io.TextIOBase so it can be used as a file object
@@ -1301,12 +2020,8 @@ class FakeTextFileWrapper(FakeFileWrapper, io.TextIOBase):  # type: ignore[misc]
     to `FakeFileWrapper`.
     """
 
-    def __getattribute__(self, name):  # type: ignore[override]
-        if hasattr(FakeFileWrapper, name) or name in self.__dict__:
-            return FakeFileWrapper.__getattribute__(self, name)
-        return self.__getattr__(name)
-
 
+@_forward_io_attributes
 class FakeBinaryFileWrapper(FakeFileWrapper, io.BufferedIOBase):  # type: ignore[misc]
     """Represents a buffered binary file wrapper.
     Derives from io.BufferedIOBase so it can be used as a file object
@@ -1314,10 +2029,294 @@ class FakeBinaryFileWrapper(FakeFileWrapper, io.BufferedIOBase):  # type: ignore
     to `FakeFileWrapper`.
     """
 
-    def __getattribute__(self, name):  # type: ignore[override]
-        if hasattr(FakeFileWrapper, name) or name in self.__dict__:
-            return FakeFileWrapper.__getattribute__(self, name)
-        return self.__getattr__(name)
+    @property
+    def _binary_io(self) -> BinaryBufferIO:
+        """The stream of the file, which is always binary here."""
+        return cast(BinaryBufferIO, self._io)
+
+    def read1(self, size: int = -1) -> bytes:
+        return self._read(self._binary_io.read1, size)
+
+    def readinto(self, buffer: Any) -> int:
+        return self._readinto(self._binary_io.readinto, buffer)
+
+    def readinto1(self, buffer: Any) -> int:
+        return self._readinto(self._binary_io.readinto1, buffer)
+
+    def _readinto(self, io_attr: Callable, buffer: Any) -> int:
+        """Read into `buffer`. For files opened read-only, the contents are
+        copied directly from the file object, so the stream does not have
+        to be updated with changes made by other writers first."""
+        if self.allow_update or self.open_modes.append or self.is_stream:
+            return self._read(io_attr, buffer)
+        if not self._prepare_read(sync=False):
+            return self._read_error()(buffer)
+        position = self._io.tell()
+        size = self.file_object.read_into(buffer, position)
+        self._io.seek(position + size)
+        return size
+
+
+class FakeFileIO(io.RawIOBase):
+    """Unbuffered binary stream over the contents of a fake file, the fake
+    counterpart of `io.FileIO`.
+
+    Used if `FakeFilesystem.use_native_io` is set. In this case, buffering,
+    text decoding and newline translation are done by the standard
+    `io.BufferedReader`, `io.BufferedWriter`, `io.BufferedRandom` and
+    `io.TextIOWrapper` classes layered on top of this stream, as for real
+    files.
+    Also used for file descriptors opened by `os.open`, so that `os.read`,
+    `os.write` and `os.lseek` access the file contents directly.
+    """
+
+    def __init__(
+        self,
+        file_object: FakeFile,
+        file_path: AnyStr,
+        open_modes: _OpenModes,
+        allow_update: bool,
+        delete_on_close: bool,
+        filesystem: FakeFilesystem,
+        closefd: bool,
+        encoding: str | None,
+    ):
+        super().__init__()
+        self.file_object = file_object
+        self.file_path = file_path  # type: ignore[var-annotated]
+        self.name = file_object.opened_as
+        self.open_modes = open_modes
+        self.allow_update = allow_update
+        self.delete_on_close = delete_on_close
+        self._filesystem = weakref.ref(filesystem)
+        self._closefd = closefd
+        self._encoding = encoding
+        self._changed = False
+        self._position = file_object.st_size if open_modes.append else 0
+        self.filedes: int | None = None
+
+    @property
+    def filesystem(self) -> FakeFilesystem:
+        fs = self._filesystem()
+        assert fs is not None
+        return fs
+
+    @property
+    def mode(self) -> str:
+        """The mode as shown by `io.FileIO`."""
+        if self.open_modes.must_not_exist:
+            mode = "xb"
+        elif self.open_modes.append:
+            mode = "ab"
+        elif self.open_modes.can_read:
+            mode = "rb"
+        else:
+            mode = "wb"
+        if self.open_modes.can_read and self.open_modes.can_write:
+            mode += "+"
+        return mode
+
+    @property
+    def closefd(self) -> bool:
+        return self._closefd
+
+    def get_object(self) -> FakeFile:
+        """Return the FakeFile object that is wrapped
+        by the current instance.
+        """
+        return self.file_object
+
+    def fileno(self) -> int:
+        """Return the file descriptor of the file object."""
+        self._check_open_file()
+        assert self.filedes is not None
+        return self.filedes
+
+    def readable(self) -> bool:
+        self._check_open_file()
+        return self.open_modes.can_read
+
+    def writable(self) -> bool:
+        self._check_open_file()
+        return self.open_modes.can_write
+
+    def seekable(self) -> bool:
+        self._check_open_file()
+        return True
+
+    def _is_open(self) -> bool:
+        if self.filedes is not None:
+            open_files = self.filesystem.open_files[self.filedes]
+            if open_files is not None and self in open_files:
+                return True
+        return False
+
+    def _check_open_file(self) -> None:
+        if self.closed or not self._is_open():
+            raise ValueError("I/O operation on closed file")
+
+    def _contents(self) -> bytes | bytearray:
+        file_object = self.file_object
+        if file_object.is_large_file():
+            raise FakeLargeFileIoException(self.file_path)
+        if isinstance(file_object._byte_contents, bytearray):
+            # avoid converting contents that are currently written
+            return file_object._byte_contents
+        return file_object.byte_contents or b""
+
+    def readinto(self, buffer: Any) -> int:
+        """Read bytes from the current position directly into `buffer`."""
+        self._check_open_file()
+        if not self.open_modes.can_read:
+            raise io.UnsupportedOperation("File not open for reading")
+        if self.file_object.is_large_file():
+            raise FakeLargeFileIoException(self.file_path)
+        size = self.file_object.read_into(buffer, self._position)
+        self._position += size
+        if not self.filesystem.is_windows_fs:
+            self.file_object.st_atime = helpers.now()
+        return size
+
+    def readall(self) -> bytes:
+        """Read all bytes from the current position until the end."""
+        self._check_open_file()
+        if not self.open_modes.can_read:
+            raise io.UnsupportedOperation("File not open for reading")
+        with memoryview(self._contents()) as contents:
+            result = bytes(contents[self._position :])
+        self._position += len(result)
+        if not self.filesystem.is_windows_fs:
+            self.file_object.st_atime = helpers.now()
+        return result
+
+    def write(self, contents: Any) -> int:
+        """Write `contents` at the current position, or at the end of the file
+        if opened for appending."""
+        self._check_open_file()
+        if not self.open_modes.can_write:
+            raise io.UnsupportedOperation("File not open for writing")
+        if not self.allow_update:
+            self.filesystem.raise_os_error(errno.EBADF, self.file_path)
+        file_object = self.file_object
+        if file_object.is_large_file():
+            raise FakeLargeFileIoException(self.file_path)
+        if self.open_modes.append:
+            self._position = file_object.st_size
+        elif self._position > file_object.st_size:
+            # writing after the end fills the gap with zero bytes
+            file_object.size = self._position
+        with memoryview(contents) as view:
+            data = view.cast("B")
+            size = len(data)
+            changed = file_object.update_contents(
+                data, self._position, self._encoding, truncate=False
+            )
+        self._position += size
+        if changed:
+            self._update_times()
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._check_open_file()
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.file_object.st_size + offset
+        else:
+            raise ValueError(f"invalid whence ({whence}, should be 0, 1 or 2)")
+        if position < 0:
+            self.filesystem.raise_os_error(errno.EINVAL, self.file_path)
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        self._check_open_file()
+        return self._position
+
+    def truncate(self, size: int | None = None) -> int:
+        self._check_open_file()
+        if not self.open_modes.can_write:
+            raise io.UnsupportedOperation("File not open for writing")
+        if size is None:
+            size = self._position
+        if size != self.file_object.st_size:
+            self.file_object.size = size
+            self._update_times()
+        return size
+
+    def _update_times(self) -> None:
+        if self.filesystem.is_windows_fs:
+            self._changed = True
+        else:
+            current_time = helpers.now()
+            self.file_object.st_ctime = current_time
+            self.file_object.st_mtime = current_time
+
+    def close(self) -> None:
+        """Close the stream and its file descriptor."""
+        if not self.closed and self._is_open():
+            self.close_fd(self.filedes)
+        super().close()
+
+    def close_fd(self, fd: int | None) -> None:
+        """Close the file for the given file descriptor."""
+        if not self._is_open():
+            return
+        if self.filesystem.is_windows_fs and self._changed:
+            self.file_object.st_mtime = helpers.now()
+        assert fd is not None
+        if self._closefd:
+            self.filesystem.close_open_file(fd)
+        else:
+            open_files = self.filesystem.open_files[fd]
+            assert open_files is not None
+            open_files.remove(self)
+        if self.delete_on_close:
+            self.filesystem.remove_object(
+                self.get_object().path  # type: ignore[arg-type]
+            )
+
+
+def copy_file_object(source: Any, target: Any) -> bool:
+    """Copy the contents of the open fake file `source` from its current
+    position to the current position of the open fake file `target`, as done
+    by `shutil.copyfileobj`, without reading and writing them in chunks.
+    A whole file copied into an empty file shares its contents with the copy.
+
+    Returns:
+        `False` if nothing has been copied, because the files cannot be
+        copied natively, e.g. because they are not fake binary files.
+    """
+    file_types = (FakeBinaryFileWrapper, FakeFileIO)
+    if not (
+        isinstance(source, file_types)
+        and isinstance(target, file_types)
+        and source.open_modes.can_read
+        and target.open_modes.can_write
+        and not target.open_modes.append
+        and target.allow_update
+        and not source.file_object.is_large_file()
+        and not target.file_object.is_large_file()
+    ):
+        return False
+    if isinstance(target, FakeFileWrapper):
+        target.flush()
+    offset = source.tell()
+    position = target.tell()
+    size = target.file_object.copy_from(source.file_object, offset, position)
+    source.seek(offset + size)
+    target.seek(position + size)
+    if size:
+        if target.filesystem.is_windows_fs:
+            target._changed = True
+        else:
+            current_time = helpers.now()
+            target.file_object.st_ctime = current_time
+            target.file_object.st_mtime = current_time
+            source.file_object.st_atime = current_time
+    return True
 
 
 class StandardStreamWrapper:
@@ -1424,26 +2423,176 @@ class FakeDirWrapper:
         self.close()
 
 
+class FakePipe:
+    """An in-memory pipe shared by its read and write descriptors.
+
+    Written data is kept in a ring buffer of fixed capacity. Reading from an
+    empty pipe and writing to a full pipe block until the other end reads,
+    writes or is closed, or raise `BlockingIOError` for a non-blocking end.
+    """
+
+    # the default pipe capacity under Linux
+    CAPACITY = 65536
+    # writes of up to this size are not interleaved with other writes
+    ATOMIC_SIZE = 4096
+
+    def __init__(self, capacity: int = CAPACITY):
+        self._buffer = bytearray(capacity)
+        self._start = 0
+        self._size = 0
+        self._condition = threading.Condition()
+        self.reader_open = True
+        self.writer_open = True
+        # the number of open descriptors for the read and the write end
+        self._open_fds = [0, 0]
+
+    def read(self, size: int, blocking: bool = True) -> bytes:
+        """Read and remove up to `size` bytes from the pipe. Return an empty
+        bytes object if the pipe is empty and the write end is closed."""
+        with self._condition:
+            if size == 0:
+                return b""
+            while not self._size:
+                if not self.writer_open:
+                    return b""
+                if not blocking:
+                    raise BlockingIOError(errno.EAGAIN, os.strerror(errno.EAGAIN))
+                self._condition.wait()
+            if size < 0 or size > self._size:
+                size = self._size
+            capacity = len(self._buffer)
+            view = memoryview(self._buffer)
+            end = self._start + size
+            if end <= capacity:
+                contents = bytes(view[self._start : end])
+            else:
+                contents = b"".join((view[self._start :], view[: end - capacity]))
+            self._size -= size
+            self._start = end % capacity if self._size else 0
+            self._condition.notify_all()
+            return contents
+
+    def write(self, contents: bytes, blocking: bool = True) -> int:
+        """Write `contents` into the pipe and return the number of bytes
+        written. A blocking write waits until all bytes are written, a
+        non-blocking write only writes the bytes that fit into the pipe.
+
+        Raises:
+            BrokenPipeError: if the read end is closed.
+            BlockingIOError: if the pipe is full for a non-blocking write.
+        """
+        view = memoryview(contents).cast("B")
+        size = len(view)
+        if not size:
+            return 0
+        capacity = len(self._buffer)
+        # small writes are only done if they fit into the pipe as a whole
+        min_free = size if size <= self.ATOMIC_SIZE else 1
+        written = 0
+        with self._condition:
+            while written < size:
+                if not self.reader_open:
+                    if written:
+                        break
+                    raise BrokenPipeError(errno.EPIPE, os.strerror(errno.EPIPE))
+                free = capacity - self._size
+                if free < min_free:
+                    if not blocking:
+                        raise BlockingIOError(errno.EAGAIN, os.strerror(errno.EAGAIN))
+                    self._condition.wait()
+                    continue
+                count = min(free, size - written)
+                self._put(view[written : written + count])
+                written += count
+                self._condition.notify_all()
+                if not blocking:
+                    break
+        return written
+
+    def _put(self, contents: memoryview) -> None:
+        capacity = len(self._buffer)
+        start = (self._start + self._size) % capacity
+        count = min(len(contents), capacity - start)
+        self._buffer[start : start + count] = contents[:count]
+        self._buffer[: len(contents) - count] = contents[count:]
+        self._size += len(contents)
+
+    def open_end(self, write_end: bool) -> None:
+        """Register an additional descriptor for the read or write end."""
+        with self._condition:
+            self._open_fds[write_end] += 1
+
+    def close_end(self, write_end: bool) -> None:
+        """Close a descriptor for the read or write end of the pipe.
+        If it was the last one, the end is closed, waking up blocked
+        readers and writers."""
+        with self._condition:
+            self._open_fds[write_end] -= 1
+            if self._open_fds[write_end] > 0:
+                return
+            if write_end:
+                self.writer_open = False
+            else:
+                self.reader_open = False
+            self._condition.notify_all()
+
+
+class _PipeRawIO(io.RawIOBase):
+    """Unbuffered stream on one end of a fake pipe, used to create
+    buffered and text streams for pipe descriptors opened with `open`."""
+
+    def __init__(self, wrapper: FakePipeWrapper):
+        super().__init__()
+        self._wrapper = wrapper
+
+    def readable(self) -> bool:
+        return self._wrapper.readable()
+
+    def writable(self) -> bool:
+        return self._wrapper.writable()
+
+    def readinto(self, buffer: Any) -> int:
+        contents = self._wrapper.pipe.read(len(buffer), self._wrapper.blocking)
+        buffer[: len(contents)] = contents
+        return len(contents)
+
+    def write(self, contents: Any) -> int:
+        return self._wrapper.pipe.write(contents, self._wrapper.blocking)
+
+
 class FakePipeWrapper:
-    """Wrapper for a read or write descriptor of a real pipe object to be
+    """Wrapper for a read or write descriptor of a fake pipe object to be
     used in open files list.
     """
 
     def __init__(
         self,
         filesystem: FakeFilesystem,
-        fd: int,
+        pipe: FakePipe,
         can_write: bool,
         mode: str = "",
     ):
         self._filesystem = weakref.ref(filesystem)
-        self.fd = fd  # the real file descriptor
+        self.pipe = pipe
         self.can_write = can_write
+        # the number of descriptors using this wrapper
+        self._fd_count = 1
+        pipe.open_end(can_write)
+        self.blocking = True
         self.file_object = None
         self.filedes: int | None = None
-        self.real_file = None
+        self.stream: io.IOBase | None = None
         if mode:
-            self.real_file = open(fd, mode)
+            raw = _PipeRawIO(self)
+            buffered: io.BufferedIOBase
+            if can_write:
+                buffered = io.BufferedWriter(raw)
+            else:
+                buffered = io.BufferedReader(raw)
+            if "b" in mode:
+                self.stream = buffered
+            else:
+                self.stream = io.TextIOWrapper(buffered)
 
     def __enter__(self) -> FakePipeWrapper:
         """To support usage of this fake pipe with the 'with' statement."""
@@ -1468,35 +2617,52 @@ class FakePipeWrapper:
         raise OSError(errno.EBADF, os.strerror(errno.EBADF))
 
     def read(self, numBytes: int = -1) -> bytes:
-        """Read from the real pipe."""
-        if self.real_file:
-            return self.real_file.read(numBytes)  # pytype: disable=bad-return-type
-        return os.read(self.fd, numBytes)
+        """Read from the pipe."""
+        if self.can_write:
+            raise OSError(errno.EBADF, os.strerror(errno.EBADF))
+        if self.stream:
+            return self.stream.read(numBytes)  # pytype: disable=bad-return-type
+        return self.pipe.read(numBytes, self.blocking)
 
     def flush(self) -> None:
-        """Flush the real pipe?"""
+        """Flush the buffered stream, if any."""
+        if self.stream:
+            self.stream.flush()
 
     def write(self, contents: bytes) -> int:
-        """Write to the real pipe."""
-        if self.real_file:
-            return self.real_file.write(contents)
-        return os.write(self.fd, contents)
+        """Write to the pipe."""
+        if not self.can_write:
+            raise OSError(errno.EBADF, os.strerror(errno.EBADF))
+        if self.stream:
+            return self.stream.write(contents)
+        return self.pipe.write(contents, self.blocking)
 
     def close(self) -> None:
         """Close the pipe descriptor."""
         self.close_fd(self.filedes)
 
+    def add_fd(self) -> None:
+        """Register an additional descriptor using this pipe end,
+        e.g. created by `os.dup`."""
+        self._fd_count += 1
+        self.pipe.open_end(self.can_write)
+
     def close_fd(self, fd: int | None) -> None:
-        """Close the pipe descriptor with the given file descriptor."""
+        """Close the pipe descriptor with the given file descriptor.
+        The pipe end is closed with the last descriptor using it."""
         fs = self._filesystem()
         assert fs is not None and fd is not None
         open_files = fs.open_files[fd]
         assert open_files is not None
         open_files.remove(self)
-        if self.real_file:
-            self.real_file.close()
-        else:
-            os.close(self.fd)
+        if not open_files:
+            fs.close_open_file(fd)
+        self._fd_count -= 1
+        try:
+            if self.stream and not self._fd_count:
+                self.stream.close()
+        finally:
+            self.pipe.close_end(self.can_write)
 
     def readable(self) -> bool:
         """The pipe end can either be readable or writable."""
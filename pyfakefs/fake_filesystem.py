@@ -114,7 +114,7 @@ from typing import (
     TYPE_CHECKING,
 )
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
 
 from pyfakefs import fake_file, fake_path, fake_io, fake_os, helpers, fake_open
 from pyfakefs.fake_file import AnyFileWrapper, AnyFile
@@ -150,6 +150,119 @@ class OSType(Enum):
     WINDOWS = "windows"
 
 
+class FileDescriptorTable:
+    """Maps file descriptor numbers to the lists of open file objects
+    using them.
+
+    The lowest free descriptor number is found using a heap of closed
+    descriptors below the highest allocated number. Closed or replaced
+    descriptors are not removed from the heap, but skipped when popped,
+    so that allocating, closing and duplicating a descriptor to an
+    arbitrary number take logarithmic time.
+
+    For backwards compatibility, the table behaves like the list of open
+    files indexed by descriptor that it replaces: its length is the highest
+    descriptor ever allocated plus one, and iterating or slicing it returns
+    `None` for descriptors not in use.
+    """
+
+    def __init__(self, open_files: Iterable[list[AnyFileWrapper] | None] = ()) -> None:
+        """
+        Args:
+            open_files: The lists of open files indexed by descriptor,
+                with `None` or an empty list for descriptors not in use.
+        """
+        self._files: dict[int, list[AnyFileWrapper]] = {}
+        # all numbers from this number on are free if not in `_files`
+        self._next_fd = 0
+        # free numbers below `_next_fd` (and possibly used ones)
+        self._free_fds: list[int] = []
+        # the highest descriptor ever allocated plus one
+        self._size = 0
+        for file_des, files in enumerate(open_files):
+            if files:
+                self._files[file_des] = files
+                self._size = file_des + 1
+        self._next_fd = self._size
+        self._free_fds = [fd for fd in range(self._size) if fd not in self._files]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[list[AnyFileWrapper] | None]:
+        for file_des in range(self._size):
+            yield self._files.get(file_des)
+
+    def __contains__(self, file_des: object) -> bool:
+        return file_des in self._files
+
+    @overload
+    def __getitem__(self, file_des: int) -> list[AnyFileWrapper] | None: ...
+
+    @overload
+    def __getitem__(self, file_des: slice) -> list[list[AnyFileWrapper] | None]: ...
+
+    def __getitem__(
+        self, file_des: int | slice
+    ) -> list[AnyFileWrapper] | None | list[list[AnyFileWrapper] | None]:
+        """Return the open files for the descriptor, or `None` if the
+        descriptor is not in use. A slice returns a list of these."""
+        if isinstance(file_des, slice):
+            return [self._files.get(fd) for fd in range(self._size)[file_des]]
+        if file_des < 0:
+            file_des += self._size
+        return self._files.get(file_des)
+
+    def fds(self) -> list[int]:
+        """Return the sorted list of descriptors in use."""
+        return sorted(self._files)
+
+    def values(self) -> Iterable[list[AnyFileWrapper]]:
+        """Return the lists of open files for all descriptors in use."""
+        return self._files.values()
+
+    def add(self, file_obj: AnyFileWrapper, file_des: int = -1) -> int:
+        """Add `file_obj` as the only open file of a descriptor.
+
+        Args:
+            file_obj: The file object to add.
+            file_des: The descriptor number to use. If negative, the lowest
+                free number is used.
+
+        Returns:
+            The file descriptor number.
+        """
+        if file_des < 0:
+            file_des = self._lowest_free_fd()
+        self._files[file_des] = [file_obj]
+        self._size = max(self._size, file_des + 1)
+        return file_des
+
+    def remove(self, file_des: int) -> None:
+        """Free the given descriptor, if it is used."""
+        if self._files.pop(file_des, None) is not None:
+            if file_des < self._next_fd:
+                heapq.heappush(self._free_fds, file_des)
+
+    def clear(self) -> None:
+        self._files.clear()
+        self._free_fds.clear()
+        self._next_fd = 0
+        self._size = 0
+
+    def _lowest_free_fd(self) -> int:
+        while self._free_fds:
+            file_des = heapq.heappop(self._free_fds)
+            if file_des not in self._files:
+                return file_des
+        file_des = self._next_fd
+        # skip numbers used by duplicated descriptors
+        while file_des in self._files:
+            file_des += 1
+        self._next_fd = file_des + 1
+        return file_des
+
+
 # definitions for backwards compatibility
 FakeFile = fake_file.FakeFile
 FakeNullFile = fake_file.FakeNullFile
@@ -203,14 +316,24 @@ class FakeFilesystem:
             discouraged and mainly there to retain upwards compatibility - relying on
             the result order in tests is not recommended.
             This attribute may be removed in a future version.
+        use_native_io: Set to `False` by default. If set to `True`, files are
+            opened using the standard `io` buffer and text classes on top of
+            an unbuffered fake file stream, the same way as `open` does for
+            real files. This makes reading and writing, especially of text
+            files, faster, and the buffering behaves like that of real files.
     """
 
+    # caches the metadata files of packages added via `add_package_metadata`
+    # during the test session, to avoid repeated lookups in the real filesystem
+    PACKAGE_METADATA_CACHE: dict[str, list[fake_file.FrozenTree]] = {}
+
     def __init__(
         self,
         path_separator: str = os.path.sep,
         total_size: int | None = None,
         patcher: Patcher | None = None,
         create_temp_dir: bool = False,
+        use_overlay: bool = False,
     ) -> None:
         """
         Args:
@@ -221,6 +344,11 @@ class FakeFilesystem:
             create_temp_dir: If `True`, a temp directory is created on initialization.
                 Under Posix, if the temp directory is not `/tmp`, a link to the temp
                 path is additionally created at `/tmp`.
+            use_overlay: If `True`, the fake filesystem is an overlay over the
+                real filesystem: paths not existing in the fake filesystem are
+                looked up lazily in the real filesystem, while all changes are
+                done in the fake filesystem only. Only used if the real OS
+                is emulated.
 
         Example usage to use the same path separator under all systems:
 
@@ -231,6 +359,7 @@ class FakeFilesystem:
             weakref.ref(patcher) if patcher else None
         )
         self.create_temp_dir = create_temp_dir
+        self.use_overlay = use_overlay
 
         # is_windows_fs can be used to test the behavior of pyfakefs under
         # Windows fs on non-Windows systems and vice verse;
@@ -264,11 +393,7 @@ class FakeFilesystem:
         self.umask: int = os.umask(0o22)
         os.umask(self.umask)
 
-        # A list of open file objects. Their position in the list is their
-        # file descriptor number
-        self.open_files: list[list[AnyFileWrapper] | None] = []
-        # A heap containing all free positions in self.open_files list
-        self._free_fd_heap: list[int] = []
+        self._open_files = FileDescriptorTable()
         # last used numbers for inodes (st_ino) and devices (st_dev)
         self.last_ino: int = 0
         self.last_dev: int = 0
@@ -279,6 +404,7 @@ class FakeFilesystem:
         # set from outside if needed
         self.patch_open_code = PatchMode.OFF
         self.shuffle_listdir_results = True
+        self.use_native_io = False
 
     def __getstate__(self):
         """Handle weakref to allow pickling of the patcher"""
@@ -303,6 +429,17 @@ class FakeFilesystem:
         assert p is not None
         return p
 
+    @property
+    def open_files(self) -> FileDescriptorTable:
+        """The open file objects by their file descriptor number."""
+        return self._open_files
+
+    @open_files.setter
+    def open_files(self, value: Iterable[list[AnyFileWrapper] | None]) -> None:
+        if not isinstance(value, FileDescriptorTable):
+            value = FileDescriptorTable(value)
+        self._open_files = value
+
     @property
     def is_linux(self) -> bool:
         """Returns `True` in a real or faked Linux file system."""
@@ -431,11 +568,15 @@ class FakeFilesystem:
 
     def reset(self, total_size: int | None = None, init_pathlib: bool = True):
         """Remove all file system contents and reset the root."""
-        self.root = FakeDirectory(self.path_separator, filesystem=self)
+        if self._is_overlay and not self.is_windows_fs:
+            self.root = fake_file.FakeOverlayDirectory(
+                self.path_separator, self.path_separator, self, os.stat(os.sep)
+            )
+        else:
+            self.root = FakeDirectory(self.path_separator, filesystem=self)
 
         self.dev_null = FakeNullFile(self)
         self.open_files.clear()
-        self._free_fd_heap.clear()
         self.last_ino = 0
         self.last_dev = 0
         self.mount_points.clear()
@@ -448,6 +589,15 @@ class FakeFilesystem:
 
             fake_pathlib.init_module(self)
 
+    @property
+    def _is_overlay(self) -> bool:
+        # overlaying the real filesystem only makes sense if it is not emulated
+        return (
+            self.use_overlay
+            and self.is_windows_fs == (sys.platform == "win32")
+            and self.path_separator == os.sep
+        )
+
     @contextlib.contextmanager
     def use_fs_type(self, fs_type: FSType):
         old_fs_type = self.fs_type
@@ -601,10 +751,17 @@ class FakeFilesystem:
         current_dir = self.root
 
         new_dirs = []
-        for component in [to_string(p) for p in path_components]:
+        for i, component in enumerate([to_string(p) for p in path_components]):
             directory = self._directory_content(current_dir, to_string(component))[1]
             if not directory:
-                new_dir = FakeDirectory(component, filesystem=self)
+                new_dir: FakeDirectory
+                if self._is_overlay and i == len(path_components) - 1:
+                    # the mount point (e.g. a Windows drive) maps the real one
+                    new_dir = fake_file.FakeOverlayDirectory(
+                        component, dir_path + self.path_separator, self
+                    )
+                else:
+                    new_dir = FakeDirectory(component, filesystem=self)
                 new_dirs.append(new_dir)
                 current_dir.add_entry(new_dir)
                 current_dir = new_dir
@@ -836,6 +993,7 @@ class FakeFilesystem:
         file_object = self.resolve(
             path, follow_symlinks, allow_fd=allow_fd, check_owner=True
         )
+        file_object.check_metadata_writable()
         if self.is_windows_fs and not force_unix_mode:
             if mode & helpers.PERM_WRITE:
                 file_object.st_mode = file_object.st_mode | 0o222
@@ -877,6 +1035,7 @@ class FakeFilesystem:
         self._handle_utime_arg_errors(ns, times)
 
         file_object = self.resolve(path, follow_symlinks, allow_fd=True)
+        file_object.check_metadata_writable()
         if times is not None:
             for file_time in times:
                 if not isinstance(file_time, (int, float)):
@@ -914,55 +1073,33 @@ class FakeFilesystem:
         """Add file_obj to the list of open files on the filesystem.
         Used internally to manage open files.
 
-        The position in the open_files array is the file descriptor number.
-
         Args:
             file_obj: File object to be added to open files list.
-            new_fd: The optional new file descriptor.
+            new_fd: The optional new file descriptor. If it is already
+                in use, the files opened with it are closed.
 
         Returns:
             File descriptor number for the file object.
         """
         if new_fd >= 0:
-            size = len(self.open_files)
-            if new_fd < size:
-                open_files = self.open_files[new_fd]
-                if open_files:
-                    for f in open_files:
-                        try:
-                            f.close()
-                        except OSError:
-                            pass
-                if new_fd in self._free_fd_heap:
-                    self._free_fd_heap.remove(new_fd)
-                self.open_files[new_fd] = [file_obj]
-            else:
-                for fd in range(size, new_fd):
-                    self.open_files.append([])
-                    heapq.heappush(self._free_fd_heap, fd)
-                self.open_files.append([file_obj])
-            return new_fd
-
-        if self._free_fd_heap:
-            open_fd = heapq.heappop(self._free_fd_heap)
-            self.open_files[open_fd] = [file_obj]
-            return open_fd
-
-        self.open_files.append([file_obj])
-        return len(self.open_files) - 1
+            open_files = self.open_files[new_fd]
+            if open_files:
+                for f in list(open_files):
+                    try:
+                        f.close_fd(new_fd)
+                    except OSError:
+                        pass
+        return self.open_files.add(file_obj, new_fd)
 
     def close_open_file(self, file_des: int) -> None:
         """Remove file object with given descriptor from the list
         of open files.
 
-        Sets the entry in `open_files` to `None`.
-
         Args:
             file_des: Descriptor of file object to be removed from
             open files list.
         """
-        self.open_files[file_des] = None
-        heapq.heappush(self._free_fd_heap, file_des)
+        self.open_files.remove(file_des)
 
     def get_open_file(self, file_des: int) -> AnyFileWrapper:
         """Return an open file.
@@ -997,11 +1134,16 @@ class FakeFilesystem:
         """
         if not is_int_type(file_des):
             raise TypeError("an integer is required")
-        valid = file_des < len(self.open_files)
-        if valid:
-            return self.open_files[file_des] or []
+        open_files = self.open_files[file_des]
+        if open_files is not None:
+            return open_files
         self.raise_os_error(errno.EBADF, str(file_des))
 
+    def open_file_descriptors(self) -> list[int]:
+        """Return the sorted list of file descriptors currently in use,
+        including the ones for the standard streams."""
+        return self.open_files.fds()
+
     def has_open_file(self, file_object: FakeFile) -> bool:
         """Return `True` if the given file object is in the list of open files.
 
@@ -1011,9 +1153,10 @@ class FakeFilesystem:
         Returns:
             `True` if the file is open.
         """
-        return file_object in [
-            wrappers[0].get_object() for wrappers in self.open_files if wrappers
-        ]
+        return any(
+            wrappers and wrappers[0].get_object() is file_object
+            for wrappers in self.open_files.values()
+        )
 
     def _normalize_path_sep(self, path: AnyStr) -> AnyStr:
         alt_sep = self._alternative_path_separator(path)
@@ -2251,6 +2394,13 @@ class FakeFilesystem:
         self._auto_mount_drive_if_needed(dir_path)
         if self.exists(dir_path, check_link=True) and dir_path not in self.mount_points:
             self.raise_os_error(errno.EEXIST, dir_path)
+        return self._add_directories(dir_path, perm_bits, apply_umask)
+
+    def _add_directories(
+        self, dir_path: str, perm_bits: int, apply_umask: bool
+    ) -> FakeDirectory:
+        """Add the missing directories in the normalized `dir_path`
+        and return the last directory."""
         path_components = self._path_components(dir_path)
         current_dir = self.root
 
@@ -2557,11 +2707,68 @@ class FakeFilesystem:
             else:
                 self.add_real_file(path, read_only)
 
+    def add_frozen_tree(
+        self,
+        frozen_tree: fake_file.FrozenTree,
+        target_path: AnyPath | None = None,
+    ) -> FakeFile:
+        """Mount the given frozen tree into the fake filesystem at `target_path`,
+        and return the fake object representing the mounted tree root.
+
+        As opposed to :py:meth:`add_real_directory`, the real file system is
+        not accessed, apart from reading entries not yet cached in the frozen
+        tree. As the frozen tree is shared between all fake filesystems it is
+        mounted in, mounting an already read frozen tree is cheap, regardless
+        of its size. All files and directories in the mounted tree are
+        read-only: any attempt to change them raises an `OSError` with
+        `errno.EROFS`.
+
+        Args:
+            frozen_tree: The :py:class:`FrozenTree<pyfakefs.fake_file.FrozenTree>`
+                object to mount.
+            target_path: If given, the target path of the mounted tree,
+                otherwise the target is the source path of the frozen tree.
+
+        Returns:
+            the newly created fake file or directory object.
+
+        Raises:
+            OSError: if the target path already exists in the fake filesystem.
+        """
+        target_path_str = make_string_path(
+            to_string(target_path or frozen_tree.source_path)
+        )
+        target_path_str = self._path_without_trailing_separators(target_path_str)
+        if os.altsep is not None:
+            target_path_str = os.path.normpath(target_path_str)
+        if os.sep != self.path_separator:
+            target_path_str = target_path_str.replace(os.sep, self.path_separator)
+
+        self._auto_mount_drive_if_needed(target_path_str)
+        target_path_str = self.absnormpath(target_path_str)
+        if self.exists(target_path_str, check_link=True):
+            self.raise_os_error(errno.EEXIST, target_path_str)
+        parent_path, name = self.splitpath(target_path_str)
+        if self.exists(parent_path):
+            parent_dir = self.get_object(parent_path)
+        else:
+            parent_dir = self.create_dir(parent_path)
+        fake_object: FakeFile
+        if frozen_tree.is_dir():
+            fake_object = fake_file.FakeFrozenDirectory(frozen_tree, self, name)
+        else:
+            fake_object = fake_file.FakeFrozenFile(frozen_tree, self, name)
+        cast(FakeDirectory, parent_dir).add_entry(fake_object)
+        return fake_object
+
     def add_package_metadata(self, package_name: str) -> None:
         """Convenience function to add all metadata distribution files of the package
         with the given name to the fake filesystem. These are the files that are
         usually located under `<package_name>-<version>.dist-info` beside the actual
         package. The files are accessed by the functions in `importlib.metadata`.
+        The metadata file paths and contents are cached for the test session,
+        so that the real filesystem is only accessed the first time a package
+        is added. The added files are read-only.
 
         Args:
             package_name: Name of the package whose metadata shall be copied
@@ -2569,6 +2776,30 @@ class FakeFilesystem:
         Raises:
             PackageNotFoundError: if the package with the given name is not found
         """
+        self.add_packages_metadata([package_name])
+
+    def add_packages_metadata(self, package_names: Iterable[str]) -> None:
+        """Convenience function to add the metadata distribution files of all
+        packages with the given names to the fake filesystem.
+        See :py:meth:`add_package_metadata`.
+
+        Args:
+            package_names: Names of the packages whose metadata shall be copied
+
+        Raises:
+            PackageNotFoundError: if any of the packages is not found
+        """
+        package_names = list(package_names)
+        self._cache_package_metadata(
+            [name for name in package_names if name not in self.PACKAGE_METADATA_CACHE]
+        )
+        for package_name in package_names:
+            for metadata_file in self.PACKAGE_METADATA_CACHE[package_name]:
+                self.add_frozen_tree(metadata_file)
+
+    def _cache_package_metadata(self, package_names: list[str]) -> None:
+        if not package_names:
+            return
         from importlib.metadata import distribution, PackageNotFoundError
 
         # we have to pause patching to get the distribution
@@ -2576,11 +2807,14 @@ class FakeFilesystem:
         if self.has_patcher:
             self.pause()
         try:
-            dist_files = distribution(package_name).files
-            if dist_files is None:
-                raise PackageNotFoundError(package_name)
-            for metadata_file in dist_files:
-                self.add_real_file(metadata_file.locate())
+            for package_name in package_names:
+                dist_files = distribution(package_name).files
+                if dist_files is None:
+                    raise PackageNotFoundError(package_name)
+                self.PACKAGE_METADATA_CACHE[package_name] = [
+                    fake_file.FrozenTree(metadata_file.locate())
+                    for metadata_file in dist_files
+                ]
         finally:
             if self.has_patcher:
                 self.resume()
@@ -3284,9 +3518,15 @@ class FakeFilesystem:
         # the temp directory is assumed to exist at least in `tempfile`,
         # so we create it here for convenience
         temp_dir = self._tempdir_name()
-        if not self.exists(temp_dir):
-            self.create_dir(temp_dir)
-        if sys.platform != "win32" and not self.exists("/tmp"):
+        if self._is_overlay:
+            if not self.exists(temp_dir):
+                self.create_dir(temp_dir)
+        else:
+            # the file system has just been reset, so only the root exists
+            temp_dir = self.absnormpath(temp_dir)
+            self._auto_mount_drive_if_needed(temp_dir)
+            self._add_directories(temp_dir, helpers.PERM_DEF, apply_umask=True)
+        if sys.platform != "win32" and temp_dir != "/tmp" and not self.exists("/tmp"):
             # under Posix, we also create a link in /tmp if the path does not exist
             self.create_symlink("/tmp", temp_dir)
             # reset the used size to 0 to avoid having the link size counted
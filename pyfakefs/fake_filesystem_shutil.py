@@ -30,14 +30,33 @@ or directly `Patcher`.
 
 from __future__ import annotations
 
+import errno
 import functools
 import os
 import shutil
 import sys
+import warnings
+from contextlib import contextmanager
+from stat import S_IFREG, S_ISDIR, S_ISLNK, S_ISREG
 from threading import RLock
 from collections.abc import Callable
 from typing import TYPE_CHECKING
 
+from pyfakefs.fake_file import FakeDirectory, FakeFile, copy_file_object
+from pyfakefs.fake_os import FakeOsModule
+from pyfakefs.helpers import (
+    PERM_ALL,
+    PERM_DEF,
+    PERM_DEF_FILE,
+    PERM_EXE,
+    PERM_READ,
+    PERM_WRITE,
+    is_faking_paused,
+    is_root,
+    make_string_path,
+    now,
+)
+
 if TYPE_CHECKING:
     from pyfakefs.fake_filesystem import FakeFilesystem
 
@@ -58,9 +77,22 @@ class FakeShutilModule:
     has_fcopy_file = hasattr(shutil, "_HAS_FCOPYFILE") and shutil._HAS_FCOPYFILE  # type: ignore[attr-defined]
     use_sendfile = hasattr(shutil, "_USE_CP_SENDFILE") and shutil._USE_CP_SENDFILE  # type: ignore[attr-defined]
     use_fd_functions = shutil._use_fd_functions  # type: ignore[attr-defined]
-    functions_to_patch = ["copy", "copyfile", "rmtree"]
+    functions_to_patch = ["copy", "copyfile"]
     if sys.version_info < (3, 12) or sys.platform != "win32":
-        functions_to_patch.extend(["copy2", "copytree", "move"])
+        functions_to_patch.extend(["copy2", "move"])
+    # module functions that are replaced by their native implementations
+    # while patched functions are executed
+    native_functions = {
+        "copyfileobj": "copyfileobj",
+        "_copyfileobj_readinto": "copyfileobj",
+        "copytree": "copytree",
+        "rmtree": "rmtree",
+    }
+    original_functions = {
+        name: getattr(shutil, name)
+        for name in native_functions
+        if hasattr(shutil, name)
+    }
 
     @staticmethod
     def dir():
@@ -89,6 +121,9 @@ class FakeShutilModule:
             self.shutil_module._USE_CP_COPY_FILE_RANGE = False
         if self.use_sendfile:
             self.shutil_module._USE_CP_SENDFILE = False
+        for name in self.original_functions:
+            native_function = getattr(self, self.native_functions[name])
+            setattr(self.shutil_module, name, native_function)
         if self.use_fd_functions:
             if sys.version_info >= (3, 14):
                 self.shutil_module._rmtree_impl = (
@@ -107,6 +142,8 @@ class FakeShutilModule:
             self.shutil_module._USE_CP_COPY_FILE_RANGE = True
         if self.use_sendfile:
             self.shutil_module._USE_CP_SENDFILE = True
+        for name, function in self.original_functions.items():
+            setattr(self.shutil_module, name, function)
         if self.use_fd_functions:
             if sys.version_info >= (3, 14):
                 self.shutil_module._rmtree_impl = (
@@ -115,6 +152,15 @@ class FakeShutilModule:
             else:
                 self.shutil_module._use_fd_functions = True
 
+    @contextmanager
+    def _patched_globals(self):
+        with self.module_lock:
+            self._start_patching_global_vars()
+            try:
+                yield
+            finally:
+                self._stop_patching_global_vars()
+
     def with_patched_globals(self, f: Callable) -> Callable:
         """Function wrapper that patches global variables during function execution.
         Can be used in multi-threading code.
@@ -122,12 +168,8 @@ class FakeShutilModule:
 
         @functools.wraps(f)
         def wrapped(*args, **kwargs):
-            with self.module_lock:
-                self._start_patching_global_vars()
-                try:
-                    return f(*args, **kwargs)
-                finally:
-                    self._stop_patching_global_vars()
+            with self._patched_globals():
+                return f(*args, **kwargs)
 
         return wrapped
 
@@ -138,8 +180,365 @@ class FakeShutilModule:
         Args:
           path: defines the filesystem device which is queried
         """
+        if is_faking_paused():
+            return self.shutil_module.disk_usage(path)
         return self.filesystem.get_disk_usage(path)
 
+    def copyfileobj(self, fsrc, fdst, length=0):
+        """Copy the contents of the file-like object `fsrc` to `fdst`.
+        Fake binary files are copied natively, so that copying a file with
+        `copyfile`, `copy`, `copy2`, `copytree` or `move` does not read and
+        write the contents in chunks, and the copy shares the contents
+        of the source file until one of them is changed.
+        """
+        if not copy_file_object(fsrc, fdst):
+            self.original_functions["copyfileobj"](fsrc, fdst, length)
+
+    def rmtree(
+        self, path, ignore_errors=False, onerror=None, *, onexc=None, dir_fd=None
+    ):
+        """Remove the directory tree at `path`, as `shutil.rmtree` does.
+        The entries of accessible fake directories are removed directly,
+        instead of scanning and removing each entry by its path.
+        """
+        if onexc is not None and sys.version_info < (3, 12):
+            raise TypeError("rmtree() got an unexpected keyword argument 'onexc'")
+        if (
+            dir_fd is not None
+            or isinstance(make_string_path(path), bytes)
+            or not self._uses_fake_os()
+        ):
+            kwargs = {} if onexc is None else {"onexc": onexc}
+            return self.with_patched_globals(self.original_functions["rmtree"])(
+                path, ignore_errors, onerror, dir_fd=dir_fd, **kwargs
+            )
+        if onerror is not None and sys.version_info >= (3, 12):
+            warnings.warn(
+                "onerror argument is deprecated, use onexc instead",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+        sys.audit("shutil.rmtree", path, dir_fd)
+        onexc = self._rmtree_error_handler(ignore_errors, onerror, onexc)
+        os_module = self.shutil_module.os
+        try:
+            if os_module.path.islink(path):
+                raise OSError("Cannot call rmtree on a symbolic link")
+        except OSError as err:
+            onexc(os_module.path.islink, path, err)
+            return
+        directory = self._accessible_dir(path, PERM_READ | PERM_WRITE | PERM_EXE)
+        self._rmtree(path, onexc, directory)
+
+    rmtree.avoids_symlink_attacks = False  # type: ignore[attr-defined]
+
+    @staticmethod
+    def _rmtree_error_handler(ignore_errors, onerror, onexc):
+        if ignore_errors:
+
+            def handler(func, path, exc):
+                pass
+
+        elif onexc is not None:
+            handler = onexc
+        elif onerror is not None:
+
+            def handler(func, path, exc):
+                return onerror(func, path, (type(exc), exc, exc.__traceback__))
+
+        else:
+
+            def handler(func, path, exc):
+                raise
+
+        return handler
+
+    def _rmtree(self, path, onexc, directory=None, parent=None):
+        """Remove the tree at `path` with the same semantics as
+        `shutil._rmtree_unsafe`. If `directory` is given, it is the accessible
+        fake directory at `path`, and its entries are removed directly.
+        If `parent` is given, `directory` is removed from it directly.
+        """
+        os_module = self.shutil_module.os
+        if directory is None:
+            try:
+                with os_module.scandir(path) as scandir_it:
+                    entries = list(scandir_it)
+            except OSError as err:
+                onexc(os_module.scandir, path, err)
+                entries = []
+            for entry in entries:
+                fullname = entry.path
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    try:
+                        if entry.is_symlink():
+                            raise OSError("Cannot call rmtree on a symbolic link")
+                    except OSError as err:
+                        onexc(os_module.path.islink, fullname, err)
+                        continue
+                    self._rmtree(fullname, onexc)
+                else:
+                    try:
+                        os_module.unlink(fullname)
+                    except OSError as err:
+                        onexc(os_module.unlink, fullname, err)
+        else:
+            base_path = make_string_path(path)
+            for name, entry in list(directory.entries.items()):
+                fullname = self.filesystem.joinpaths(base_path, name)
+                if not S_ISDIR(entry.st_mode):
+                    try:
+                        directory.remove_entry(name, recursive=False)
+                    except OSError as err:
+                        onexc(os_module.unlink, fullname, err)
+                elif self._has_access(entry, PERM_READ | PERM_WRITE | PERM_EXE):
+                    self._rmtree(fullname, onexc, entry, directory)
+                else:
+                    self._rmtree(fullname, onexc)
+        try:
+            if parent is None:
+                os_module.rmdir(path)
+            elif directory.entries:
+                self.filesystem.raise_os_error(
+                    errno.ENOTEMPTY, self.filesystem.absnormpath(path)
+                )
+            else:
+                parent.remove_entry(directory.name, recursive=False)
+        except OSError as err:
+            onexc(os_module.rmdir, path, err)
+
+    def copytree(
+        self,
+        src,
+        dst,
+        symlinks=False,
+        ignore=None,
+        copy_function=shutil.copy2,
+        ignore_dangling_symlinks=False,
+        dirs_exist_ok=False,
+    ):
+        """Copy the directory tree at `src` to `dst`, as `shutil.copytree`
+        does. Accessible fake directories are walked directly, and files
+        copied with `copy2` or `copy` are created without resolving their
+        paths, sharing the contents with the source files.
+        """
+        options = (
+            symlinks,
+            ignore,
+            copy_function,
+            ignore_dangling_symlinks,
+            dirs_exist_ok,
+        )
+        source_dir = None
+        if self._uses_fake_os() and not isinstance(make_string_path(dst), bytes):
+            source_dir = self._accessible_dir(src, PERM_READ | PERM_EXE)
+        if source_dir is None:
+            if sys.version_info >= (3, 12) and sys.platform == "win32":
+                if copy_function == shutil.copy2:
+                    # make sure the Windows API is not used
+                    options = (*options[:2], self.copy2, *options[3:])
+            return self.with_patched_globals(self.original_functions["copytree"])(
+                src, dst, *options
+            )
+        sys.audit("shutil.copytree", src, dst)
+        with self._patched_globals():
+            return self._copytree(src, dst, source_dir, None, False, options)
+
+    def _copytree(self, src, dst, source_dir, dest_parent, parent_is_new, options):
+        """Copy the accessible fake directory `source_dir` at `src` to `dst`
+        with the same semantics as `shutil._copytree`. If `dest_parent` is
+        given, it is the accessible parent directory of `dst`.
+        """
+        (
+            symlinks,
+            ignore,
+            copy_function,
+            ignore_dangling_symlinks,
+            dirs_exist_ok,
+        ) = options
+        filesystem = self.filesystem
+        os_module = self.shutil_module.os
+        entries = list(source_dir.entries.items())
+        if ignore is not None:
+            ignored_names = ignore(os.fspath(src), [name for name, _ in entries])
+        else:
+            ignored_names = set()
+
+        dest_dir, is_new = self._make_dest_dir(
+            dst, dest_parent, parent_is_new, dirs_exist_ok
+        )
+        errors = []
+        native_copy = self._native_copy_function(copy_function)
+        src_path = make_string_path(src)
+        dst_path = make_string_path(dst)
+        for name, entry in entries:
+            if name in ignored_names:
+                continue
+            srcname = filesystem.joinpaths(src_path, name)
+            dstname = filesystem.joinpaths(dst_path, name)
+            try:
+                if S_ISLNK(entry.st_mode):
+                    linkto = os_module.readlink(srcname)
+                    if symlinks:
+                        os_module.symlink(linkto, dstname)
+                        self.shutil_module.copystat(
+                            srcname, dstname, follow_symlinks=not symlinks
+                        )
+                    else:
+                        # ignore dangling symlink if the flag is on
+                        if (
+                            not os_module.path.exists(linkto)
+                            and ignore_dangling_symlinks
+                        ):
+                            continue
+                        if os_module.path.isdir(srcname):
+                            self.copytree(srcname, dstname, *options)
+                        else:
+                            copy_function(srcname, dstname)
+                elif S_ISDIR(entry.st_mode):
+                    if dest_dir is not None and self._has_access(
+                        entry, PERM_READ | PERM_EXE
+                    ):
+                        sys.audit("shutil.copytree", srcname, dstname)
+                        self._copytree(
+                            srcname, dstname, entry, dest_dir, is_new, options
+                        )
+                    else:
+                        self.copytree(srcname, dstname, *options)
+                elif (
+                    native_copy is not None
+                    and dest_dir is not None
+                    and S_ISREG(entry.st_mode)
+                    and not entry.is_large_file()
+                    and self._has_access(entry, PERM_READ)
+                    and (
+                        is_new
+                        or filesystem._directory_content(dest_dir, name)[1] is None
+                    )
+                ):
+                    self._copy_file(entry, dest_dir, name, native_copy == "copy")
+                else:
+                    copy_function(srcname, dstname)
+            # catch the Error from the recursive copytree so that we can
+            # continue with other files
+            except self.shutil_module.Error as err:
+                errors.extend(err.args[0])
+            except OSError as why:
+                errors.append((srcname, dstname, str(why)))
+        try:
+            if dest_dir is None:
+                self.shutil_module.copystat(src, dst)
+            else:
+                self._copy_stat(source_dir, dest_dir)
+        except OSError as why:
+            # Copying file access times may fail on Windows
+            if getattr(why, "winerror", None) is None:
+                errors.append((src, dst, str(why)))
+        if errors:
+            raise self.shutil_module.Error(errors)
+        return dst
+
+    def _make_dest_dir(self, dst, dest_parent, parent_is_new, exist_ok):
+        """Create the destination directory `dst` as `os.makedirs` does.
+        Return the directory if it can be accessed directly, or `None`,
+        and whether it has been newly created.
+        """
+        filesystem = self.filesystem
+        if dest_parent is not None:
+            name = filesystem.splitpath(make_string_path(dst))[1]
+            if (
+                parent_is_new
+                or filesystem._directory_content(dest_parent, name)[1] is None
+            ):
+                directory = FakeDirectory(
+                    name, PERM_DEF & ~filesystem.umask, filesystem=filesystem
+                )
+                dest_parent.add_entry(directory)
+                if self._has_access(directory, PERM_READ | PERM_WRITE | PERM_EXE):
+                    return directory, True
+                return None, True
+        self.shutil_module.os.makedirs(dst, exist_ok=exist_ok)
+        return self._accessible_dir(dst, PERM_READ | PERM_WRITE | PERM_EXE), False
+
+    def _copy_file(self, source, dest_dir, name, mode_only):
+        """Create a copy of the fake file `source` in `dest_dir`, as
+        `shutil.copy` (if `mode_only` is set) or `shutil.copy2` do.
+        """
+        filesystem = self.filesystem
+        target = FakeFile(
+            name, S_IFREG | (PERM_DEF_FILE & ~filesystem.umask), filesystem=filesystem
+        )
+        dest_dir.add_entry(target)
+        if target.copy_from(source) and not filesystem.is_windows_fs:
+            source.st_atime = now()
+        self._copy_stat(source, target, mode_only)
+
+    def _copy_stat(self, source, target, mode_only=False):
+        """Copy the permission bits and, unless `mode_only` is set, the access
+        and modification times and the extended attributes from `source` to
+        `target`, as `shutil.copymode` and `shutil.copystat` do.
+        """
+        filesystem = self.filesystem
+        if not mode_only:
+            target.stat_result.st_atime_ns = source.stat_result.st_atime_ns
+            target.stat_result.st_mtime_ns = source.stat_result.st_mtime_ns
+            if filesystem.is_linux:
+                target.xattr.update(source.xattr)
+        if not filesystem.is_windows_fs:
+            target.st_mode = (target.st_mode & ~PERM_ALL) | (source.st_mode & PERM_ALL)
+        elif source.st_mode & PERM_WRITE:
+            target.st_mode |= 0o222
+        else:
+            target.st_mode &= 0o777555
+        target.st_ctime = now()
+
+    def _native_copy_function(self, copy_function):
+        """Return the name of the `shutil` function used to copy files,
+        if it can be replaced by a direct copy, else `None`."""
+        function = getattr(copy_function, "__wrapped__", copy_function)
+        if function is self.shutil_module.copy2:
+            return "copy2"
+        if function is self.shutil_module.copy:
+            return "copy"
+        if hasattr(type(self), "copy2") and function == self.copy2:
+            return "copy2"
+        return None
+
+    def _uses_fake_os(self):
+        """Return `True` if the patched `shutil` functions access the fake
+        filesystem, so that they can be implemented on the fake objects."""
+        return (
+            isinstance(self.shutil_module.os, FakeOsModule)
+            and not FakeOsModule.use_original
+            and not is_faking_paused()
+        )
+
+    def _has_access(self, file_object, permission):
+        return (
+            is_root()
+            or self.filesystem.is_windows_fs
+            or file_object.has_permission(permission)
+        )
+
+    def _accessible_dir(self, path, permission):
+        """Return the fake directory at `path`, if all parent directories
+        can be searched, and the directory can be accessed with the given
+        permission, else `None`."""
+        path = make_string_path(path)
+        if isinstance(path, bytes):
+            return None
+        try:
+            directory = self.filesystem.resolve(path)
+        except OSError:
+            return None
+        if S_ISDIR(directory.st_mode) and self._has_access(directory, permission):
+            return directory
+        return None
+
     if sys.version_info >= (3, 12) and sys.platform == "win32":
 
         def copy2(self, src, dst, *, follow_symlinks=True):
@@ -147,6 +546,10 @@ class FakeShutilModule:
             using the Windows API. We just remove this and fall back to the previous
             implementation.
             """
+            if is_faking_paused():
+                return self.shutil_module.copy2(
+                    src, dst, follow_symlinks=follow_symlinks
+                )
             if self.filesystem.isdir(dst):
                 dst = self.filesystem.joinpaths(dst, os.path.basename(src))
 
@@ -154,29 +557,6 @@ class FakeShutilModule:
             self.copystat(src, dst, follow_symlinks=follow_symlinks)
             return dst
 
-        def copytree(
-            self,
-            src,
-            dst,
-            symlinks=False,
-            ignore=None,
-            copy_function=shutil.copy2,
-            ignore_dangling_symlinks=False,
-            dirs_exist_ok=False,
-        ):
-            """Make sure the default argument is patched."""
-            if copy_function == shutil.copy2:
-                copy_function = self.copy2
-            return self.shutil_module.copytree(
-                src,
-                dst,
-                symlinks,
-                ignore,
-                copy_function,
-                ignore_dangling_symlinks,
-                dirs_exist_ok,
-            )
-
         def move(self, src, dst, copy_function=shutil.copy2):
             """Make sure the default argument is patched."""
             if copy_function == shutil.copy2:
@@ -37,25 +37,37 @@ to `:py:class`pyfakefs.fake_filesystem_unittest.TestCase`.
 """
 
 import _io  # type:ignore[import]
+import contextlib
 import doctest
 import functools
 import genericpath
 import glob
+import hashlib
 import inspect
 import io
+import json
 import linecache
 import os
 import sys
 import tempfile
+import threading
+import time
 import tokenize
 import unittest
 import warnings
 import weakref
+from enum import Enum
 from importlib import reload
 from importlib.abc import Loader, MetaPathFinder
 from importlib.machinery import ModuleSpec
 from importlib.util import spec_from_file_location, module_from_spec
-from types import ModuleType, TracebackType, FunctionType
+from types import (
+    ModuleType,
+    TracebackType,
+    FunctionType,
+    BuiltinFunctionType,
+    MethodType,
+)
 from typing import (
     Any,
     Optional,
@@ -65,10 +77,11 @@ from typing import (
 from collections.abc import Callable, Iterator, ItemsView, Sequence
 from unittest import TestSuite
 
+from pyfakefs import __version__
 from pyfakefs import fake_filesystem, fake_io, fake_os, fake_open, fake_path, fake_file
 from pyfakefs import fake_filesystem_shutil
+from pyfakefs import fake_mmap
 from pyfakefs import fake_pathlib
-from pyfakefs import mox3_stubout
 from pyfakefs.fake_filesystem import (
     set_uid,
     set_gid,
@@ -77,12 +90,29 @@ from pyfakefs.fake_filesystem import (
     FakeFilesystem,
 )
 from pyfakefs.fake_os import use_original_os
-from pyfakefs.helpers import IS_PYPY, IS_WIN
-from pyfakefs.mox3_stubout import StubOutForTesting
+from pyfakefs.helpers import IS_PYPY, IS_WIN, set_faking_paused
 
 OS_MODULE = "nt" if sys.platform == "win32" else "posix"
 PATH_MODULE = "ntpath" if sys.platform == "win32" else "posixpath"
 
+# a default argument to patch: the attribute path to the function
+# (module attribute and class member name), function, argument index and value
+DefaultValue = tuple[tuple[str, Optional[str]], FunctionType, int, Any]
+# the file system modules, functions and default arguments referenced by a module
+ModuleIndex = tuple[dict[str, Any], dict[str, FunctionType], list[DefaultValue]]
+
+
+class UnloadMode(Enum):
+    """Defines which modules loaded during a test are unloaded after the test:
+    all of them (`ON`), none of them (`OFF`), or only the modules that
+    reference fake objects (`AUTO`).
+    Used for the `unload_modules` option.
+    """
+
+    OFF = 1
+    AUTO = 2
+    ON = 3
+
 
 class TempfilePatcher:
     """Handles tempfile patching for Posix systems."""
@@ -196,6 +226,9 @@ def patchfs(
     patch_default_args: bool = False,
     use_cache: bool = True,
     use_dynamic_patch: bool = True,
+    use_overlay: bool = False,
+    patch_only: list[str | ModuleType] | None = None,
+    unload_modules: UnloadMode = UnloadMode.ON,
 ) -> Callable:
     """Convenience decorator to use patcher with additional parameters in a
     test function.
@@ -224,6 +257,9 @@ def patchfs(
                 patch_default_args=patch_default_args,
                 use_cache=use_cache,
                 use_dynamic_patch=use_dynamic_patch,
+                use_overlay=use_overlay,
+                patch_only=patch_only,
+                unload_modules=unload_modules,
             ) as p:
                 args = list(args)
                 args.append(p.fs)
@@ -260,6 +296,7 @@ def load_doctests(
     patch_open_code: PatchMode = PatchMode.OFF,
     patch_default_args: bool = False,
     use_dynamic_patch: bool = True,
+    use_overlay: bool = False,
 ) -> TestSuite:  # pylint:disable=unused-argument
     """Load the doctest tests for the specified module into unittest.
         Args:
@@ -280,6 +317,7 @@ def load_doctests(
             patch_open_code=patch_open_code,
             patch_default_args=patch_default_args,
             use_dynamic_patch=use_dynamic_patch,
+            use_overlay=use_overlay,
             is_doc_test=True,
         )
     assert Patcher.DOC_PATCHER is not None
@@ -360,6 +398,9 @@ class TestCaseMixin:
         patch_default_args: bool = False,
         use_cache: bool = True,
         use_dynamic_patch: bool = True,
+        use_overlay: bool = False,
+        patch_only: list[str | ModuleType] | None = None,
+        unload_modules: UnloadMode = UnloadMode.ON,
     ) -> None:
         """Bind the file-related modules to the :py:class:`pyfakefs` fake file
         system instead of the real file system.  Also bind the fake `open()`
@@ -392,6 +433,9 @@ class TestCaseMixin:
             patch_default_args=patch_default_args,
             use_cache=use_cache,
             use_dynamic_patch=use_dynamic_patch,
+            use_overlay=use_overlay,
+            patch_only=patch_only,
+            unload_modules=unload_modules,
         )
 
         self._patcher.setUp()
@@ -409,6 +453,9 @@ class TestCaseMixin:
         patch_default_args: bool = False,
         use_cache: bool = True,
         use_dynamic_patch: bool = True,
+        use_overlay: bool = False,
+        patch_only: list[str | ModuleType] | None = None,
+        unload_modules: UnloadMode = UnloadMode.ON,
     ) -> None:
         """Similar to :py:func:`setUpPyfakefs`, but as a class method that
         can be used in `setUpClass` instead of in `setUp`.
@@ -440,6 +487,9 @@ class TestCaseMixin:
             patch_default_args=patch_default_args,
             use_cache=use_cache,
             use_dynamic_patch=use_dynamic_patch,
+            use_overlay=use_overlay,
+            patch_only=patch_only,
+            unload_modules=unload_modules,
         )
 
         Patcher.PATCHER.setUp()
@@ -538,6 +588,7 @@ class Patcher:
         fake_open,
         fake_path,
         fake_file,
+        fake_mmap,
         sys,
         linecache,
         tokenize,
@@ -583,6 +634,21 @@ class Patcher:
     FS_FUNCTIONS: dict[tuple[str, str, str], set[ModuleType]] = {}
     FS_DEFARGS: list[tuple[FunctionType, int, Callable[..., Any]]] = []
     SKIPPED_FS_MODULES: dict[str, set[tuple[ModuleType, str]]] = {}
+    # incremented each time the caches above are changed
+    CACHE_VERSION = 0
+    # the module attributes to patch, compiled from the caches above:
+    # tuples of the module namespace, attribute name and fake object key
+    PATCH_PLAN: list[tuple[dict[str, Any], str, tuple[str, ...]]] = []
+    PATCH_PLAN_KEY: tuple[int, tuple[str, ...]] | None = None
+    # the import hook updating the caches above, installed on first use
+    MODULE_INDEXER: Optional["ModuleIndexer"] = None
+    # optional persistent cache of the module index, used across test sessions
+    MODULE_INDEX_CACHE: Optional["ModuleIndexCache"] = None
+    # the patcher that has paused faking with the modules still patched
+    FAKING_PAUSED_BY: Optional["Patcher"] = None
+    # the fake module functions by function and module name,
+    # computed once for each combination of fake module classes
+    FAKE_MODULE_FUNCTIONS: dict[tuple[tuple[str, Any], ...], dict[str, dict]] = {}
 
     assert None in SKIPMODULES, "sys.modules contains 'None' values; must skip them."
 
@@ -594,6 +660,7 @@ class Patcher:
     PATCHED_MODULE_NAMES: set[str] = set()
     ADDITIONAL_SKIP_NAMES: set[str] = set()
     PATCH_DEFAULT_ARGS = False
+    PATCH_ONLY: tuple[str, ...] | None = None
     PATCHER: Optional["Patcher"] = None
     DOC_PATCHER: Optional["Patcher"] = None
     REF_COUNT = 0
@@ -619,6 +686,9 @@ class Patcher:
         patch_default_args: bool = False,
         use_cache: bool = True,
         use_dynamic_patch: bool = True,
+        use_overlay: bool = False,
+        patch_only: list[str | ModuleType] | None = None,
+        unload_modules: UnloadMode = UnloadMode.ON,
         is_doc_test: bool = False,
     ) -> None:
         """
@@ -654,6 +724,22 @@ class Patcher:
             use_dynamic_patch: If `True`, dynamic patching after setup is used
                 (for example for modules loaded locally inside of functions).
                 Can be switched off if it causes unwanted side effects.
+            use_overlay: If `True`, the fake filesystem is an overlay over the
+                real filesystem: all real files and directories are visible
+                and read lazily on access, while all changes are done in the
+                fake filesystem only.
+            patch_only: If given, only the listed modules (given by name or
+                as module) and their submodules are patched, in addition to
+                the built-in functions like `open` and the `pathlib` internals.
+                No other loaded modules are searched for file system modules
+                and functions, and modules loaded after setup are not patched
+                dynamically.
+            unload_modules: Defines which modules loaded during the test are
+                unloaded after the test, so that they are loaded again in the
+                next test. If `UnloadMode.ON` (default), all of them are
+                unloaded. If `UnloadMode.OFF`, none of them are unloaded.
+                If `UnloadMode.AUTO`, only modules that reference fake
+                modules or objects, or other unloaded modules, are unloaded.
         """
         self.is_doc_test = is_doc_test
         if is_doc_test:
@@ -670,6 +756,9 @@ class Patcher:
                 or patch_default_args
                 or not use_cache
                 or not use_dynamic_patch
+                or use_overlay
+                or patch_only is not None
+                or unload_modules != UnloadMode.ON
             ):
                 warnings.warn(
                     "Nested fake filesystem invocation using custom arguments - "
@@ -699,6 +788,7 @@ class Patcher:
         self._unfaked_module_classes: dict[str, Any] = {}
         self._class_modules: dict[str, list[str]] = {}
         self._init_fake_module_classes()
+        pyfakefs_module_classes = dict(self._fake_module_classes)
 
         # reload tempfile under posix to patch default argument
         self.modules_to_reload: list[ModuleType] = []
@@ -706,11 +796,24 @@ class Patcher:
             self.modules_to_reload.extend(modules_to_reload)
         self.patch_default_args = patch_default_args
         self.use_cache = use_cache
+        self.patch_only: tuple[str, ...] | None = None
+        if patch_only is not None:
+            self.patch_only = tuple(
+                cast(ModuleType, m).__name__ if inspect.ismodule(m) else cast(str, m)
+                for m in patch_only
+            )
+            self._patch_only_prefixes = tuple(name + "." for name in self.patch_only)
+            use_dynamic_patch = False
         self.use_dynamic_patch = use_dynamic_patch
+        self.use_overlay = use_overlay
+        self.unload_modules = unload_modules
         self.cleanup_handlers: dict[str, Callable[[str], bool]] = {}
 
         # Attributes set by _refresh()
-        self._stubs: StubOutForTesting | None = None
+        # the patch plan with the fake objects, and the replaced objects
+        self._fake_plan: list[tuple[dict[str, Any], str, Any]] = []
+        self._fake_plan_key: tuple[int, tuple[str, ...]] | None = None
+        self._patched: list[tuple[dict[str, Any], str, Any]] = []
         self.fs: FakeFilesystem | None = None
         self.fake_modules: dict[str, Any] = {}
         self.unfaked_modules: dict[str, Any] = {}
@@ -743,6 +846,11 @@ class Patcher:
             patched_module_names = set(modules_to_patch)
         else:
             patched_module_names = set()
+        # only the pyfakefs fake modules pass their calls to the real modules
+        # while faking is paused
+        self._fake_modules_can_pause = (
+            self._fake_module_classes == pyfakefs_module_classes
+        )
         clear_cache = not use_cache
         if use_cache:
             if patched_module_names != self.PATCHED_MODULE_NAMES:
@@ -754,20 +862,31 @@ class Patcher:
             if patch_default_args != self.PATCH_DEFAULT_ARGS:
                 self.__class__.PATCH_DEFAULT_ARGS = patch_default_args
                 clear_cache = True
+            if self.patch_only != self.PATCH_ONLY:
+                self.__class__.PATCH_ONLY = self.patch_only
+                clear_cache = True
 
         if clear_cache:
             self.clear_cache()
-        self._fake_module_functions: dict[str, dict] = {}
-        self._init_fake_module_functions()
+        fake_module_classes = tuple(self._fake_module_classes.items())
+        if fake_module_classes not in self.FAKE_MODULE_FUNCTIONS:
+            self.FAKE_MODULE_FUNCTIONS[fake_module_classes] = (
+                self._init_fake_module_functions()
+            )
+        self._fake_module_functions = self.FAKE_MODULE_FUNCTIONS[fake_module_classes]
 
     @classmethod
     def clear_fs_cache(cls) -> None:
-        """Clear the module cache."""
+        """Clear the module cache and the package metadata cache."""
         cls.CACHED_MODULES = set()
         cls.FS_MODULES = {}
         cls.FS_FUNCTIONS = {}
         cls.FS_DEFARGS = []
         cls.SKIPPED_FS_MODULES = {}
+        cls.CACHE_VERSION += 1
+        if cls.MODULE_INDEXER is not None:
+            cls.MODULE_INDEXER.clear()
+        fake_filesystem.FakeFilesystem.PACKAGE_METADATA_CACHE = {}
 
     def clear_cache(self) -> None:
         """Clear the module cache (convenience instance method)."""
@@ -789,25 +908,30 @@ class Patcher:
         """
         self.cleanup_handlers[name] = handler
 
+    # we instantiate the fake pathlib library with `from_patcher` set
+    # to avoid faking pathlib.os (already faked by the patcher)
+    @staticmethod
+    def _fake_pathlib_module(fs: FakeFilesystem):
+        return fake_pathlib.FakePathlibModule(fs, from_patcher=True)
+
+    @staticmethod
+    def _fake_path_module(fs: FakeFilesystem):
+        return fake_pathlib.FakePathlibPathModule(fs, from_patcher=True)
+
     def _init_fake_module_classes(self) -> None:
         # IMPORTANT TESTING NOTE: Whenever you add a new module below, test
         # it by adding an attribute in fixtures/module_with_attributes.py
         # and a test in fake_filesystem_unittest_test.py, class
         # TestAttributesWithFakeModuleNames.
 
-        # we instantiate the fake pathlib library with `from_patcher` set
-        # to avoid faking pathlib.os (already faked by the patcher)
-        def fake_pathlib_module(fs: FakeFilesystem):
-            return fake_pathlib.FakePathlibModule(fs, from_patcher=True)
-
-        def fake_path_module(fs: FakeFilesystem):
-            return fake_pathlib.FakePathlibPathModule(fs, from_patcher=True)
-
+        fake_pathlib_module = self._fake_pathlib_module
+        fake_path_module = self._fake_path_module
         self._fake_module_classes = {
             "os": fake_os.FakeOsModule,
             "shutil": fake_filesystem_shutil.FakeShutilModule,
             "io": fake_io.FakeIoModule,
             "pathlib": fake_pathlib_module,
+            "mmap": fake_mmap.FakeMmapModule,
         }
         if sys.version_info[:2] == (3, 13):
             # for Python 3.13, we need both pathlib (path with __init__.py) and
@@ -836,21 +960,22 @@ class Patcher:
         self._fake_module_classes["Path"] = fake_path_module
         self._unfaked_module_classes["Path"] = fake_pathlib.RealPathlibPathModule
 
-    def _init_fake_module_functions(self) -> None:
+    def _init_fake_module_functions(self) -> dict[str, dict]:
         # handle patching function imported separately like
         # `from os import stat`
         # each patched function name has to be looked up separately
+        fake_module_functions: dict[str, dict] = {}
         for mod_name, fake_module in self._fake_module_classes.items():
             if hasattr(fake_module, "dir"):
                 module_dir = fake_module.dir
                 if inspect.isfunction(module_dir):
                     for fct_name in fake_module.dir():
                         module_attr = (getattr(fake_module, fct_name), mod_name)
-                        self._fake_module_functions.setdefault(fct_name, {})[
-                            mod_name
-                        ] = module_attr
+                        fake_module_functions.setdefault(fct_name, {})[mod_name] = (
+                            module_attr
+                        )
                         if mod_name == "os":
-                            self._fake_module_functions.setdefault(fct_name, {})[
+                            fake_module_functions.setdefault(fct_name, {})[
                                 OS_MODULE
                             ] = module_attr
 
@@ -858,12 +983,9 @@ class Patcher:
         fake_module = fake_filesystem.FakePathModule
         for fct_name in fake_module.dir():
             module_attr = (getattr(fake_module, fct_name), PATH_MODULE)
-            self._fake_module_functions.setdefault(fct_name, {})["genericpath"] = (
-                module_attr
-            )
-            self._fake_module_functions.setdefault(fct_name, {})[PATH_MODULE] = (
-                module_attr
-            )
+            fake_module_functions.setdefault(fct_name, {})["genericpath"] = module_attr
+            fake_module_functions.setdefault(fct_name, {})[PATH_MODULE] = module_attr
+        return fake_module_functions
 
     def __enter__(self) -> "Patcher":
         """Context manager for usage outside of
@@ -882,140 +1004,33 @@ class Patcher:
     ) -> None:
         self.tearDown()
 
-    def _is_fs_module(
-        self, mod: ModuleType, name: str, module_names: list[str]
-    ) -> bool:
-        try:
-            return (
-                inspect.ismodule(mod)
-                and mod.__name__ in module_names
-                or inspect.isclass(mod)
-                and mod.__module__ in self._class_modules.get(name, [])
-            )
-        except Exception:
-            # handle cases where the module has no __name__ or __module__
-            # attribute - see #460, and any other exception triggered
-            # by inspect functions
-            return False
-
-    def _is_fs_function(self, fct: FunctionType) -> bool:
-        try:
-            return (
-                (inspect.isfunction(fct) or inspect.isbuiltin(fct))
-                and fct.__name__ in self._fake_module_functions
-                and fct.__module__ in self._fake_module_functions[fct.__name__]
-            )
-        except Exception:
-            # handle cases where the function has no __name__ or __module__
-            # attribute, or any other exception in inspect functions
-            return False
-
-    def _def_values(
-        self, item: FunctionType
-    ) -> Iterator[tuple[FunctionType, int, Any]]:
-        """Find default arguments that are file-system functions to be
-        patched in top-level functions and members of top-level classes."""
-        # check for module-level functions
-        try:
-            if item.__defaults__ and inspect.isfunction(item):
-                for i, d in enumerate(item.__defaults__):
-                    if self._is_fs_function(d):
-                        yield item, i, d
-        except Exception:
-            pass
-        try:
-            if inspect.isclass(item):
-                # check for methods in class
-                # (nested classes are ignored for now)
-                # inspect.getmembers is very expansive!
-                for m in inspect.getmembers(item, predicate=inspect.isfunction):
-                    f = cast(FunctionType, m[1])
-                    if f.__defaults__:
-                        for i, d in enumerate(f.__defaults__):
-                            if self._is_fs_function(d):
-                                yield f, i, d
-        except Exception:
-            # Ignore any exception, examples:
-            # ImportError: No module named '_gdbm'
-            # _DontDoThat() (see #523)
-            pass
-
-    def _find_def_values(self, module_items: ItemsView[str, FunctionType]) -> None:
-        for _, fct in module_items:
-            for f, i, d in self._def_values(fct):
-                self.__class__.FS_DEFARGS.append((f, i, d))
-
     def _find_modules(self) -> None:
         """Find and cache all modules that import file system modules.
         Later, `setUp()` will stub these with the fake file system
         modules.
+        If the cache is used, modules imported later are indexed by the
+        session-wide module indexer as soon as they have been imported.
         """
-        module_names = list(self._fake_module_classes.keys()) + [PATH_MODULE]
-        items = sys.modules.copy().items()
-        for name, module in items:
-            try:
-                if (
-                    self.use_cache
-                    and module in self.CACHED_MODULES
-                    or not inspect.ismodule(module)
-                ):
-                    continue
-            except Exception:
-                # workaround for some py (part of pytest) versions
-                # where py.error has no __name__ attribute
-                # see https://github.com/pytest-dev/py/issues/73
-                # and any other exception triggered by inspect.ismodule
-                if self.use_cache:
-                    try:
-                        self.__class__.CACHED_MODULES.add(module)
-                    except TypeError:
-                        # unhashable module - don't cache it
-                        pass
-                continue
-            skipped = module in self.SKIPMODULES or any(
-                [sn.startswith(module.__name__) for sn in self.skip_names]
-            )
-            module_items = module.__dict__.copy().items()
-
-            modules = {
-                name: mod
-                for name, mod in module_items
-                if self._is_fs_module(mod, name, module_names)
-            }
-
-            if skipped:
-                for name, mod in modules.items():
-                    self.__class__.SKIPPED_FS_MODULES.setdefault(name, set()).add(
-                        (module, mod.__name__)
-                    )
-            else:
-                for name, mod in modules.items():
-                    self.__class__.FS_MODULES.setdefault(name, set()).add(
-                        (module, mod.__name__)
-                    )
-                functions = {
-                    name: fct for name, fct in module_items if self._is_fs_function(fct)
-                }
-
-                for name, fct in functions.items():
-                    self.__class__.FS_FUNCTIONS.setdefault(
-                        (name, fct.__name__, fct.__module__), set()
-                    ).add(module)
-
-                # find default arguments that are file system functions
-                if self.patch_default_args:
-                    self._find_def_values(module_items)
-
-            if self.use_cache:
-                self.__class__.CACHED_MODULES.add(module)
+        if not self.use_cache:
+            ModuleIndexer(self).index_modules()
+            return
+        indexer = self.__class__.MODULE_INDEXER
+        if indexer is None:
+            indexer = ModuleIndexer(self)
+            sys.meta_path.insert(0, indexer)
+            self.__class__.MODULE_INDEXER = indexer
+        else:
+            indexer.configure(self)
+        indexer.index_modules()
 
     def _refresh(self) -> None:
         """Renew the fake file system and set the _isStale flag to `False`."""
-        if self._stubs is not None:
-            self._stubs.smart_unset_all()
-        self._stubs = mox3_stubout.StubOutForTesting()
+        self.unpatch_modules()
+        self._fake_plan_key = None
 
-        self.fs = fake_filesystem.FakeFilesystem(patcher=self, create_temp_dir=True)
+        self.fs = fake_filesystem.FakeFilesystem(
+            patcher=self, create_temp_dir=True, use_overlay=self.use_overlay
+        )
         self.fs.patch_open_code = self.patch_open_code
         for name in self._fake_module_classes:
             self.fake_modules[name] = self._fake_module_classes[name](self.fs)
@@ -1045,10 +1060,8 @@ class Patcher:
             if self.__class__.REF_COUNT > 1:
                 return
 
-        with warnings.catch_warnings():
-            # ignore warnings, see #542 and #614
-            warnings.filterwarnings("ignore")
-            self._find_modules()
+        self._end_faking_pause()
+        self._find_modules()
 
         self._refresh()
 
@@ -1063,11 +1076,18 @@ class Patcher:
         if not self._patching:
             self._patching = True
             self._paused = False
+            if Patcher.FAKING_PAUSED_BY is self:
+                # the modules have been kept patched while paused
+                Patcher.FAKING_PAUSED_BY = None
+                set_faking_paused(False)
+                if self.use_dynamic_patch and self._dyn_patcher:
+                    self._dyn_patcher.resume()
+                return
+            self._end_faking_pause()
 
             self.linecache_patcher.start_patching()
 
             self.patch_modules()
-            self.patch_functions()
             self.patch_defaults()
 
             self._set_glob_os_functions()
@@ -1092,34 +1112,28 @@ class Patcher:
         if sys.version_info >= (3, 14):
             globber.lexists = staticmethod(os.path.lexists)
 
-    def patch_functions(self) -> None:
-        assert self._stubs is not None
-        for (name, ft_name, ft_mod), modules in self.FS_FUNCTIONS.items():
-            method, mod_name = self._fake_module_functions[ft_name][ft_mod]
-            fake_module = self.fake_modules[mod_name]
-            attr = method.__get__(
-                fake_module, fake_module.__class__
-            )  # pytype: disable=attribute-error
-            for module in modules:
-                self._stubs.smart_set(module, name, attr)
-
-    def patch_modules(self) -> None:
+    def _patch_plan(self) -> list[tuple[dict[str, Any], str, tuple[str, ...]]]:
+        """Return the flat list of module attributes to patch, compiled from
+        the module caches if they have changed since the last call."""
         skip_prefix_list = []
         for rt_skip_module, prefixes in self.RUNTIME_SKIPMODULES.items():
             if rt_skip_module in sys.modules:
                 skip_prefix_list.extend(prefixes)
         skip_prefixes = tuple(skip_prefix_list)
+        plan_key = (self.CACHE_VERSION, skip_prefixes)
+        if plan_key == self.PATCH_PLAN_KEY:
+            return self.PATCH_PLAN
 
-        assert self._stubs is not None
+        plan: list[tuple[dict[str, Any], str, tuple[str, ...]]] = []
         for name, modules in self.FS_MODULES.items():
             for module, attr in modules:
                 try:
                     if not skip_prefixes or not module.__name__.startswith(
                         skip_prefixes
                     ):
-                        self._stubs.smart_set(module, name, self.fake_modules[attr])
+                        plan.append((module.__dict__, name, ("module", attr)))
                     elif attr in self.unfaked_modules:
-                        self._stubs.smart_set(module, name, self.unfaked_modules[attr])
+                        plan.append((module.__dict__, name, ("unfaked", attr)))
                 except Exception:
                     # handle the rare case that a module has no __name__
                     pass
@@ -1127,7 +1141,54 @@ class Patcher:
         for name, modules in self.SKIPPED_FS_MODULES.items():
             for module, attr in modules:
                 if attr in self.unfaked_modules:
-                    self._stubs.smart_set(module, name, self.unfaked_modules[attr])
+                    plan.append((module.__dict__, name, ("unfaked", attr)))
+
+        for (name, ft_name, ft_mod), function_modules in self.FS_FUNCTIONS.items():
+            for function_module in function_modules:
+                plan.append(
+                    (function_module.__dict__, name, ("function", ft_name, ft_mod))
+                )
+
+        self.__class__.PATCH_PLAN = plan
+        self.__class__.PATCH_PLAN_KEY = plan_key
+        return plan
+
+    def _fake_object(self, key: tuple[str, ...]) -> Any:
+        """Return the fake object for a patch plan entry key."""
+        if key[0] == "module":
+            return self.fake_modules[key[1]]
+        if key[0] == "unfaked":
+            return self.unfaked_modules[key[1]]
+        method, mod_name = self._fake_module_functions[key[1]][key[2]]
+        fake_module = self.fake_modules[mod_name]
+        return method.__get__(
+            fake_module, fake_module.__class__
+        )  # pytype: disable=attribute-error
+
+    def patch_modules(self) -> None:
+        """Replace the file system modules and functions in all cached
+        modules by their fakes, using the patch plan."""
+        plan = self._patch_plan()
+        if self._fake_plan_key != self.PATCH_PLAN_KEY:
+            # resolve the fake objects once for the current fake modules
+            fakes: dict[tuple[str, ...], Any] = {}
+            for key in {key for _, _, key in plan}:
+                fakes[key] = self._fake_object(key)
+            self._fake_plan = [(ns, name, fakes[key]) for ns, name, key in plan]
+            self._fake_plan_key = self.PATCH_PLAN_KEY
+        patched = self._patched
+        for namespace, name, fake in self._fake_plan:
+            # the attribute may have been removed after the module was cached
+            if name in namespace:
+                patched.append((namespace, name, namespace[name]))
+                namespace[name] = fake
+
+    def unpatch_modules(self) -> None:
+        """Restore the objects replaced by `patch_modules`."""
+        patched = self._patched
+        for namespace, name, original in reversed(patched):
+            namespace[name] = original
+        patched.clear()
 
     def patch_defaults(self) -> None:
         for fct, idx, ft in self.FS_DEFARGS:
@@ -1177,15 +1238,51 @@ class Patcher:
             self._isStale = True
             self._patching = False
             self._paused = temporary
-            if self._stubs:
-                self._stubs.smart_unset_all()
-            self.unset_defaults()
-            if self.use_dynamic_patch and self._dyn_patcher:
-                self._dyn_patcher.cleanup()
-                sys.meta_path.pop(0)
-            self.tempfile_patcher.stop_patching()
-            self.linecache_patcher.stop_patching()
-            self._set_glob_os_functions()
+            if temporary and self._can_pause_faking():
+                # keep the modules patched, but pass all calls
+                # to the fake modules to the real modules
+                if self.use_dynamic_patch and self._dyn_patcher:
+                    self._dyn_patcher.pause()
+                Patcher.FAKING_PAUSED_BY = self
+                set_faking_paused(True)
+            else:
+                self._unpatch()
+        elif not temporary and Patcher.FAKING_PAUSED_BY is self:
+            self._paused = False
+            self._end_faking_pause()
+
+    def _unpatch(self) -> None:
+        self.unpatch_modules()
+        self.unset_defaults()
+        if self.use_dynamic_patch and self._dyn_patcher:
+            self._dyn_patcher.cleanup()
+            sys.meta_path.pop(0)
+        self.tempfile_patcher.stop_patching()
+        self.linecache_patcher.stop_patching()
+        self._set_glob_os_functions()
+
+    def _can_pause_faking(self) -> bool:
+        """Return `True` if pausing can keep the modules patched. This is
+        not possible if fake modules not provided by pyfakefs are patched,
+        or if another OS is emulated, as the fake modules then have
+        OS-specific attributes that differ from the real ones."""
+        return (
+            self._fake_modules_can_pause
+            and self.fs is not None
+            and self.fs.is_windows_fs == (sys.platform == "win32")
+            and self.fs.is_macos == (sys.platform == "darwin")
+            and self.fs.path_separator == os.sep
+        )
+
+    @staticmethod
+    def _end_faking_pause() -> None:
+        """Unpatch the modules of a patcher that has paused faking
+        with the modules still patched."""
+        patcher = Patcher.FAKING_PAUSED_BY
+        if patcher is not None:
+            patcher._unpatch()
+            Patcher.FAKING_PAUSED_BY = None
+            set_faking_paused(False)
 
     @property
     def is_patching(self):
@@ -1201,10 +1298,22 @@ class Patcher:
                     new_defaults.append(d)
             fct.__defaults__ = tuple(new_defaults)
 
+    def is_patched_module(self, name: str) -> bool:
+        """Return `True` if the module with the given name uses the fake
+        file system, which is the case for all modules if `patch_only`
+        is not set."""
+        return (
+            self.patch_only is None
+            or name in self.patch_only
+            or name.startswith(self._patch_only_prefixes)
+        )
+
     def pause(self) -> None:
         """Pause the patching of the file system modules until `resume` is
         called. After that call, all file system calls are executed in the
-        real file system.
+        real file system. The modules are usually kept patched, with all
+        calls to the fake modules passed to the real modules, so that
+        pausing and resuming does not depend on the number of patched modules.
         Calling pause() twice is silently ignored.
 
         """
@@ -1254,6 +1363,537 @@ class Pause:
         self._fs.resume()
 
 
+class ModuleIndexCache:
+    """Persistent cache of the module index in a JSON file, used to avoid
+    scanning the namespaces of unchanged modules in each test session
+    (or in each worker process of a parallel test run).
+
+    Entries are stored per patcher configuration and module name, together
+    with the path, size and modification time of the module file, and a hash
+    of the names bound in the module.
+    An entry is only used if the module file and the bound names are
+    unchanged, and if all recorded attributes still refer to the recorded file
+    system modules and functions, and only once per session, so that clearing
+    the module cache always leads to a new scan. Modules without a file are
+    not cached, except for built-in and frozen modules.
+    Entries that have not been used in a session are removed when the cache
+    is saved, unless they have been stored by another process meanwhile.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = os.fspath(path)
+        self._lock = threading.Lock()
+        self._configs: dict[str, dict[str, dict[str, Any]]] = {}
+        self._used: set[tuple[str, str]] = set()
+        self._changed = False
+        self._load_time = time.time()
+
+    def load(self) -> None:
+        """Read the cache file, if it exists and is valid."""
+        configs = self._read()
+        with self._lock:
+            self._configs = configs
+            self._used.clear()
+            self._changed = False
+            self._load_time = time.time()
+
+    def _read(self) -> dict[str, dict[str, dict[str, Any]]]:
+        try:
+            with open(self.path, encoding="utf8") as f:
+                contents = json.load(f)
+            if contents.get("version") == self.VERSION:
+                return contents["configs"]
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass
+        return {}
+
+    @staticmethod
+    def _file_key(module: ModuleType) -> list | None:
+        path = getattr(module, "__file__", None)
+        if not isinstance(path, str):
+            origin = getattr(getattr(module, "__spec__", None), "origin", None)
+            if origin in ("built-in", "frozen"):
+                # cannot change for the Python version in the config key
+                return [origin]
+            return None
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            return None
+        return [path, stat_result.st_size, stat_result.st_mtime_ns]
+
+    @staticmethod
+    def _names_key(module: ModuleType) -> str:
+        """Return a hash of the names bound in the module, which may depend
+        on the environment (e.g. for conditional imports). Submodules are
+        ignored, as they may be imported later."""
+        prefix = module.__name__ + "."
+        names = sorted(
+            name
+            for name, value in list(module.__dict__.items())
+            if not (
+                isinstance(value, ModuleType)
+                and getattr(value, "__name__", "").startswith(prefix)
+            )
+        )
+        return hashlib.sha256("\n".join(names).encode()).hexdigest()
+
+    def lookup(self, config_key: str, module: ModuleType) -> dict[str, Any] | None:
+        """Return the cache entry for `module` if the module file has not
+        changed since it was stored, and if it has not been used before."""
+        file_key = self._file_key(module)
+        if file_key is None:
+            return None
+        # different modules may have the same name (e.g. `io` and `_io`)
+        key = (config_key, f"{module.__name__}:{file_key[0]}")
+        with self._lock:
+            entry = self._configs.get(key[0], {}).get(key[1])
+            if entry is None or key in self._used:
+                return None
+            self._used.add(key)
+        if entry.get("file") != file_key or entry.get("names") != self._names_key(
+            module
+        ):
+            return None
+        return entry
+
+    def store(self, config_key: str, module: ModuleType, entry: dict[str, Any]):
+        """Store the index entry for `module`, if it has a module file."""
+        file_key = self._file_key(module)
+        if file_key is None:
+            return
+        entry["file"] = file_key
+        entry["names"] = self._names_key(module)
+        entry["time"] = time.time()
+        key = (config_key, f"{module.__name__}:{file_key[0]}")
+        with self._lock:
+            self._configs.setdefault(key[0], {})[key[1]] = entry
+            self._used.add(key)
+            self._changed = True
+
+    def save(self) -> None:
+        """Write the cache file, if any entry has been added or is not used
+        anymore. The entries are merged with the entries written by other
+        processes in the meantime. The file is replaced atomically."""
+        with self._lock:
+            configs: dict[str, dict[str, dict[str, Any]]] = {}
+            changed = self._changed
+            for config_key, entries in self._read().items():
+                for name, entry in entries.items():
+                    if (config_key, name) in self._used or (
+                        entry.get("time", 0) >= self._load_time
+                    ):
+                        configs.setdefault(config_key, {})[name] = entry
+                    else:
+                        changed = True
+            if not changed:
+                return
+            for config_key, name in self._used:
+                used_entry = self._configs.get(config_key, {}).get(name)
+                if used_entry is not None:
+                    configs.setdefault(config_key, {})[name] = used_entry
+            self._changed = False
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf8") as f:
+                json.dump({"version": self.VERSION, "configs": configs}, f)
+            os.replace(temp_path, self.path)
+        except OSError:
+            # the cache is only an optimization
+            with contextlib.suppress(OSError):
+                os.remove(temp_path)
+
+
+class ModuleIndexer(MetaPathFinder):
+    """Finds the file system modules and functions referenced by loaded
+    modules, and adds them to the module caches of :py:class:`Patcher`.
+
+    If the cache is used, an instance is installed as import hook for the rest
+    of the session. It indexes modules as soon as they have been imported
+    (outside of patching), so that the patcher setup usually only has to
+    check that all loaded modules are already cached.
+    The hook never provides a module spec itself.
+    """
+
+    def __init__(self, patcher: Patcher) -> None:
+        self._lock = threading.RLock()
+        self._indexing = False
+        # names of modules that may not have been indexed yet
+        self._imported_names: list[str] = []
+        self.configure(patcher)
+
+    def configure(self, patcher: Patcher) -> None:
+        """Use the patcher arguments for indexing.
+        The cache is cleared by the patcher if they have changed."""
+        self.module_names = list(patcher._fake_module_classes.keys()) + [PATH_MODULE]
+        self.class_modules = patcher._class_modules
+        self.fake_module_functions = patcher._fake_module_functions
+        self.skip_names = patcher.skip_names
+        self.patch_default_args = patcher.patch_default_args
+        self.use_cache = patcher.use_cache
+        self.patch_only = patcher.patch_only
+        if self.patch_only is not None:
+            # the fake classes (e.g. `Path`) rely on the file system modules
+            # being patched in the modules that implement the real classes;
+            # the fake modules pass calls from other modules to the real ones
+            self._class_module_names = set().union(*self.class_modules.values())
+            self._target_names = {"builtins", *self.patch_only}
+            self._target_names.update(self._class_module_names)
+            self._target_prefixes = tuple(name + "." for name in self.patch_only)
+        self._config_key: str | None = None
+        self._class_def_value_cache: weakref.WeakKeyDictionary[
+            type, list[tuple[str, FunctionType, int, Any]]
+        ] = weakref.WeakKeyDictionary()
+
+    @property
+    def config_key(self) -> str:
+        """A key for the patcher arguments and the environment that influence
+        the module index, used by the persistent cache."""
+        if self._config_key is None:
+            self._config_key = self._make_config_key()
+        return self._config_key
+
+    def _make_config_key(self) -> str:
+        config = [
+            sys.version,
+            __version__,
+            sorted(self.module_names),
+            sorted((k, sorted(v)) for k, v in self.class_modules.items()),
+            sorted((k, sorted(v)) for k, v in self.fake_module_functions.items()),
+            sorted(self.skip_names),
+            sorted(getattr(m, "__name__", "") for m in Patcher.SKIPMODULES if m),
+            self.patch_default_args,
+        ]
+        return hashlib.sha256(repr(config).encode()).hexdigest()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._imported_names.clear()
+            self._class_def_value_cache.clear()
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[bytes | str] | None,
+        target: ModuleType | None = None,
+    ) -> ModuleSpec | None:
+        """Index the modules imported before that are completely loaded,
+        and remember the module to be imported."""
+        with self._lock:
+            if (
+                not self._indexing
+                and Patcher.REF_COUNT == 0
+                and Patcher.DOC_REF_COUNT == 0
+            ):
+                self._index_imported_modules()
+            self._imported_names.append(fullname)
+        return None
+
+    def _index_imported_modules(self) -> None:
+        self._indexing = True
+        try:
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore")
+                names = []
+                for name in self._imported_names:
+                    module = sys.modules.get(name)
+                    if module is None:
+                        # not loaded or failed to load
+                        continue
+                    spec = getattr(module, "__spec__", None)
+                    if getattr(spec, "_initializing", False):
+                        # the module is still being executed
+                        names.append(name)
+                    else:
+                        self.index_module(module)
+                self._imported_names = names
+        except Exception:
+            # never break an import - remaining modules are indexed in setUp
+            pass
+        finally:
+            self._indexing = False
+
+    def index_modules(self) -> None:
+        """Index all loaded modules that are not cached yet, or only the
+        targeted modules if `patch_only` is set."""
+        with self._lock:
+            self._indexing = True
+            try:
+                self._imported_names.clear()
+                if self.patch_only is None:
+                    modules = list(sys.modules.values())
+                else:
+                    modules = [
+                        module
+                        for name, module in list(sys.modules.items())
+                        if name in self._target_names
+                        or name.startswith(self._target_prefixes)
+                    ]
+                with warnings.catch_warnings():
+                    # ignore warnings, see #542 and #614
+                    warnings.filterwarnings("ignore")
+                    for module in modules:
+                        self.index_module(module)
+            finally:
+                self._indexing = False
+
+    def is_targeted(self, name: str) -> bool:
+        """Return `True` if the module with the given name shall be patched
+        if `patch_only` is set."""
+        return name in self._target_names or name.startswith(self._target_prefixes)
+
+    def index_module(self, module: ModuleType) -> None:
+        """Add the file system modules and functions referenced by `module`
+        to the caches, if it is not already cached."""
+        patcher_class = Patcher
+        try:
+            if (
+                self.use_cache
+                and module in patcher_class.CACHED_MODULES
+                or not inspect.ismodule(module)
+                or self.patch_only is not None
+                and not self.is_targeted(module.__name__)
+            ):
+                return
+        except Exception:
+            # workaround for some py (part of pytest) versions
+            # where py.error has no __name__ attribute
+            # see https://github.com/pytest-dev/py/issues/73
+            # and any other exception triggered by inspect.ismodule
+            if self.use_cache:
+                try:
+                    patcher_class.CACHED_MODULES.add(module)
+                except TypeError:
+                    # unhashable module - don't cache it
+                    pass
+            return
+        skipped = module in patcher_class.SKIPMODULES or any(
+            [sn.startswith(module.__name__) for sn in self.skip_names]
+        )
+        index_cache = patcher_class.MODULE_INDEX_CACHE
+        index = None
+        if index_cache is not None:
+            entry = index_cache.lookup(self.config_key, module)
+            if entry is not None:
+                index = self._index_from_entry(module, entry, skipped)
+        if index is None:
+            index = self._scan_module(module, skipped)
+            if index_cache is not None:
+                index_cache.store(self.config_key, module, self._entry(*index))
+        modules, functions, def_values = index
+        if (
+            self.patch_only is not None
+            and module.__name__ in self._class_module_names
+            and module.__name__ not in self.patch_only
+        ):
+            # only patch the file system modules used by the real classes,
+            # as the real classes are still used outside the patched modules
+            modules = {
+                name: mod for name, mod in modules.items() if inspect.ismodule(mod)
+            }
+            functions = {}
+            def_values = []
+
+        if skipped:
+            for name, mod in modules.items():
+                patcher_class.SKIPPED_FS_MODULES.setdefault(name, set()).add(
+                    (module, mod.__name__)
+                )
+        else:
+            for name, mod in modules.items():
+                patcher_class.FS_MODULES.setdefault(name, set()).add(
+                    (module, mod.__name__)
+                )
+            for name, fct in functions.items():
+                patcher_class.FS_FUNCTIONS.setdefault(
+                    (name, fct.__name__, fct.__module__), set()
+                ).add(module)
+            for _, f, i, d in def_values:
+                patcher_class.FS_DEFARGS.append((f, i, d))
+        if modules or functions or def_values:
+            patcher_class.CACHE_VERSION += 1
+
+        if self.use_cache:
+            patcher_class.CACHED_MODULES.add(module)
+
+    def _scan_module(self, module: ModuleType, skipped: bool) -> ModuleIndex:
+        """Look up the file system modules, functions and default arguments
+        in the module namespace."""
+        module_items = module.__dict__.copy().items()
+        modules = {
+            name: mod
+            for name, mod in module_items
+            if self._is_fs_module(mod, name, self.module_names)
+        }
+        functions = {}
+        def_values = []
+        if not skipped:
+            functions = {
+                name: fct for name, fct in module_items if self._is_fs_function(fct)
+            }
+            # find default arguments that are file system functions
+            if self.patch_default_args:
+                def_values = list(self._find_def_values(module_items))
+        return modules, functions, def_values
+
+    @staticmethod
+    def _entry(
+        modules: dict[str, Any],
+        functions: dict[str, FunctionType],
+        def_values: list[DefaultValue],
+    ) -> dict[str, list]:
+        """Convert the index of a module into a serializable cache entry."""
+        return {
+            "modules": [[name, mod.__name__] for name, mod in modules.items()],
+            "functions": [[name, fct.__name__] for name, fct in functions.items()],
+            "defargs": [[*path, i] for path, _, i, _ in def_values],
+        }
+
+    def _index_from_entry(
+        self, module: ModuleType, entry: dict[str, list], skipped: bool
+    ) -> ModuleIndex | None:
+        """Look up the attributes recorded in a persistent cache entry.
+        Returns `None` if any of them does not match anymore."""
+        try:
+            module_dict = module.__dict__
+            modules: dict[str, Any] = {}
+            for name, mod_name in entry["modules"]:
+                mod = module_dict.get(name)
+                if (
+                    mod is None
+                    or mod_name != getattr(mod, "__name__", None)
+                    or not self._is_fs_module(mod, name, self.module_names)
+                ):
+                    return None
+                modules[name] = mod
+            functions: dict[str, FunctionType] = {}
+            def_values: list[DefaultValue] = []
+            if not skipped:
+                for name, fct_name in entry["functions"]:
+                    fct = module_dict.get(name)
+                    if (
+                        fct is None
+                        or fct_name != getattr(fct, "__name__", None)
+                        or not self._is_fs_function(fct)
+                    ):
+                        return None
+                    functions[name] = fct
+                for name, member, i in entry["defargs"]:
+                    f = module_dict.get(name)
+                    if f is not None and member is not None:
+                        f = getattr(f, member, None)
+                    if f is None:
+                        return None
+                    d = f.__defaults__[i]
+                    if not inspect.isfunction(f) or not self._is_fs_function(d):
+                        return None
+                    def_values.append(((name, member), f, i, d))
+            return modules, functions, def_values
+        except Exception:
+            # the entry does not match the module
+            return None
+
+    def _is_fs_module(
+        self, mod: ModuleType, name: str, module_names: list[str]
+    ) -> bool:
+        try:
+            return (
+                inspect.ismodule(mod)
+                and mod.__name__ in module_names
+                or inspect.isclass(mod)
+                and mod.__module__ in self.class_modules.get(name, [])
+            )
+        except Exception:
+            # handle cases where the module has no __name__ or __module__
+            # attribute - see #460, and any other exception triggered
+            # by inspect functions
+            return False
+
+    def _is_fs_function(self, fct: FunctionType) -> bool:
+        try:
+            return (
+                isinstance(fct, (FunctionType, BuiltinFunctionType))
+                and fct.__name__ in self.fake_module_functions
+                and fct.__module__ in self.fake_module_functions[fct.__name__]
+            )
+        except Exception:
+            # handle cases where the function has no __name__ or __module__
+            # attribute, or any other exception in inspect functions
+            return False
+
+    def _def_values(
+        self, item: FunctionType
+    ) -> Iterator[tuple[str | None, FunctionType, int, Any]]:
+        """Find default arguments that are file-system functions to be
+        patched in top-level functions and members of top-level classes.
+        Yields the member name (`None` for functions), the function,
+        the argument index and the default value."""
+        try:
+            # check for module-level functions
+            if isinstance(item, FunctionType):
+                if item.__defaults__:
+                    for i, d in enumerate(item.__defaults__):
+                        if self._is_fs_function(d):
+                            yield None, item, i, d
+            elif inspect.isclass(item):
+                # check for methods in class
+                # (nested classes are ignored for now)
+                yield from self._class_def_values(item)
+        except Exception:
+            # Ignore any exception, examples:
+            # ImportError: No module named '_gdbm'
+            # _DontDoThat() (see #523)
+            pass
+
+    def _class_def_values(
+        self, cls: type
+    ) -> Iterator[tuple[str, FunctionType, int, Any]]:
+        """Find default arguments that are file-system functions in the
+        methods of `cls`, including inherited methods."""
+        # look up the class namespaces directly instead of using
+        # inspect.getmembers, which is very expensive
+        mro = cls.__mro__
+        for index, base in enumerate(mro):
+            for def_value in self._own_def_values(base):
+                name = def_value[0]
+                # ignore methods overwritten in a derived class
+                if not any(name in vars(derived) for derived in mro[:index]):
+                    yield def_value
+
+    def _own_def_values(self, cls: type) -> list[tuple[str, FunctionType, int, Any]]:
+        """Find default arguments that are file-system functions in the
+        methods defined in `cls` itself.
+        The result is cached per class, as base classes are shared by many
+        classes, and classes are usually referenced by several modules."""
+        try:
+            return self._class_def_value_cache[cls]
+        except (KeyError, TypeError):
+            pass
+        def_values = []
+        for name, member in list(vars(cls).items()):
+            if isinstance(member, staticmethod):
+                member = member.__func__
+            if isinstance(member, FunctionType) and member.__defaults__:
+                for i, d in enumerate(member.__defaults__):
+                    if self._is_fs_function(d):
+                        def_values.append((name, member, i, d))
+        try:
+            self._class_def_value_cache[cls] = def_values
+        except TypeError:
+            # class cannot be weakly referenced - don't cache it
+            pass
+        return def_values
+
+    def _find_def_values(
+        self, module_items: ItemsView[str, FunctionType]
+    ) -> Iterator[DefaultValue]:
+        for name, fct in module_items:
+            for member, f, i, d in self._def_values(fct):
+                yield (name, member), f, i, d
+
+
 class DynamicPatcher(MetaPathFinder, Loader):
     """A file loader that replaces file system related modules by their
     fake implementation if they are loaded after calling `setUpPyfakefs()`.
@@ -1266,6 +1906,7 @@ class DynamicPatcher(MetaPathFinder, Loader):
         self.modules = self.patcher.fake_modules
         self._loaded_module_names: set[str] = set()
         self.cleanup_handlers = patcher.cleanup_handlers
+        self._paused = False
 
         # remove all modules that have to be patched from `sys.modules`,
         # otherwise the find_... methods will not be called
@@ -1286,13 +1927,101 @@ class DynamicPatcher(MetaPathFinder, Loader):
         reloaded_module_names = [
             module.__name__ for module in self.patcher.modules_to_reload
         ]
-        # Delete all modules loaded during the test, ensuring that
+        unload_modules = self.patcher.unload_modules
+        if unload_modules == UnloadMode.OFF:
+            return
+        loaded_module_names = [
+            name
+            for name in self._loaded_module_names
+            if name in sys.modules and name not in reloaded_module_names
+        ]
+        if unload_modules == UnloadMode.AUTO:
+            loaded_module_names = self._modules_with_fakes(loaded_module_names)
+        # Delete the modules loaded during the test, ensuring that
         # they are reloaded after the test.
-        for name in self._loaded_module_names:
-            if name in sys.modules and name not in reloaded_module_names:
-                if name in self.cleanup_handlers and self.cleanup_handlers[name](name):
-                    continue
-                del sys.modules[name]
+        for name in loaded_module_names:
+            if name in self.cleanup_handlers and self.cleanup_handlers[name](name):
+                continue
+            del sys.modules[name]
+
+    def _modules_with_fakes(self, names: list[str]) -> list[str]:
+        """Return the names of the given modules that reference fake modules
+        or objects in their namespace, or other modules returned here,
+        and the submodules of the returned packages.
+        Objects in containers and class attributes are checked one level deep.
+        """
+        fake_module_names = {type(fake).__module__ for fake in self.modules.values()}
+        fake_module_names.add(FakeFilesystem.__module__)
+
+        def is_fake_module_name(module_name: str) -> bool:
+            # all objects defined in the fake modules (e.g. fake files)
+            return module_name in fake_module_names or (
+                module_name.startswith("pyfakefs.fake_") and module_name != __name__
+            )
+
+        def add_referenced_name(value: Any, referenced_names: set[str]) -> None:
+            if isinstance(value, MethodType):
+                value = value.__self__
+            if isinstance(value, ModuleType):
+                referenced_names.add(value.__name__)
+            elif isinstance(value, (type, FunctionType)):
+                referenced_names.add(value.__module__)
+            else:
+                referenced_names.add(type(value).__module__)
+
+        with_fakes = set()
+        # the names of the modules referenced by each module without fakes
+        references: dict[str, set[str]] = {}
+        for name in names:
+            try:
+                referenced_names: set[str] = set()
+                for value in list(vars(sys.modules[name]).values()):
+                    add_referenced_name(value, referenced_names)
+                    if isinstance(value, dict):
+                        contained = list(value.values())
+                    elif isinstance(value, (list, tuple, set, frozenset)):
+                        contained = list(value)
+                    elif isinstance(value, type) and value.__module__ == name:
+                        contained = list(vars(value).values())
+                    else:
+                        continue
+                    for item in contained:
+                        add_referenced_name(item, referenced_names)
+            except Exception:
+                # the namespace cannot be checked - unload the module
+                with_fakes.add(name)
+                continue
+            if any(is_fake_module_name(n) for n in referenced_names):
+                with_fakes.add(name)
+            else:
+                references[name] = referenced_names
+        changed = True
+        while changed:
+            changed = False
+            for name, referenced_names in list(references.items()):
+                # a submodule is not found in a package that is loaded again
+                parent_name = name.rpartition(".")[0]
+                if parent_name in with_fakes or not referenced_names.isdisjoint(
+                    with_fakes
+                ):
+                    with_fakes.add(name)
+                    del references[name]
+                    changed = True
+        return [name for name in names if name in with_fakes]
+
+    def pause(self) -> None:
+        """Restore the real modules in `sys.modules` while faking is paused,
+        so that modules imported meanwhile are not bound to the fake modules.
+        """
+        self._paused = True
+        for module_name, module in self.sysmodules.items():
+            sys.modules[module_name] = module
+
+    def resume(self) -> None:
+        """Put the fake modules back into `sys.modules`."""
+        self._paused = False
+        for module_name in self.sysmodules:
+            sys.modules[module_name] = self.modules[module_name]
 
     def needs_patch(self, name: str) -> bool:
         """Checks if the module with the given name shall be replaced."""
@@ -1334,6 +2063,9 @@ class DynamicPatcher(MetaPathFinder, Loader):
         target: ModuleType | None = None,
     ) -> ModuleSpec | None:
         """Module finder."""
+        if self._paused:
+            # modules imported while faking is paused are loaded as usual
+            return None
         if self.needs_patch(fullname):
             return ModuleSpec(fullname, self)
         if self.patcher.patch_open_code != PatchMode.OFF:
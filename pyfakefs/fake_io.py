@@ -19,7 +19,9 @@ fake ``io`` module replacement.
 from __future__ import annotations
 
 import _io  # pytype: disable=import-error
+import functools
 import io
+import os
 import sys
 from enum import Enum
 from typing import (
@@ -31,9 +33,13 @@ from typing import (
 
 from collections.abc import Callable
 
-from pyfakefs.fake_file import AnyFileWrapper
+from pyfakefs.fake_file import AnyFileWrapper, FakePipeWrapper
 from pyfakefs.fake_open import fake_open
-from pyfakefs.helpers import IS_PYPY, is_called_from_skipped_module
+from pyfakefs.helpers import (
+    IS_PYPY,
+    is_called_from_skipped_module,
+    is_faking_paused,
+)
 
 if TYPE_CHECKING:
     from pyfakefs.fake_filesystem import FakeFilesystem
@@ -143,7 +149,8 @@ if sys.platform != "win32":
 
     class FakeFcntlModule:
         """Replaces the fcntl module. Only valid under Linux/MacOS,
-        currently just mocks the functionality away.
+        currently just mocks the functionality away, except for getting
+        and setting the `O_NONBLOCK` flag of fake pipes.
         """
 
         @staticmethod
@@ -163,6 +170,15 @@ if sys.platform != "win32":
             self._fcntl_module = fcntl
 
         def fcntl(self, fd: int, cmd: int, arg: int = 0) -> int | bytes:
+            if cmd in (fcntl.F_GETFL, fcntl.F_SETFL) and isinstance(fd, int):
+                wrappers = self.filesystem.open_files[fd]
+                if wrappers and isinstance(wrappers[0], FakePipeWrapper):
+                    pipe_wrapper = wrappers[0]
+                    if cmd == fcntl.F_SETFL:
+                        pipe_wrapper.blocking = not arg & os.O_NONBLOCK
+                        return 0
+                    flags = os.O_WRONLY if pipe_wrapper.can_write else os.O_RDONLY
+                    return flags if pipe_wrapper.blocking else flags | os.O_NONBLOCK
             return 0 if isinstance(arg, int) else arg
 
         def ioctl(
@@ -195,3 +211,21 @@ if sys.platform != "win32":
         def __getattr__(self, name):
             """Forwards any unfaked calls to the standard fcntl module."""
             return getattr(self._fcntl_module, name)
+
+    def handle_paused_call(f: Callable) -> Callable:
+        """Decorator used for the fake `fcntl` functions to ensure that
+        the real functions are called while faking is paused. Also needed
+        for the functions imported from the module, as these are patched
+        without `__getattribute__` being called."""
+
+        @functools.wraps(f)
+        def wrapped(self, *args, **kwargs):
+            if is_faking_paused():
+                return getattr(fcntl, f.__name__)(*args, **kwargs)
+            return f(self, *args, **kwargs)
+
+        return wrapped
+
+    for fct_name in FakeFcntlModule.dir():
+        fct = getattr(FakeFcntlModule, fct_name)
+        setattr(FakeFcntlModule, fct_name, handle_paused_call(fct))
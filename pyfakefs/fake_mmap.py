@@ -0,0 +1,503 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Uses :py:class:`FakeMmapModule` to provide a fake ``mmap`` module
+replacement, with memory maps addressing the contents of fake files.
+"""
+
+from __future__ import annotations
+
+import errno
+import mmap
+import sys
+from typing import Any, TYPE_CHECKING
+
+from pyfakefs import helpers
+from pyfakefs.fake_file import FakeFile, FakeFileIO, FakeFileWrapper
+from pyfakefs.helpers import is_called_from_skipped_module, is_faking_paused
+
+if TYPE_CHECKING:
+    from pyfakefs.fake_filesystem import FakeFilesystem
+
+_ACCESS_NAMES = {
+    mmap.ACCESS_DEFAULT: "ACCESS_DEFAULT",
+    mmap.ACCESS_READ: "ACCESS_READ",
+    mmap.ACCESS_WRITE: "ACCESS_WRITE",
+    mmap.ACCESS_COPY: "ACCESS_COPY",
+}
+
+if sys.platform == "win32":
+
+    def _parse_args(
+        fileno: int,
+        length: int,
+        tagname: str | None = None,
+        access: int = mmap.ACCESS_DEFAULT,
+        offset: int = 0,
+    ) -> tuple[int, int, int, int]:
+        return fileno, length, access, offset
+
+else:
+
+    def _parse_args(
+        fileno: int,
+        length: int,
+        flags: int = mmap.MAP_SHARED,
+        prot: int = mmap.PROT_WRITE | mmap.PROT_READ,
+        access: int = mmap.ACCESS_DEFAULT,
+        offset: int = 0,
+        *,
+        trackfd: bool = True,
+    ) -> tuple[int, int, int, int]:
+        if access != mmap.ACCESS_DEFAULT:
+            if flags != mmap.MAP_SHARED or prot != mmap.PROT_WRITE | mmap.PROT_READ:
+                raise ValueError("mmap can't specify both access and flags, prot.")
+        elif not prot & mmap.PROT_WRITE:
+            access = mmap.ACCESS_READ
+        elif flags & mmap.MAP_PRIVATE:
+            access = mmap.ACCESS_COPY
+        return fileno, length, access, offset
+
+
+class _FakeMmapType(type):
+    """Metaclass of the fake memory maps. The `mmap` class of a fake mmap
+    module also accepts real memory maps as instances and subclasses,
+    so that checks like `isinstance(m, mmap.mmap)` work for all maps."""
+
+    def __instancecheck__(cls, instance: Any) -> bool:
+        return super().__instancecheck__(instance) or (
+            "_fake_module" in cls.__dict__ and isinstance(instance, mmap.mmap)
+        )
+
+    def __subclasscheck__(cls, subclass: type) -> bool:
+        return super().__subclasscheck__(subclass) or (
+            "_fake_module" in cls.__dict__ and issubclass(subclass, mmap.mmap)
+        )
+
+
+class FakeMmap(metaclass=_FakeMmapType):
+    """Memory map of a fake file, the fake counterpart of `mmap.mmap`.
+
+    Reads and writes address the contents of the fake file directly, so that
+    changes made via the map are immediately seen by all open file objects
+    of the same file, and vice versa. Maps created with `ACCESS_COPY` copy
+    the mapped contents on the first write. Maps of anonymous memory
+    (with a file descriptor of -1) are held in memory.
+    Since Python 3.12, the map supports the buffer protocol (e.g. for
+    `memoryview` or `struct.unpack_from`). Changes written into such a buffer
+    are written to the file when the buffer is released. In older versions,
+    the contents can be accessed as `bytes(m)` or via slices instead.
+    Access to a part of the map beyond the end of a file that has been
+    truncated after mapping it is not emulated.
+    """
+
+    def __init__(self, filesystem: FakeFilesystem, *args: Any, **kwargs: Any) -> None:
+        """
+        Args:
+            filesystem: The fake filesystem containing the mapped file.
+            args, kwargs: The arguments of `mmap.mmap` for the current platform.
+
+        Raises:
+            OSError: if the file descriptor is invalid, or the access mode
+                does not match the mode the file has been opened with.
+            ValueError: if the length or offset are invalid.
+        """
+        fileno, length, access, offset = _parse_args(*args, **kwargs)
+        if length < 0:
+            raise OverflowError("memory mapped length must be positive")
+        if offset < 0:
+            raise OverflowError("memory mapped offset must be positive")
+        self.filesystem = filesystem
+        self._position = 0
+        self._closed = False
+        self._exports = 0
+        self._anonymous = fileno == -1
+        if self._anonymous:
+            if length == 0 or offset % mmap.ALLOCATIONGRANULARITY:
+                filesystem.raise_os_error(errno.EINVAL)
+            self._length = length
+            self._offset = offset
+            self._access = access
+            self._copy: bytearray | None = bytearray(length)
+            return
+        wrapper = filesystem.get_open_file(fileno)
+        if not isinstance(wrapper, (FakeFileWrapper, FakeFileIO)):
+            filesystem.raise_os_error(errno.EINVAL)
+        if offset % mmap.ALLOCATIONGRANULARITY:
+            filesystem.raise_os_error(errno.EINVAL)
+        writable = access in (mmap.ACCESS_DEFAULT, mmap.ACCESS_WRITE)
+        if not wrapper.open_modes.can_read or (
+            writable and not wrapper.open_modes.can_write
+        ):
+            filesystem.raise_os_error(errno.EACCES)
+        self.file_object: FakeFile = wrapper.file_object
+        size = self.file_object.size
+        if length == 0:
+            if size == 0:
+                raise ValueError("cannot mmap an empty file")
+            if offset >= size:
+                raise ValueError("mmap offset is greater than file size")
+            length = size - offset
+        elif offset + length > size:
+            if not filesystem.is_windows_fs or not writable:
+                raise ValueError("mmap length is greater than file size")
+            # under Windows, the file is extended to the mapped size
+            self.file_object.size = offset + length
+        self._length = length
+        self._offset = offset
+        self._access = access
+        self._copy = None
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self) -> None:
+        if self._exports:
+            raise BufferError("cannot close exported pointers exist")
+        self._closed = True
+        self._copy = None
+
+    def __enter__(self) -> FakeMmap:
+        self._check_valid()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        if self._closed:
+            return "<mmap.mmap closed=True>"
+        return (
+            f"<mmap.mmap closed=False, access={_ACCESS_NAMES[self._access]}, "
+            f"length={self._length}, pos={self._position}, offset={self._offset}>"
+        )
+
+    def _check_valid(self) -> None:
+        if self._closed:
+            raise ValueError("mmap closed or invalid")
+
+    def _check_writable(self) -> None:
+        if self._access == mmap.ACCESS_READ:
+            raise TypeError("mmap can't modify a readonly memory map.")
+
+    def _contents(self) -> tuple[bytes | bytearray, int]:
+        """Return the buffer holding the mapped contents, and the position
+        of the mapped region in that buffer."""
+        self._check_valid()
+        if self._copy is not None:
+            return self._copy, 0
+        contents = self.file_object._byte_contents
+        if not isinstance(contents, bytearray):
+            # contents currently written are not converted to bytes
+            contents = self.file_object.byte_contents or b""
+        return contents, self._offset
+
+    def _read_at(self, start: int, end: int) -> bytes:
+        contents, base = self._contents()
+        with memoryview(contents) as view:
+            return bytes(view[base + start : base + end])
+
+    def _write_at(self, position: int, data: bytes | bytearray) -> None:
+        self._check_valid()
+        self._check_writable()
+        if self._access == mmap.ACCESS_COPY and self._copy is None:
+            self._copy = bytearray(self._read_at(0, self._length))
+        if self._copy is not None:
+            self._copy[position : position + len(data)] = data
+            return
+        file_object = self.file_object
+        offset = self._offset + position
+        if offset > file_object.size:
+            self.filesystem.raise_os_error(errno.EFAULT, file_object.path)
+        file_object.update_contents(data, offset, file_object.encoding, truncate=False)
+
+    def _adjusted_range(
+        self, start: int | None, end: int | None, default: int
+    ) -> tuple[int, int]:
+        start = default if start is None else start
+        end = self._length if end is None else end
+        if start < 0:
+            start += self._length
+        if end < 0:
+            end += self._length
+        return max(0, min(start, self._length)), max(0, min(end, self._length))
+
+    def __len__(self) -> int:
+        self._check_valid()
+        return self._length
+
+    def __bytes__(self) -> bytes:
+        return self._read_at(0, self._length)
+
+    if sys.version_info >= (3, 12):
+
+        def __buffer__(self, flags: int) -> memoryview:
+            """Return a view of the mapped contents. Writable maps of a
+            file are exported as a copy that is written back on release."""
+            self._check_valid()
+            if self._access == mmap.ACCESS_COPY and self._copy is None:
+                self._copy = bytearray(self._read_at(0, self._length))
+            if self._copy is not None:
+                view = memoryview(self._copy)
+                if self._access == mmap.ACCESS_READ:
+                    view = view.toreadonly()
+            elif self._access == mmap.ACCESS_READ:
+                contents = self.file_object.byte_contents or b""
+                end = self._offset + self._length
+                view = memoryview(contents)[self._offset : end].toreadonly()
+            else:
+                view = memoryview(bytearray(self._read_at(0, self._length)))
+            self._exports += 1
+            return view
+
+        def __release_buffer__(self, view: memoryview) -> None:
+            self._exports -= 1
+            if not view.readonly and view.obj is not self._copy:
+                data = bytes(view)
+                if data != self._read_at(0, self._length):
+                    self._write_at(0, data)
+            view.release()
+
+    def size(self) -> int:
+        """Return the size of the mapped file."""
+        self._check_valid()
+        if self._anonymous:
+            self.filesystem.raise_os_error(errno.EBADF)
+        return self.file_object.size
+
+    def tell(self) -> int:
+        self._check_valid()
+        return self._position
+
+    def seek(self, pos: int, whence: int = 0) -> int | None:
+        self._check_valid()
+        if whence == 1:
+            pos += self._position
+        elif whence == 2:
+            pos += self._length
+        elif whence != 0:
+            raise ValueError("unknown seek type")
+        if pos < 0 or pos > self._length:
+            raise ValueError("seek out of range")
+        self._position = pos
+        return pos if sys.version_info >= (3, 13) else None
+
+    def seekable(self) -> bool:
+        return True
+
+    def __getitem__(self, index: int | slice) -> int | bytes:
+        self._check_valid()
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step == 1:
+                return self._read_at(start, max(start, stop))
+            return self._read_at(0, self._length)[index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("mmap index out of range")
+        return self._read_at(index, index + 1)[0]
+
+    def __setitem__(self, index: int | slice, value: Any) -> None:
+        self._check_valid()
+        self._check_writable()
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            data = bytes(memoryview(value))
+            if len(range(start, stop, step)) != len(data):
+                raise IndexError("mmap slice assignment is wrong size")
+            if step == 1:
+                self._write_at(start, data)
+            else:
+                contents = bytearray(self._read_at(0, self._length))
+                contents[index] = data
+                self._write_at(0, contents)
+            return
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("mmap index out of range")
+        if not 0 <= value <= 255:
+            raise ValueError("mmap item value must be in range(0, 256)")
+        self._write_at(index, bytes((value,)))
+
+    def __iter__(self):
+        self._check_valid()
+        for index in range(self._length):
+            yield self._read_at(index, index + 1)
+
+    def read(self, n: int | None = None) -> bytes:
+        self._check_valid()
+        end = self._length
+        if n is not None and n >= 0:
+            end = min(end, self._position + n)
+        contents = self._read_at(self._position, end)
+        self._position += len(contents)
+        return contents
+
+    def read_byte(self) -> int:
+        self._check_valid()
+        if self._position >= self._length:
+            raise ValueError("read byte out of range")
+        self._position += 1
+        return self._read_at(self._position - 1, self._position)[0]
+
+    def readline(self) -> bytes:
+        self._check_valid()
+        contents, base = self._contents()
+        end = contents.find(b"\n", base + self._position, base + self._length)
+        end = self._length if end < 0 else end - base + 1
+        return self.read(end - self._position)
+
+    def write(self, data: Any) -> int:
+        self._check_valid()
+        self._check_writable()
+        data = bytes(memoryview(data))
+        if self._position + len(data) > self._length:
+            raise ValueError("data out of range")
+        self._write_at(self._position, data)
+        self._position += len(data)
+        return len(data)
+
+    def write_byte(self, byte: int) -> None:
+        self._check_valid()
+        self._check_writable()
+        if self._position >= self._length:
+            raise ValueError("write byte out of range")
+        self._write_at(self._position, bytes((byte,)))
+        self._position += 1
+
+    def find(self, sub: Any, start: int | None = None, end: int | None = None) -> int:
+        self._check_valid()
+        start, end = self._adjusted_range(start, end, self._position)
+        contents, base = self._contents()
+        index = contents.find(sub, base + start, base + end)
+        return index - base if index >= 0 else -1
+
+    def rfind(self, sub: Any, start: int | None = None, end: int | None = None) -> int:
+        self._check_valid()
+        start, end = self._adjusted_range(start, end, self._position)
+        contents, base = self._contents()
+        index = contents.rfind(sub, base + start, base + end)
+        return index - base if index >= 0 else -1
+
+    def move(self, dest: int, src: int, count: int) -> None:
+        self._check_valid()
+        self._check_writable()
+        if (
+            min(dest, src, count) < 0
+            or src + count > self._length
+            or dest + count > self._length
+        ):
+            raise ValueError("source, destination, or count out of range")
+        self._write_at(dest, self._read_at(src, src + count))
+
+    def flush(self, offset: int = 0, size: int | None = None) -> None:
+        """Changes are written to the file contents immediately, so only
+        the arguments are checked, and the file modification time updated."""
+        self._check_valid()
+        if size is None:
+            size = self._length - offset
+        if offset < 0 or size < 0 or offset + size > self._length:
+            raise ValueError("flush values out of range")
+        if not self._anonymous and self._access in (
+            mmap.ACCESS_DEFAULT,
+            mmap.ACCESS_WRITE,
+        ):
+            current_time = helpers.now()
+            self.file_object.st_mtime = current_time
+            self.file_object.st_ctime = current_time
+
+    def madvise(self, option: int, start: int = 0, length: int | None = None) -> None:
+        """Advice is ignored, only the arguments are checked."""
+        self._check_valid()
+        if not 0 <= start < self._length:
+            raise ValueError("madvise start out of bounds")
+        if length is not None and length < 0:
+            raise ValueError("madvise length invalid")
+
+    def resize(self, newsize: int) -> None:
+        """Resize the map and the mapped file."""
+        self._check_valid()
+        if self._access in (mmap.ACCESS_READ, mmap.ACCESS_COPY):
+            raise TypeError("mmap can't resize a readonly or copy-on-write memory map.")
+        if self._exports:
+            raise BufferError("mmap can't resize with extant buffers exported.")
+        if newsize < 0:
+            raise ValueError("new size out of range")
+        if self._copy is not None:
+            del self._copy[newsize:]
+            self._copy.extend(bytes(newsize - len(self._copy)))
+        else:
+            self.file_object.size = self._offset + newsize
+        self._length = newsize
+        self._position = min(self._position, newsize)
+
+
+class _ModuleMmap(FakeMmap):
+    """Base of the `mmap` class of a fake mmap module, which is a subclass
+    bound to the module. The class itself creates real memory maps for
+    anonymous memory and for calls from skipped modules, as these
+    do not use the fake filesystem. Subclasses always create fake maps.
+    """
+
+    _fake_module: FakeMmapModule
+
+    def __new__(cls, fileno: int, *args: Any, **kwargs: Any) -> Any:
+        if "_fake_module" in cls.__dict__ and cls._fake_module.uses_real_mmap(fileno):
+            return mmap.mmap(fileno, *args, **kwargs)
+        return super().__new__(cls)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(self._fake_module.filesystem, *args, **kwargs)
+
+
+class FakeMmapModule:
+    """Uses FakeFilesystem to provide a fake mmap module replacement.
+    Its `mmap` class creates a :py:class:`FakeMmap` for a fake file, while
+    maps of anonymous memory and maps created from skipped modules
+    are created by the real module. Real maps are also instances of the
+    class, and the class can be subclassed.
+
+    You need a fake_filesystem to use this::
+
+        filesystem = fake_filesystem.FakeFilesystem()
+        mmap_module = fake_mmap.FakeMmapModule(filesystem)
+    """
+
+    def __init__(self, filesystem: FakeFilesystem):
+        """
+        Args:
+            filesystem: FakeFilesystem used to provide file system information.
+        """
+        self.filesystem = filesystem
+        self._mmap_module = mmap
+        self.mmap = type("mmap", (_ModuleMmap,), {"_fake_module": self})
+
+    def uses_real_mmap(self, fileno: int) -> bool:
+        """Return `True` if a map of the given file descriptor shall be
+        created by the real module."""
+        fs = self.filesystem
+        return (
+            fileno == -1
+            or is_faking_paused()
+            or fs.has_patcher
+            and is_called_from_skipped_module(
+                skip_names=fs.patcher.skip_names,
+                case_sensitive=fs.is_case_sensitive,
+            )
+        )
+
+    def __getattr__(self, name):
+        """Forwards any unfaked calls to the standard mmap module."""
+        return getattr(self._mmap_module, name)
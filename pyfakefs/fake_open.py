@@ -34,16 +34,19 @@ from typing import (
 
 from pyfakefs.fake_file import (
     FakeBinaryFileWrapper,
+    FakeFileIO,
     FakeTextFileWrapper,
     FakePipeWrapper,
     FakeFileWrapper,
     FakeFile,
+    FakeFrozenFile,
     AnyFileWrapper,
 )
 from pyfakefs import helpers
 from pyfakefs.helpers import (
     AnyString,
     is_called_from_skipped_module,
+    is_faking_paused,
     is_root,
     PERM_READ,
     PERM_WRITE,
@@ -91,7 +94,8 @@ def fake_open(
     # We don't need to check this if we are in an `open_code` call
     # from a faked file (and this might cause recursions in `linecache`)
     if (
-        not is_fake_open_code
+        is_faking_paused()
+        or not is_fake_open_code
         and is_called_from_skipped_module(
             skip_names=skip_names,
             case_sensitive=filesystem.is_case_sensitive,
@@ -213,11 +217,7 @@ class FakeFileOpen:
         )
         if file_object is None and file_path is None:
             # file must be a fake pipe wrapper, find it...
-            if (
-                filedes is None
-                or len(self.filesystem.open_files) <= filedes
-                or not self.filesystem.open_files[filedes]
-            ):
+            if filedes is None or not self.filesystem.open_files[filedes]:
                 raise OSError(errno.EBADF, "invalid pipe file descriptor")
             wrappers = self.filesystem.open_files[filedes]
             assert wrappers is not None
@@ -225,12 +225,17 @@ class FakeFileOpen:
             assert isinstance(existing_wrapper, FakePipeWrapper)
             wrapper = FakePipeWrapper(
                 self.filesystem,
-                existing_wrapper.fd,
+                existing_wrapper.pipe,
                 existing_wrapper.can_write,
                 mode,
             )
-            file_des = self.filesystem.add_open_file(wrapper)
-            wrapper.filedes = file_des
+            wrapper.blocking = existing_wrapper.blocking
+            # the stream uses the same descriptor, which it closes if
+            # `closefd` is set
+            wrapper.filedes = filedes
+            wrappers.append(wrapper)
+            if closefd:
+                existing_wrapper.close_fd(filedes)
             return wrapper
 
         assert file_path is not None
@@ -272,6 +277,21 @@ class FakeFileOpen:
             if not self.filesystem.is_windows_fs:
                 file_object.st_ctime = current_time
 
+        if self.filesystem.use_native_io or self.raw_io:
+            return self._open_native_io(
+                file_object,
+                file_path,
+                mode,
+                open_modes,
+                can_write,
+                filedes,
+                closefd,
+                buffering,
+                encoding,
+                errors,
+                newline,
+            )
+
         wrapper_class = FakeBinaryFileWrapper if binary else FakeTextFileWrapper
         fakefile = wrapper_class(
             file_object,
@@ -299,6 +319,66 @@ class FakeFileOpen:
             fakefile.filedes = self.filesystem.add_open_file(fakefile)
         return fakefile
 
+    def _open_native_io(
+        self,
+        file_object: FakeFile,
+        file_path: AnyStr,
+        mode: str,
+        open_modes: _OpenModes,
+        can_write: bool,
+        filedes: int | None,
+        closefd: bool,
+        buffering: int,
+        encoding: str | None,
+        errors: str | None,
+        newline: str | None,
+    ) -> Any:
+        """Open the file using the standard buffer and text classes on top
+        of a fake unbuffered stream, as done by `open` for real files."""
+        binary = "b" in mode
+        if buffering == 0 and not binary and not self.raw_io:
+            raise ValueError("can't have unbuffered text I/O")
+        raw = FakeFileIO(
+            file_object,
+            file_path,
+            open_modes=open_modes,
+            allow_update=open_modes.can_write and can_write,
+            delete_on_close=self._delete_on_close,
+            filesystem=self.filesystem,
+            closefd=closefd,
+            encoding=encoding,
+        )
+        if filedes is not None:
+            raw.filedes = filedes
+            open_files_list = self.filesystem.open_files[filedes]
+            assert open_files_list is not None
+            open_files_list.append(raw)
+        else:
+            raw.filedes = self.filesystem.add_open_file(raw)
+        if self.raw_io:
+            return raw
+
+        line_buffering = False
+        if buffering == 1:
+            buffering = -1
+            line_buffering = True
+        if buffering < 0:
+            buffering = io.DEFAULT_BUFFER_SIZE
+        if buffering == 0:
+            return raw
+        buffer: io.BufferedIOBase
+        if open_modes.can_read and open_modes.can_write:
+            buffer = io.BufferedRandom(raw, buffering)
+        elif open_modes.can_write:
+            buffer = io.BufferedWriter(raw, buffering)
+        else:
+            buffer = io.BufferedReader(raw, buffering)
+        if binary:
+            return buffer
+        text = io.TextIOWrapper(buffer, encoding, errors, newline, line_buffering)
+        text.mode = mode  # type: ignore[misc]
+        return text
+
     @staticmethod
     def _open_flags_from_open_modes(open_modes: _OpenModes) -> int:
         flags = 0
@@ -340,6 +420,8 @@ class FakeFileOpen:
                 )
             ):
                 self.filesystem.raise_os_error(errno.EACCES, file_path)
+            if open_modes.can_write and isinstance(file_object, FakeFrozenFile):
+                self.filesystem.raise_os_error(errno.EROFS, file_path)
             if open_modes.can_write:
                 if open_modes.truncate:
                     file_object.set_contents("")
@@ -379,7 +461,7 @@ class FakeFileOpen:
             can_write = True
             if isinstance(wrapper, FakePipeWrapper):
                 return None, None, filedes, None, can_write
-            if isinstance(wrapper, FakeFileWrapper):
+            if isinstance(wrapper, (FakeFileWrapper, FakeFileIO)):
                 self._delete_on_close = wrapper.delete_on_close
                 can_write = wrapper.allow_update
 
@@ -36,15 +36,19 @@ from typing import (
     TYPE_CHECKING,
 )
 
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 
 from pyfakefs.fake_file import (
     FakeDirectory,
     FakeDirWrapper,
     StandardStreamWrapper,
     FakeFileWrapper,
+    FakeBinaryFileWrapper,
+    FakeFileIO,
+    FakePipe,
     FakePipeWrapper,
     FakeFile,
+    FakeLargeFileIoException,
     AnyFileWrapper,
 )
 from pyfakefs.fake_open import FakeFileOpen, _OpenModes
@@ -53,6 +57,8 @@ from pyfakefs.fake_scandir import scandir, walk, ScanDirIter
 from pyfakefs.helpers import (
     FakeStatResult,
     is_called_from_skipped_module,
+    is_called_from_unpatched_module,
+    is_faking_paused,
     is_int_type,
     is_byte_string,
     make_string_path,
@@ -66,6 +72,7 @@ from pyfakefs.helpers import (
     is_root,
     get_uid,
     get_gid,
+    now,
 )
 
 if TYPE_CHECKING:
@@ -115,6 +122,7 @@ class FakeOsModule:
             "mkdir",
             "mknod",
             "open",
+            "pipe",
             "read",
             "readlink",
             "remove",
@@ -134,9 +142,11 @@ class FakeOsModule:
         ]
         if sys.platform.startswith("linux"):
             _dir += [
+                "copy_file_range",
                 "fdatasync",
                 "getxattr",
                 "listxattr",
+                "pipe2",
                 "removexattr",
                 "setxattr",
             ]
@@ -144,7 +154,12 @@ class FakeOsModule:
             _dir += [
                 "getgid",
                 "getuid",
+                "pread",
+                "pwrite",
+                "readv",
+                "writev",
             ]
+            _dir += [name for name in ("preadv", "pwritev") if hasattr(os, name)]
         return _dir
 
     def __init__(self, filesystem: FakeFilesystem):
@@ -328,12 +343,16 @@ class FakeOsModule:
 
     def dup(self, fd: int) -> int:
         file_handle = self.filesystem.get_open_file(fd)
+        if isinstance(file_handle, FakePipeWrapper):
+            file_handle.add_fd()
         return self.filesystem.add_open_file(file_handle)
 
     def dup2(self, fd: int, fd2: int, inheritable: bool = True) -> int:
         if fd == fd2:
             return fd
         file_handle = self.filesystem.get_open_file(fd)
+        if isinstance(file_handle, FakePipeWrapper):
+            file_handle.add_fd()
         return self.filesystem.add_open_file(file_handle, fd2)
 
     def read(self, fd: int, n: int) -> bytes:
@@ -353,9 +372,14 @@ class FakeOsModule:
         file_handle = self.filesystem.get_open_file(fd)
         if isinstance(file_handle, FakeFileWrapper):
             file_handle.raw_io = True
+        if isinstance(file_handle, FakeFileIO) and not file_handle.open_modes.can_read:
+            if n == 0 and self.filesystem.is_windows_fs:
+                return b""
+            self.filesystem.raise_os_error(errno.EBADF, file_handle.file_path)
         if isinstance(file_handle, FakeDirWrapper):
             self.filesystem.raise_os_error(errno.EBADF, file_handle.file_path)
-        return file_handle.read(n)
+        # file wrappers read bytes if accessed via a file descriptor
+        return cast(bytes, file_handle.read(n))
 
     def write(self, fd: int, contents: bytes) -> int:
         """Write string to file descriptor, returns number of bytes written.
@@ -378,6 +402,14 @@ class FakeOsModule:
         if isinstance(file_handle, FakePipeWrapper):
             return file_handle.write(contents)
 
+        if isinstance(file_handle, FakeFileIO):
+            # the raw file object writes directly into the file contents
+            if not file_handle.open_modes.can_write:
+                if not contents and self.filesystem.is_windows_fs:
+                    return 0
+                self.filesystem.raise_os_error(errno.EBADF, file_handle.file_path)
+            return file_handle.write(contents)
+
         file_handle.raw_io = True
         file_handle._sync_io()
         file_handle.update_flush_pos()
@@ -385,23 +417,74 @@ class FakeOsModule:
         file_handle.flush()
         return len(contents)
 
-    def lseek(self, fd: int, pos: int, whence: int):
+    def lseek(self, fd: int, pos: int, whence: int) -> int:
         file_handle = self.filesystem.get_open_file(fd)
-        if isinstance(file_handle, FakeFileWrapper):
-            file_handle.seek(pos, whence)
-        else:
+        if not isinstance(file_handle, (FakeFileWrapper, FakeFileIO)):
             self.filesystem.raise_os_error(errno.EBADF)
+        file_handle.seek(pos, whence)
+        return file_handle.tell()
 
     def pipe(self) -> tuple[int, int]:
-        read_fd, write_fd = os.pipe()
-        read_wrapper = FakePipeWrapper(self.filesystem, read_fd, False)
+        """Create an in-memory pipe that only exists in the fake filesystem.
+
+        Returns:
+            The file descriptors for reading and writing.
+        """
+        pipe = FakePipe()
+        read_wrapper = FakePipeWrapper(self.filesystem, pipe, False)
         file_des = self.filesystem.add_open_file(read_wrapper)
         read_wrapper.filedes = file_des
-        write_wrapper = FakePipeWrapper(self.filesystem, write_fd, True)
+        write_wrapper = FakePipeWrapper(self.filesystem, pipe, True)
         file_des = self.filesystem.add_open_file(write_wrapper)
         write_wrapper.filedes = file_des
         return read_wrapper.filedes, write_wrapper.filedes
 
+    def pipe2(self, flags: int) -> tuple[int, int]:
+        """Create an in-memory pipe with the given flags.
+
+        Args:
+            flags: A combination of `O_NONBLOCK` and `O_CLOEXEC`.
+
+        Returns:
+            The file descriptors for reading and writing.
+
+        Raises:
+            AttributeError: if not called under Linux.
+        """
+        if not self.filesystem.is_linux:
+            raise AttributeError("module 'os' has no attribute 'pipe2'")
+        if flags & ~(os.O_NONBLOCK | os.O_CLOEXEC):
+            self.filesystem.raise_os_error(errno.EINVAL)
+        read_fd, write_fd = self.pipe()
+        if flags & os.O_NONBLOCK:
+            self.set_blocking(read_fd, False)
+            self.set_blocking(write_fd, False)
+        return read_fd, write_fd
+
+    def get_blocking(self, fd: int) -> bool:
+        """Return `False` if the `O_NONBLOCK` flag is set for the given
+        file descriptor. Only pipes can be non-blocking in the fake
+        filesystem.
+
+        Raises:
+            OSError: if the file descriptor is invalid.
+        """
+        file_handle = self.filesystem.get_open_file(fd)
+        if isinstance(file_handle, FakePipeWrapper):
+            return file_handle.blocking
+        return True
+
+    def set_blocking(self, fd: int, blocking: bool) -> None:
+        """Set or clear the `O_NONBLOCK` flag of the given file descriptor.
+        This has only an effect for pipes.
+
+        Raises:
+            OSError: if the file descriptor is invalid.
+        """
+        file_handle = self.filesystem.get_open_file(fd)
+        if isinstance(file_handle, FakePipeWrapper):
+            file_handle.blocking = blocking
+
     def fstat(self, fd: int) -> FakeStatResult:
         """Return the os.stat-like tuple for the FakeFile object of file_des.
 
@@ -1018,11 +1101,15 @@ class FakeOsModule:
             length: (int) Maximum length of the file after truncating it.
 
         Raises:
-            OSError: if the file descriptor is invalid
+            OSError: if the file descriptor is invalid or not open for writing
         """
-        file_object = self.filesystem.get_open_file(fd).get_object()
-        if isinstance(file_object, FakeFileWrapper):
-            file_object.size = length
+        file_handle = self.filesystem.get_open_file(fd)
+        if isinstance(file_handle, (FakeFileWrapper, FakeFileIO)):
+            if not file_handle.open_modes.can_write:
+                self.filesystem.raise_os_error(
+                    errno.EBADF if self.filesystem.is_windows_fs else errno.EINVAL
+                )
+            file_handle.file_object.size = length
         else:
             self.filesystem.raise_os_error(errno.EBADF)
 
@@ -1194,6 +1281,7 @@ class FakeOsModule:
         file_object = self.filesystem.resolve(path, follow_symlinks, allow_fd=True)
         if not isinstance(uid, int) or not isinstance(gid, int):
             raise TypeError("An integer is required")
+        file_object.check_metadata_writable()
         if uid != -1:
             file_object.st_uid = uid
         if gid != -1:
@@ -1346,6 +1434,229 @@ class FakeOsModule:
             self.filesystem.raise_os_error(errno.EINVAL)
         self.filesystem.get_open_file(fd)
 
+    def _positional_io_handle(
+        self, fd: int, writing: bool
+    ) -> FakeFileWrapper | FakeFileIO:
+        """Return the open file for reading or writing at an offset,
+        without changing the file position.
+
+        Raises:
+            OSError: if the file descriptor is invalid, not seekable or not
+                open for the requested access.
+        """
+        file_handle = self.filesystem.get_open_file(fd)
+        if isinstance(file_handle, FakeDirWrapper) and not writing:
+            self.filesystem.raise_os_error(errno.EISDIR, file_handle.file_path)
+        if isinstance(file_handle, FakePipeWrapper):
+            self.filesystem.raise_os_error(errno.ESPIPE)
+        if not isinstance(file_handle, (FakeFileWrapper, FakeFileIO)):
+            self.filesystem.raise_os_error(errno.EBADF)
+        if writing:
+            allowed = file_handle.open_modes.can_write and file_handle.allow_update
+        else:
+            allowed = file_handle.open_modes.can_read
+        if not allowed:
+            self.filesystem.raise_os_error(errno.EBADF, file_handle.file_path)
+        if file_handle.file_object.is_large_file():
+            raise FakeLargeFileIoException(file_handle.file_path)
+        if writing and isinstance(file_handle, FakeFileWrapper):
+            # write pending contents first, so that they do not
+            # overwrite the contents written at the offset
+            file_handle.flush()
+        return file_handle
+
+    def _read_at(self, file_object: FakeFile, buffers: Any, offset: int) -> int:
+        """Read the file contents at `offset` directly into the buffers."""
+        if offset < 0:
+            self.filesystem.raise_os_error(errno.EINVAL)
+        total = 0
+        for buffer in buffers:
+            with memoryview(buffer) as view:
+                size = file_object.read_into(view, offset + total)
+                total += size
+                if size < view.nbytes:
+                    break
+        if not self.filesystem.is_windows_fs:
+            file_object.st_atime = now()
+        return total
+
+    def _write_at(
+        self,
+        file_handle: FakeFileWrapper | FakeFileIO,
+        buffers: Any,
+        offset: int,
+        append: bool = False,
+    ) -> int:
+        """Write the buffers into the file contents at `offset`."""
+        if offset < 0:
+            self.filesystem.raise_os_error(errno.EINVAL)
+        file_object = file_handle.file_object
+        if append or file_handle.open_modes.append and not self.filesystem.is_macos:
+            # under Linux, the offset is ignored for files opened for appending
+            offset = file_object.size
+        elif offset > file_object.size:
+            file_object.size = offset
+        total = 0
+        changed = False
+        for buffer in buffers:
+            with memoryview(buffer) as view, view.cast("B") as contents:
+                changed |= file_object.update_contents(
+                    contents, offset + total, file_object.encoding, truncate=False
+                )
+                total += contents.nbytes
+        if changed:
+            current_time = now()
+            file_object.st_ctime = current_time
+            file_object.st_mtime = current_time
+        return total
+
+    def pread(self, fd: int, n: int, offset: int) -> bytes:
+        """Read at most `n` bytes from the file descriptor at the given offset,
+        leaving the file position unchanged.
+
+        Args:
+            fd: An integer file descriptor for the file object requested.
+            n: Maximum number of bytes to read.
+            offset: Position in the file to read from.
+
+        Returns:
+            The bytes read, an empty bytes object at the end of the file.
+
+        Raises:
+            OSError: if the file descriptor is invalid or not open for reading.
+        """
+        if self.filesystem.is_windows_fs:
+            raise AttributeError("module 'os' has no attribute 'pread'")
+        file_object = self._positional_io_handle(fd, writing=False).file_object
+        if n < 0:
+            self.filesystem.raise_os_error(errno.EINVAL)
+        buffer = bytearray(max(0, min(n, file_object.size - offset)))
+        self._read_at(file_object, [buffer], offset)
+        return bytes(buffer)
+
+    def pwrite(self, fd: int, data: bytes, offset: int) -> int:
+        """Write `data` to the file descriptor at the given offset,
+        leaving the file position unchanged.
+
+        Args:
+            fd: An integer file descriptor for the file object requested.
+            data: A bytes-like object to write.
+            offset: Position in the file to write to.
+
+        Returns:
+            The number of bytes written.
+
+        Raises:
+            OSError: if the file descriptor is invalid or not open for writing.
+        """
+        if self.filesystem.is_windows_fs:
+            raise AttributeError("module 'os' has no attribute 'pwrite'")
+        file_handle = self._positional_io_handle(fd, writing=True)
+        return self._write_at(file_handle, [data], offset)
+
+    def readv(self, fd: int, buffers: Sequence[Any]) -> int:
+        """Read from the file descriptor into the given mutable buffers,
+        filling each buffer before continuing with the next one.
+
+        Args:
+            fd: An integer file descriptor for the file object requested.
+            buffers: A sequence of writable bytes-like objects.
+
+        Returns:
+            The total number of bytes read.
+
+        Raises:
+            OSError: if the file descriptor is invalid or not open for reading.
+        """
+        if self.filesystem.is_windows_fs:
+            raise AttributeError("module 'os' has no attribute 'readv'")
+        file_handle = self.filesystem.get_open_file(fd)
+        if not isinstance(file_handle, FakeFileIO):
+            views = [memoryview(buffer).cast("B") for buffer in buffers]
+            contents = self.read(fd, sum(view.nbytes for view in views))
+            position = 0
+            for view in views:
+                size = min(view.nbytes, len(contents) - position)
+                view[:size] = contents[position : position + size]
+                position += size
+            return len(contents)
+        if not file_handle.open_modes.can_read:
+            self.filesystem.raise_os_error(errno.EBADF, file_handle.file_path)
+        total = 0
+        for buffer in buffers:
+            with memoryview(buffer) as view:
+                size = file_handle.readinto(view)
+                total += size
+                if size < view.nbytes:
+                    break
+        return total
+
+    def writev(self, fd: int, buffers: Sequence[Any]) -> int:
+        """Write the contents of the given buffers to the file descriptor.
+
+        Args:
+            fd: An integer file descriptor for the file object requested.
+            buffers: A sequence of bytes-like objects.
+
+        Returns:
+            The total number of bytes written.
+
+        Raises:
+            OSError: if the file descriptor is invalid or not open for writing.
+        """
+        if self.filesystem.is_windows_fs:
+            raise AttributeError("module 'os' has no attribute 'writev'")
+        return sum(self.write(fd, buffer) for buffer in buffers)
+
+    def preadv(
+        self, fd: int, buffers: Sequence[Any], offset: int, flags: int = 0
+    ) -> int:
+        """Read from the file descriptor at the given offset into the given
+        mutable buffers, leaving the file position unchanged.
+
+        Args:
+            fd: An integer file descriptor for the file object requested.
+            buffers: A sequence of writable bytes-like objects.
+            offset: Position in the file to read from.
+            flags: Flags for the read operation, ignored in the fake
+                filesystem.
+
+        Returns:
+            The total number of bytes read.
+
+        Raises:
+            OSError: if the file descriptor is invalid or not open for reading.
+        """
+        if self.filesystem.is_windows_fs:
+            raise AttributeError("module 'os' has no attribute 'preadv'")
+        file_object = self._positional_io_handle(fd, writing=False).file_object
+        return self._read_at(file_object, buffers, offset)
+
+    def pwritev(
+        self, fd: int, buffers: Sequence[Any], offset: int, flags: int = 0
+    ) -> int:
+        """Write the contents of the given buffers to the file descriptor
+        at the given offset, leaving the file position unchanged.
+
+        Args:
+            fd: An integer file descriptor for the file object requested.
+            buffers: A sequence of bytes-like objects.
+            offset: Position in the file to write to.
+            flags: Flags for the write operation, of which only
+                `os.RWF_APPEND` is handled in the fake filesystem.
+
+        Returns:
+            The total number of bytes written.
+
+        Raises:
+            OSError: if the file descriptor is invalid or not open for writing.
+        """
+        if self.filesystem.is_windows_fs:
+            raise AttributeError("module 'os' has no attribute 'pwritev'")
+        file_handle = self._positional_io_handle(fd, writing=True)
+        append = bool(flags & getattr(os, "RWF_APPEND", 0))
+        return self._write_at(file_handle, buffers, offset, append)
+
     def sendfile(self, fd_out: int, fd_in: int, offset: int, count: int) -> int:
         """Copy count bytes from file descriptor fd_in to file descriptor
         fd_out starting at offset.
@@ -1370,28 +1681,85 @@ class FakeOsModule:
             self.filesystem.raise_os_error(errno.EINVAL)
         if 0 <= fd_out < NR_STD_STREAMS:
             self.filesystem.raise_os_error(errno.EINVAL)
-        source = cast(FakeFileWrapper, self.filesystem.get_open_file(fd_in))
-        dest = cast(FakeFileWrapper, self.filesystem.get_open_file(fd_out))
+        source = self._positional_io_handle(fd_in, writing=False)
+        dest = self._positional_io_handle(fd_out, writing=True)
         if self.filesystem.is_macos:
             if dest.get_object().stat_result.st_mode & 0o777000 != S_IFSOCK:
                 raise OSError("Socket operation on non-socket")
-        if offset is None:
-            if self.filesystem.is_macos:
+            if offset is None:
                 raise TypeError("None is not a valid offset")
-            contents = source.read(count)
+            if count == 0:
+                return self._copy_range(source, dest, offset, None, None)
+        return self._copy_range(source, dest, offset, None, count)
+
+    def copy_file_range(
+        self,
+        src: int,
+        dst: int,
+        count: int,
+        offset_src: int | None = None,
+        offset_dst: int | None = None,
+    ) -> int:
+        """Copy count bytes from file descriptor src to file descriptor dst.
+        Copying the whole contents into an empty file does not copy the
+        contents, instead both files share them until one of them is changed.
+
+        Args:
+            src: The file descriptor of the source file.
+            dst: The file descriptor of the destination file.
+            count: The maximum number of bytes to copy.
+            offset_src: The offset in bytes where to start the copy in the
+                source file. If `None`, copying is started at the current
+                position, and the position is updated.
+            offset_dst: The offset in bytes where to write the copy in the
+                destination file. If `None`, the current position is used
+                and updated.
+
+        Returns:
+            The number of copied bytes, 0 at the end of the source file.
+
+        Raises:
+            OSError: If `src` or `dst` is an invalid file descriptor, or if
+                `dst` is opened for appending.
+        """
+        if not self.filesystem.is_linux:
+            raise AttributeError("module 'os' has no attribute 'copy_file_range'")
+        source = self._positional_io_handle(src, writing=False)
+        dest = self._positional_io_handle(dst, writing=True)
+        if dest.open_modes.append:
+            self.filesystem.raise_os_error(errno.EBADF)
+        return self._copy_range(source, dest, offset_src, offset_dst, count)
+
+    def _copy_range(
+        self,
+        source: FakeFileWrapper | FakeFileIO,
+        dest: FakeFileWrapper | FakeFileIO,
+        offset: int | None,
+        position: int | None,
+        count: int | None,
+    ) -> int:
+        """Copy at most `count` bytes from `offset` in the source file to
+        `position` in the destination file. If an offset is `None`,
+        the current position of the respective file is used and updated.
+        """
+        start = source.tell() if offset is None else offset
+        if dest.open_modes.append:
+            target = dest.file_object.size
         else:
-            position = source.tell()
-            source.seek(offset)
-            if count == 0 and self.filesystem.is_macos:
-                contents = source.read()
-            else:
-                contents = source.read(count)
-            source.seek(position)
-        if contents:
-            written = dest.write(contents)
-            dest.flush()
-            return written
-        return 0
+            target = dest.tell() if position is None else position
+        if start < 0 or target < 0:
+            self.filesystem.raise_os_error(errno.EINVAL)
+        size = dest.file_object.copy_from(source.file_object, start, target, count)
+        if offset is None:
+            source.seek(start + size)
+        if position is None and not dest.open_modes.append:
+            dest.seek(target + size)
+        if size:
+            current_time = now()
+            dest.file_object.st_ctime = current_time
+            dest.file_object.st_mtime = current_time
+            source.file_object.st_atime = current_time
+        return size
 
     def getuid(self) -> int:
         """Returns the user id set in the fake filesystem.
@@ -1414,6 +1782,9 @@ class FakeOsModule:
         def readinto(self, fd, buffer):
             """Read from a file descriptor fd into a mutable buffer object buffer."""
             wrapper = self.filesystem.get_open_file(fd)
+            if isinstance(wrapper, (FakeBinaryFileWrapper, FakeFileIO)):
+                # copy the contents directly into the buffer
+                return wrapper.readinto(buffer)
             contents = wrapper.read(len(buffer))
             count = len(contents)
             buffer[:count] = contents
@@ -1468,7 +1839,7 @@ def handle_original_call(f: Callable) -> Callable:
 
     @functools.wraps(f)
     def wrapped(*args, **kwargs):
-        should_use_original = FakeOsModule.use_original
+        should_use_original = FakeOsModule.use_original or is_faking_paused()
 
         if not should_use_original and args:
             self = args[0]
@@ -1478,6 +1849,11 @@ def handle_original_call(f: Callable) -> Callable:
                 if is_called_from_skipped_module(
                     skip_names=skip_names,
                     case_sensitive=fs.is_case_sensitive,
+                ) or (
+                    fs.patcher.patch_only is not None
+                    and is_called_from_unpatched_module(
+                        fs.patcher.is_patched_module, fs.is_case_sensitive
+                    )
                 ):
                     should_use_original = True
 
@@ -1502,8 +1878,9 @@ def use_original_os():
     """Temporarily use original os functions instead of faked ones.
     Used to ensure that skipped modules do not use faked calls.
     """
+    use_original = FakeOsModule.use_original
     try:
         FakeOsModule.use_original = True
         yield
     finally:
-        FakeOsModule.use_original = False
+        FakeOsModule.use_original = use_original
@@ -38,6 +38,8 @@ from collections.abc import Callable
 
 from pyfakefs.helpers import (
     is_called_from_skipped_module,
+    is_called_from_unpatched_module,
+    is_faking_paused,
     make_string_path,
     to_string,
     matching_string,
@@ -599,12 +601,18 @@ def handle_original_call(f: Callable) -> Callable:
     def wrapped(*args, **kwargs):
         if args:
             self = args[0]
-            should_use_original = self.os.use_original
+            should_use_original = self.os.use_original or is_faking_paused()
             if not should_use_original and self.filesystem.has_patcher:
-                skip_names = self.filesystem.patcher.skip_names
+                patcher = self.filesystem.patcher
+                case_sensitive = self.filesystem.is_case_sensitive
                 if is_called_from_skipped_module(
-                    skip_names=skip_names,
-                    case_sensitive=self.filesystem.is_case_sensitive,
+                    skip_names=patcher.skip_names,
+                    case_sensitive=case_sensitive,
+                ) or (
+                    patcher.patch_only is not None
+                    and is_called_from_unpatched_module(
+                        patcher.is_patched_module, case_sensitive
+                    )
                 ):
                     should_use_original = True
 
@@ -43,11 +43,17 @@ from unittest import mock
 from urllib.parse import quote_from_bytes as urlquote_from_bytes
 
 from pyfakefs import fake_scandir
+from pyfakefs.fake_file import copy_file_object
 from pyfakefs.fake_filesystem import FakeFilesystem
 from pyfakefs.fake_open import fake_open
 from pyfakefs.fake_os import FakeOsModule, use_original_os
 from pyfakefs.fake_path import FakePathModule
-from pyfakefs.helpers import IS_PYPY, is_called_from_skipped_module, FSType
+from pyfakefs.helpers import (
+    IS_PYPY,
+    is_called_from_skipped_module,
+    is_faking_paused,
+    FSType,
+)
 
 
 _WIN_RESERVED_NAMES = (
@@ -100,7 +106,7 @@ def _wrap_strfunc(fake_fct, original_fct):
     def _wrapped(pathobj, *args, **kwargs):
         fs: FakeFilesystem = pathobj.filesystem
         if fs.has_patcher:
-            if is_called_from_skipped_module(
+            if is_faking_paused() or is_called_from_skipped_module(
                 skip_names=fs.patcher.skip_names,
                 case_sensitive=fs.is_case_sensitive,
             ):
@@ -115,7 +121,7 @@ def _wrap_binary_strfunc(fake_fct, original_fct):
     def _wrapped(pathobj1, pathobj2, *args):
         fs: FakeFilesystem = pathobj1.filesystem
         if fs.has_patcher:
-            if is_called_from_skipped_module(
+            if is_faking_paused() or is_called_from_skipped_module(
                 skip_names=fs.patcher.skip_names,
                 case_sensitive=fs.is_case_sensitive,
             ):
@@ -130,7 +136,7 @@ def _wrap_binary_strfunc_reverse(fake_fct, original_fct):
     def _wrapped(pathobj1, pathobj2, *args):
         fs: FakeFilesystem = pathobj2.filesystem
         if fs.has_patcher:
-            if is_called_from_skipped_module(
+            if is_faking_paused() or is_called_from_skipped_module(
                 skip_names=fs.patcher.skip_names,
                 case_sensitive=fs.is_case_sensitive,
             ):
@@ -596,7 +602,10 @@ class FakePath(pathlib.Path):
     skip_names: list[str] = []
 
     def __new__(cls, *args, **kwargs):
-        """Creates the correct subclass based on OS."""
+        """Creates the correct subclass based on OS, or a real path
+        if faking is paused."""
+        if is_faking_paused():
+            return RealPath(*args, **kwargs)
         if cls is FakePathlibModule.Path:
             cls = (
                 FakePathlibModule.WindowsPath
@@ -889,9 +898,19 @@ class FakePath(pathlib.Path):
                 pathlib_os._ficlone = None
                 old_sendfile = pathlib_os._sendfile  # type: ignore[attr-defined]
                 pathlib_os._sendfile = None
+                # copy fake files natively instead of reading and writing chunks
+                pathlib_module = pathlib.pathlib_module  # type: ignore[attr-defined]
+                old_copyfileobj = pathlib_module.copyfileobj
+
+                def copyfileobj(source_f, target_f):
+                    if not copy_file_object(source_f, target_f):
+                        old_copyfileobj(source_f, target_f)
+
+                pathlib_module.copyfileobj = copyfileobj
                 try:
                     return super()._copy_from_file(source, preserve_metadata)  # type: ignore[attr-defined]
                 finally:
+                    pathlib_module.copyfileobj = old_copyfileobj
                     pathlib_os._fcopyfile = old_fcopyfile
                     pathlib_os._copy_file_range = old_copy_file_range
                     pathlib_os._ficlone = old_ficlone
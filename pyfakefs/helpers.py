@@ -16,6 +16,7 @@ for ``pyfakefs`` users."""
 import ctypes
 import importlib
 import io
+import linecache
 import locale
 import os
 import platform
@@ -23,12 +24,13 @@ import stat
 import sys
 import sysconfig
 import time
-import traceback
 from collections import namedtuple
+from collections.abc import Callable
 from copy import copy
 from dataclasses import dataclass
 from enum import Enum
 from stat import S_IFLNK
+from types import FrameType
 from typing import Union, Any, AnyStr, overload, cast
 
 AnyString = Union[str, bytes]
@@ -65,6 +67,9 @@ else:
     USER_ID = os.getuid()
     GROUP_ID = os.getgid()
 
+# set while patching is paused with the modules still patched
+FAKING_PAUSED = False
+
 
 def get_uid() -> int:
     """Get the global user id. Same as ``os.getuid()``"""
@@ -110,6 +115,24 @@ def reset_ids() -> None:
         set_gid(os.getgid())
 
 
+def is_faking_paused() -> bool:
+    """Return `True` if patching is paused without unpatching the modules.
+    All fake module entry points check this first and pass the calls
+    to the real modules in this case."""
+    return FAKING_PAUSED
+
+
+def set_faking_paused(paused: bool) -> None:
+    """Pause or resume faking for all patched modules.
+
+    Args:
+        paused: if `True`, all calls to fake modules are passed to the
+            real modules until faking is resumed
+    """
+    global FAKING_PAUSED
+    FAKING_PAUSED = paused
+
+
 def is_root() -> bool:
     """Return `True` if the current user is the root user."""
     return USER_ID == 0
@@ -466,15 +489,87 @@ class FakeStatResult:
         self._st_ctime_ns = val
 
 
+class OffsetBytesIO(io.BytesIO):
+    """Byte stream holding only the contents after `offset` of a file opened
+    for appending only, so that the existing file contents are not copied
+    into the stream. Positions are given relative to the start of the file.
+    """
+
+    def __init__(self, offset: int):
+        super().__init__()
+        self.offset = offset
+
+    def tell(self) -> int:
+        return super().tell() + self.offset
+
+    def seek(self, pos: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = max(pos - self.offset, 0)
+        return super().seek(pos, whence) + self.offset
+
+    def truncate(self, size: int | None = None) -> int:
+        if size is not None:
+            size = max(size - self.offset, 0)
+        return super().truncate(size) + self.offset
+
+    def rebase(self, offset: int) -> None:
+        """Discard the stream contents after they have been written to the
+        file, which now has the size `offset`."""
+        super().seek(0)
+        super().truncate()
+        self.offset = offset
+
+    def load_prefix(self, prefix: bytes) -> None:
+        """Add the file contents before the offset to the stream, so that
+        the stream holds the whole contents."""
+        position = self.tell()
+        contents = prefix[: self.offset] + self.getvalue()
+        super().seek(0)
+        super().write(contents)
+        self.offset = 0
+        self.seek(position)
+
+
 class BinaryBufferIO(io.BytesIO):
     """Stream class that handles byte contents for files."""
 
-    def __init__(self, contents: bytes | None):
+    offset = 0
+
+    def __init__(self, contents: bytes | None = None):
         super().__init__(contents or b"")
 
     def putvalue(self, value: bytes) -> None:
         self.write(value)
 
+    def setvalue(self, value: bytes) -> None:
+        # re-initializing the stream shares the given bytes
+        # instead of copying them, until the stream is written
+        io.BytesIO.__init__(self, value)
+        self.seek(0, io.SEEK_END)
+
+    def appendvalue(self, value: bytes) -> None:
+        position = self.tell()
+        self.seek(0, io.SEEK_END)
+        self.write(value)
+        self.seek(position)
+
+    def byte_position(self) -> int:
+        return self.tell()
+
+    def byte_size(self) -> int:
+        position = self.tell()
+        size = self.seek(0, io.SEEK_END)
+        self.seek(position)
+        return size
+
+    def bytes_from(self, position: int) -> bytes:
+        with self.getbuffer() as buffer:
+            return bytes(buffer[position - self.offset :])
+
+
+class OffsetBinaryBufferIO(OffsetBytesIO, BinaryBufferIO):
+    """Binary stream class for files opened for appending only."""
+
 
 class TextBufferIO(io.TextIOWrapper):
     """Stream class that handles Python string contents for files."""
@@ -485,8 +580,11 @@ class TextBufferIO(io.TextIOWrapper):
         newline: str | None = None,
         encoding: str | None = None,
         errors: str = "strict",
+        offset: int | None = None,
     ):
-        self._bytestream = io.BytesIO(contents or b"")
+        self._bytestream: io.BytesIO = (
+            io.BytesIO(contents or b"") if offset is None else OffsetBytesIO(offset)
+        )
         super().__init__(
             self._bytestream, encoding=encoding, errors=errors, newline=newline
         )
@@ -497,67 +595,158 @@ class TextBufferIO(io.TextIOWrapper):
     def putvalue(self, value: bytes) -> None:
         self._bytestream.write(value)
 
+    def setvalue(self, value: bytes) -> None:
+        self.seek(0)
+        self.truncate()
+        self.putvalue(value)
+
+    def appendvalue(self, value: bytes) -> None:
+        # the position of the text stream is kept, as the bytes
+        # already read into its decoder buffer do not change
+        position = self._bytestream.tell()
+        self._bytestream.seek(0, io.SEEK_END)
+        self._bytestream.write(value)
+        self._bytestream.seek(position)
+
+    def getbuffer(self) -> memoryview:
+        return self._bytestream.getbuffer()
+
+    def byte_position(self) -> int:
+        return self._bytestream.tell()
+
+    def byte_size(self) -> int:
+        position = self._bytestream.tell()
+        size = self._bytestream.seek(0, io.SEEK_END)
+        self._bytestream.seek(position)
+        return size
+
+    @property
+    def offset(self) -> int:
+        return getattr(self._bytestream, "offset", 0)
+
+    def bytes_from(self, position: int) -> bytes:
+        with self._bytestream.getbuffer() as buffer:
+            return bytes(buffer[position - self.offset :])
+
+    def rebase(self, offset: int) -> None:
+        cast(OffsetBytesIO, self._bytestream).rebase(offset)
+
+    def load_prefix(self, prefix: bytes) -> None:
+        cast(OffsetBytesIO, self._bytestream).load_prefix(prefix)
+
+
+# module name suffixes of the files of calling code objects, by case sensitivity
+# and file name - `None` for files not considered as callers
+_CALLER_MODULE_SUFFIXES: dict[bool, dict[str, frozenset[str] | None]] = {
+    True: {},
+    False: {},
+}
+
+
+def _caller_module_suffixes(
+    filename: str, case_sensitive: bool
+) -> frozenset[str] | None:
+    """Return the module name derived from `filename` with all its
+    dot-separated suffixes, or `None` if the file is part of the standard
+    library or of pyfakefs (excluding the tests)."""
 
-def is_called_from_skipped_module(
-    skip_names: list | set, case_sensitive: bool, check_open_code: bool = False
-) -> bool:
     def starts_with(path, string):
         if case_sensitive:
             return path.startswith(string)
         return path.lower().startswith(string.lower())
 
+    if (
+        filename.startswith("<frozen ")
+        or starts_with(filename, STDLIB_PATH)
+        or (
+            starts_with(filename, PYFAKEFS_PATH)
+            and not any(
+                starts_with(filename, test_path) for test_path in PYFAKEFS_TEST_PATHS
+            )
+        )
+    ):
+        return None
+    caller_module_name = os.path.splitext(filename)[0]
+    caller_module_name = caller_module_name.replace(os.sep, ".")
+    # a skip name matches if it is the module name or a suffix after a dot
+    parts = caller_module_name.split(".")
+    return frozenset(".".join(parts[i:]) for i in range(len(parts)))
+
+
+def is_called_from_skipped_module(
+    skip_names: list | set, case_sensitive: bool, check_open_code: bool = False
+) -> bool:
     # in most cases we don't have skip names and won't need the overhead
-    # of analyzing the traceback, except when checking for open_code
+    # of analyzing the call stack, except when checking for open_code
     if not skip_names and not check_open_code:
         return False
 
-    stack = traceback.extract_stack(limit=6)
-
     # handle the case that we try to call the original `open_code`
     # (since Python 3.12)
     # The stack in this case is:
-    # -1: helpers.is_called_from_skipped_module: 'stack = traceback.extract_stack()'
-    # -2: fake_open.fake_open: 'if is_called_from_skipped_module('
-    # -3: fake_io.open: 'return fake_open('
-    # -4: fake_io.open_code : 'return self._io_module.open_code(path)'
-    if (
-        check_open_code
-        and stack[-4].name == "open_code"
-        and stack[-4].line == "return self._io_module.open_code(path)"
-    ):
-        return True
+    # 0: helpers.is_called_from_skipped_module
+    # 1: fake_open.fake_open: 'if is_called_from_skipped_module('
+    # 2: fake_io.open: 'return fake_open('
+    # 3: fake_io.open_code : 'return self._io_module.open_code(path)'
+    if check_open_code:
+        try:
+            frame = sys._getframe(3)
+        except ValueError:
+            # the stack is not deep enough
+            pass
+        else:
+            code = frame.f_code
+            if (
+                code.co_name == "open_code"
+                and linecache.getline(code.co_filename, frame.f_lineno).strip()
+                == "return self._io_module.open_code(path)"
+            ):
+                return True
 
     if not skip_names:
         return False
 
-    caller_filename = next(
-        (
-            frame.filename
-            for frame in stack[::-1]
-            if not frame.filename.startswith("<frozen ")
-            and not starts_with(frame.filename, STDLIB_PATH)
-            and (
-                not starts_with(frame.filename, PYFAKEFS_PATH)
-                or any(
-                    starts_with(frame.filename, test_path)
-                    for test_path in PYFAKEFS_TEST_PATHS
-                )
-            )
-        ),
-        None,
-    )
-
-    if caller_filename:
-        caller_module_name = os.path.splitext(caller_filename)[0]
-        caller_module_name = caller_module_name.replace(os.sep, ".")
-
-        if any(
-            [
-                caller_module_name == sn or caller_module_name.endswith("." + sn)
-                for sn in skip_names
-            ]
-        ):
-            return True
+    # find the first of the 5 innermost callers outside of the standard library
+    # and pyfakefs, caching the result for the file of each code object
+    suffixes_by_filename = _CALLER_MODULE_SUFFIXES[case_sensitive]
+    caller: FrameType | None = sys._getframe(1)
+    for _ in range(5):
+        if caller is None:
+            break
+        filename = caller.f_code.co_filename
+        try:
+            suffixes = suffixes_by_filename[filename]
+        except KeyError:
+            suffixes = _caller_module_suffixes(filename, case_sensitive)
+            suffixes_by_filename[filename] = suffixes
+        if suffixes is not None:
+            return not suffixes.isdisjoint(skip_names)
+        caller = caller.f_back
+    return False
+
+
+def is_called_from_unpatched_module(
+    is_patched_module: Callable[[str], bool], case_sensitive: bool
+) -> bool:
+    """Return `True` if the innermost caller outside of the standard library
+    and pyfakefs is a module for which `is_patched_module` returns `False`.
+    Used to restrict the fake file system to the modules given in
+    `patch_only`, as the real `pathlib` classes use the fake `os` module
+    for all callers."""
+    suffixes_by_filename = _CALLER_MODULE_SUFFIXES[case_sensitive]
+    caller: FrameType | None = sys._getframe(1)
+    for _ in range(10):
+        if caller is None:
+            break
+        filename = caller.f_code.co_filename
+        try:
+            suffixes = suffixes_by_filename[filename]
+        except KeyError:
+            suffixes = _caller_module_suffixes(filename, case_sensitive)
+            suffixes_by_filename[filename] = suffixes
+        if suffixes is not None:
+            return not is_patched_module(caller.f_globals.get("__name__", ""))
+        caller = caller.f_back
     return False
 
 
@@ -14,7 +14,7 @@ import contextlib
 import pytest
 from _pytest import capture
 
-from pyfakefs.fake_filesystem_unittest import Patcher, Pause
+from pyfakefs.fake_filesystem_unittest import ModuleIndexCache, Patcher, Pause
 
 try:
     from _pytest import pathlib
@@ -90,9 +90,24 @@ def fs_session(request):
     patcher.tearDown()
 
 
+def pytest_sessionstart(session):
+    """Load the module index of the last test session from the pytest cache,
+    so that unchanged modules don't have to be scanned again."""
+    cache = getattr(session.config, "cache", None)
+    if cache is not None and Patcher.MODULE_INDEX_CACHE is None:
+        index_path = cache.mkdir("pyfakefs") / "module_index.json"
+        Patcher.MODULE_INDEX_CACHE = ModuleIndexCache(index_path)
+        Patcher.MODULE_INDEX_CACHE.load()
+
+
 @pytest.hookimpl(tryfirst=True)
 def pytest_sessionfinish(session, exitstatus):
-    """Make sure that the cache is cleared before the final test shutdown."""
+    """Make sure that the cache is cleared before the final test shutdown,
+    after saving the module index."""
+    if Patcher.MODULE_INDEX_CACHE is not None:
+        pause = Patcher.PATCHER is not None and Patcher.PATCHER.is_patching
+        with Pause(Patcher.PATCHER) if pause else contextlib.nullcontext():
+            Patcher.MODULE_INDEX_CACHE.save()
     Patcher.clear_fs_cache()
 
 
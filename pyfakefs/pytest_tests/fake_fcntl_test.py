@@ -10,8 +10,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import sys
 
+import pytest
+
 if sys.platform == "linux":
     import fcntl
 
@@ -20,3 +23,15 @@ if sys.platform == "linux":
         with open("lock_file", "a+") as lock_file:
             fcntl.flock(lock_file, fcntl.LOCK_SH)
             fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def test_set_non_blocking_flag_of_pipe(fs):
+        read_fd, write_fd = os.pipe()
+        flags = fcntl.fcntl(read_fd, fcntl.F_GETFL)
+        assert not flags & os.O_NONBLOCK
+        fcntl.fcntl(read_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+        assert fcntl.fcntl(read_fd, fcntl.F_GETFL) & os.O_NONBLOCK
+        assert not os.get_blocking(read_fd)
+        with pytest.raises(BlockingIOError):
+            os.read(read_fd, 10)
+        os.close(read_fd)
+        os.close(write_fd)
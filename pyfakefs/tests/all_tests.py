@@ -26,6 +26,7 @@ from pyfakefs.tests import (
     fake_filesystem_test,
     fake_filesystem_unittest_test,
     fake_filesystem_vs_real_test,
+    fake_mmap_test,
     fake_open_test,
     fake_os_test,
     fake_pathlib_test,
@@ -48,6 +49,7 @@ class AllTests(unittest.TestSuite):
                 loader.loadTestsFromModule(fake_os_test),
                 loader.loadTestsFromModule(fake_stat_time_test),
                 loader.loadTestsFromModule(fake_open_test),
+                loader.loadTestsFromModule(fake_mmap_test),
                 loader.loadTestsFromModule(fake_tempfile_test),
                 loader.loadTestsFromModule(fake_filesystem_vs_real_test),
                 loader.loadTestsFromModule(fake_filesystem_unittest_test),
@@ -14,10 +14,16 @@
 Tests for patching modules loaded after `setUpPyfakefs()`.
 """
 
+import importlib
+import os
 import pathlib
+import shutil
+import sys
+import tempfile
 import unittest
 
 from pyfakefs import fake_filesystem_unittest
+from pyfakefs.fake_filesystem_unittest import Patcher, UnloadMode
 
 
 class TestPyfakefsUnittestBase(fake_filesystem_unittest.TestCase):
@@ -68,5 +74,101 @@ class DynamicImportPatchTest(TestPyfakefsUnittestBase):
         self.assertEqual("test", file_object.contents)
 
 
+class UnloadModulesTest(unittest.TestCase):
+    """Tests which modules loaded during a test are unloaded afterwards."""
+
+    module_sources = {
+        "unload_test_os": "import os\n",
+        "unload_test_stat": "from os import stat\n",
+        "unload_test_ref": "import unload_test_os\n",
+        "unload_test_plain": "import json\n\nVALUE = json.dumps(42)\n",
+        "unload_test_pkg": "import os\n",
+        "unload_test_pkg.plain": "VALUE = 42\n",
+        "unload_test_log": 'LOG = open("/fake_log", "w")\n',
+        "unload_test_nested": 'LOGS = {"fake": open("/fake_nested_log", "w")}\n',
+        "unload_test_class": (
+            "class Logger:\n    stream = open('/fake_class_log', 'w')\n"
+        ),
+    }
+    packages = {"unload_test_pkg"}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.module_dir = tempfile.mkdtemp()
+        for name, source in cls.module_sources.items():
+            path = os.path.join(cls.module_dir, *name.split("."))
+            if name in cls.packages:
+                os.mkdir(path)
+                path = os.path.join(path, "__init__")
+            with open(path + ".py", "w", encoding="utf8") as f:
+                f.write(source)
+        sys.path.insert(0, cls.module_dir)
+        importlib.invalidate_caches()
+
+    @classmethod
+    def tearDownClass(cls):
+        sys.path.remove(cls.module_dir)
+        shutil.rmtree(cls.module_dir)
+
+    def setUp(self):
+        self.addCleanup(self.remove_modules)
+
+    def remove_modules(self):
+        for name in self.module_sources:
+            sys.modules.pop(name, None)
+
+    def modules_kept_after_test(self, unload_modules):
+        with Patcher(unload_modules=unload_modules):
+            for name in self.module_sources:
+                importlib.import_module(name)
+        return {name for name in self.module_sources if name in sys.modules}
+
+    def test_unload_all_modules(self):
+        self.assertEqual(set(), self.modules_kept_after_test(UnloadMode.ON))
+
+    def test_keep_all_modules(self):
+        self.assertEqual(
+            set(self.module_sources), self.modules_kept_after_test(UnloadMode.OFF)
+        )
+
+    def test_unload_modules_referencing_fakes(self):
+        self.assertEqual(
+            {"unload_test_plain"}, self.modules_kept_after_test(UnloadMode.AUTO)
+        )
+
+    def test_kept_module_is_not_loaded_again(self):
+        with Patcher(unload_modules=UnloadMode.AUTO):
+            import unload_test_plain
+        with Patcher(unload_modules=UnloadMode.AUTO):
+            import unload_test_plain as module
+
+            self.assertIs(unload_test_plain, module)
+
+    def test_cleanup_handler_only_called_for_unloaded_modules(self):
+        handled = []
+
+        def handler(name):
+            handled.append(name)
+            return False
+
+        with Patcher(unload_modules=UnloadMode.AUTO) as patcher:
+            for name in self.module_sources:
+                patcher.register_cleanup_handler(name, handler)
+                importlib.import_module(name)
+        self.assertEqual(
+            [
+                "unload_test_class",
+                "unload_test_log",
+                "unload_test_nested",
+                "unload_test_os",
+                "unload_test_pkg",
+                "unload_test_pkg.plain",
+                "unload_test_ref",
+                "unload_test_stat",
+            ],
+            sorted(handled),
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
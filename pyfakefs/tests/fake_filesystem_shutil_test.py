@@ -340,6 +340,124 @@ class FakeShutilModuleTest(RealFsTestCase):
         with self.assertRaises(OSError):
             shutil.copytree(src_file, dst_directory)
 
+    def test_copytree_with_ignore(self):
+        src_directory = self.make_path("xyzzy")
+        dst_directory = self.make_path("xyzzy_copy")
+        self.create_file(os.path.join(src_directory, "foo.py"))
+        self.create_file(os.path.join(src_directory, "foo.pyc"))
+        self.create_file(os.path.join(src_directory, "subdir", "bar.pyc"))
+        self.create_dir(os.path.join(src_directory, "__pycache__"))
+        shutil.copytree(
+            src_directory,
+            dst_directory,
+            ignore=shutil.ignore_patterns("*.pyc", "__pycache__"),
+        )
+        self.assertEqual(["foo.py", "subdir"], sorted(os.listdir(dst_directory)))
+        self.assertEqual([], os.listdir(os.path.join(dst_directory, "subdir")))
+
+    def test_copytree_dirs_exist_ok(self):
+        src_directory = self.make_path("xyzzy")
+        dst_directory = self.make_path("xyzzy_copy")
+        self.create_file(os.path.join(src_directory, "subdir", "foo"), contents="a")
+        self.create_file(os.path.join(dst_directory, "subdir", "foo"), contents="b")
+        self.create_file(os.path.join(dst_directory, "bar"))
+        with self.assertRaises(FileExistsError):
+            shutil.copytree(src_directory, dst_directory)
+        shutil.copytree(src_directory, dst_directory, dirs_exist_ok=True)
+        self.assertEqual(["bar", "subdir"], sorted(os.listdir(dst_directory)))
+        with open(os.path.join(dst_directory, "subdir", "foo")) as f:
+            self.assertEqual("a", f.read())
+
+    def test_copytree_preserves_stat(self):
+        self.check_posix_only()
+        src_directory = self.make_path("xyzzy")
+        dst_directory = self.make_path("xyzzy_copy")
+        src_file = os.path.join(src_directory, "subdir", "foo")
+        dst_file = os.path.join(dst_directory, "subdir", "foo")
+        self.create_file(src_file, contents="test")
+        os.chmod(src_file, 0o640)
+        os.chmod(os.path.dirname(src_file), 0o750)
+        os.utime(src_file, (1000, 2000))
+        shutil.copytree(src_directory, dst_directory)
+        dst_stat = os.stat(dst_file)
+        self.assertEqual(0o640, dst_stat.st_mode & 0o777)
+        self.assertEqual(2000, dst_stat.st_mtime)
+        self.assertEqual(0o750, os.stat(os.path.dirname(dst_file)).st_mode & 0o777)
+
+        shutil.copytree(
+            src_directory, dst_directory, dirs_exist_ok=True, copy_function=shutil.copy
+        )
+        self.assertNotEqual(2000, os.stat(dst_file).st_mtime)
+
+    def test_copytree_with_symlinks(self):
+        skip_if_symlink_not_supported()
+        src_directory = self.make_path("xyzzy")
+        src_file = os.path.join(src_directory, "foo")
+        self.create_file(src_file, contents="test")
+        self.create_symlink(os.path.join(src_directory, "link"), src_file)
+        self.create_symlink(
+            os.path.join(src_directory, "dangling"), self.make_path("bar")
+        )
+
+        dst_directory = self.make_path("xyzzy_copy")
+        shutil.copytree(src_directory, dst_directory, symlinks=True)
+        self.assertTrue(os.path.islink(os.path.join(dst_directory, "link")))
+        self.assertTrue(os.path.islink(os.path.join(dst_directory, "dangling")))
+
+        dst_directory = self.make_path("xyzzy_copy2")
+        shutil.copytree(src_directory, dst_directory, ignore_dangling_symlinks=True)
+        self.assertEqual(["foo", "link"], sorted(os.listdir(dst_directory)))
+        self.assertFalse(os.path.islink(os.path.join(dst_directory, "link")))
+
+        dst_directory = self.make_path("xyzzy_copy3")
+        with self.assertRaises(shutil.Error) as cm:
+            shutil.copytree(src_directory, dst_directory)
+        errors = cm.exception.args[0]
+        dangling_path = os.path.join(src_directory, "dangling")
+        self.assertEqual([dangling_path], [error[0] for error in errors])
+
+    def test_copytree_with_custom_copy_function(self):
+        src_directory = self.make_path("xyzzy")
+        dst_directory = self.make_path("xyzzy_copy")
+        self.create_file(os.path.join(src_directory, "foo"))
+        self.create_file(os.path.join(src_directory, "subdir", "bar"))
+        copied = []
+
+        def copy_function(src, dst):
+            copied.append(os.path.basename(src))
+            return shutil.copyfile(src, dst)
+
+        shutil.copytree(src_directory, dst_directory, copy_function=copy_function)
+        self.assertEqual(["bar", "foo"], sorted(copied))
+        self.assertTrue(os.path.exists(os.path.join(dst_directory, "subdir", "bar")))
+
+    def test_rmtree_with_error_handler(self):
+        self.check_posix_only()
+        self.skip_root()
+        directory = self.make_path("xyzzy")
+        sub_directory = os.path.join(directory, "subdir")
+        self.create_file(os.path.join(directory, "foo"))
+        self.create_file(os.path.join(sub_directory, "bar"))
+        os.chmod(sub_directory, 0o555)
+        errors = []
+
+        def error_handler(func, path, _error_info):
+            errors.append((func.__name__, path))
+
+        try:
+            shutil.rmtree(directory, onerror=error_handler)
+        finally:
+            os.chmod(sub_directory, 0o755)
+        self.assertEqual(
+            [
+                ("unlink", os.path.join(sub_directory, "bar")),
+                ("rmdir", sub_directory),
+                ("rmdir", directory),
+            ],
+            errors,
+        )
+        self.assertEqual(["subdir"], os.listdir(directory))
+
     def test_move_file_in_same_filesystem(self):
         self.skip_real_fs()
         src_file = "/original_xyzzy"
@@ -574,6 +692,43 @@ class FakeCopyFileTest(RealFsTestCase):
         with self.assertRaises(OSError):
             shutil.copyfile(src_file, dst_dir)
 
+    def test_copy_shares_contents(self):
+        self.skip_real_fs()
+        src_file = self.make_path("xyzzy")
+        dst_file = self.make_path("xyzzy_copy")
+        self.create_file(src_file, contents=b"contents of file")
+        shutil.copyfile(src_file, dst_file)
+        self.assertIs(
+            self.filesystem.get_object(src_file).byte_contents,
+            self.filesystem.get_object(dst_file).byte_contents,
+        )
+        self.assertEqual(32, self.filesystem.get_disk_usage(src_file).used)
+
+    def test_changing_copy_does_not_change_source(self):
+        src_file = self.make_path("xyzzy")
+        dst_file = self.make_path("xyzzy_copy")
+        self.create_file(src_file, contents=b"contents of file")
+        shutil.copy2(src_file, dst_file)
+        with self.open(dst_file, "r+b") as f:
+            f.write(b"CONTENTS")
+        with self.open(src_file, "ab") as f:
+            f.write(b"!")
+        self.check_contents(src_file, b"contents of file!")
+        self.check_contents(dst_file, b"CONTENTS of file")
+
+    def test_copyfileobj_from_current_position(self):
+        src_file = self.make_path("xyzzy")
+        dst_file = self.make_path("xyzzy_copy")
+        self.create_file(src_file, contents=b"contents of file")
+        with self.open(src_file, "rb") as fsrc:
+            fsrc.seek(9)
+            with self.open(dst_file, "wb") as fdst:
+                fdst.write(b"copy ")
+                shutil.copyfileobj(fsrc, fdst)
+                self.assertEqual(12, fdst.tell())
+            self.assertEqual(b"", fsrc.read())
+        self.check_contents(dst_file, b"copy of file")
+
     def test_moving_dir_into_dir(self):
         # regression test for #515
         source_dir = tempfile.mkdtemp()
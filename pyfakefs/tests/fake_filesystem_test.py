@@ -38,6 +38,7 @@ from pyfakefs.fake_filesystem import (
     reset_ids,
     OSType,
 )
+from pyfakefs.fake_file import FrozenTree
 from pyfakefs.helpers import IS_WIN
 from pyfakefs.tests.test_utils import (
     TestCase,
@@ -226,6 +227,96 @@ class SetLargeFileSizeTest(TestCase):
         self.assertEqual(1000000000, self.fake_file.st_size)
 
 
+class FileDescriptorTableTest(TestCase):
+    def setUp(self):
+        self.table = fake_filesystem.FileDescriptorTable()
+        self.filesystem = fake_filesystem.FakeFilesystem()
+        self.file_obj = self.filesystem.dev_null
+
+    def test_add_uses_lowest_free_fd(self):
+        for fd in range(5):
+            self.assertEqual(fd, self.table.add(self.file_obj))
+        self.table.remove(3)
+        self.table.remove(1)
+        self.assertEqual([0, 2, 4], self.table.fds())
+        self.assertIsNone(self.table[1])
+        self.assertEqual(1, self.table.add(self.file_obj))
+        self.assertEqual(3, self.table.add(self.file_obj))
+        self.assertEqual(5, self.table.add(self.file_obj))
+
+    def test_add_with_fd(self):
+        self.assertEqual(1000, self.table.add(self.file_obj, 1000))
+        self.assertEqual(1001, len(self.table))
+        self.assertEqual(0, self.table.add(self.file_obj))
+        self.assertEqual(2, self.table.add(self.file_obj, 2))
+        self.assertEqual(1, self.table.add(self.file_obj))
+        self.assertEqual(3, self.table.add(self.file_obj))
+        self.table.remove(1000)
+        self.table.remove(1)
+        self.table.remove(1)
+        self.assertEqual(1, self.table.add(self.file_obj, 1))
+        self.assertEqual(4, self.table.add(self.file_obj))
+        self.assertEqual([0, 1, 2, 3, 4], self.table.fds())
+
+    def test_behaves_like_list_of_open_files(self):
+        for _ in range(4):
+            self.table.add(self.file_obj)
+        self.table.remove(1)
+        self.table.remove(3)
+        self.assertEqual(4, len(self.table))
+        files = [self.file_obj]
+        self.assertEqual([files, None, files, None], list(self.table))
+        self.assertEqual([files, None], self.table[2:])
+        self.assertEqual([None, None], self.table[1::2])
+        self.assertIsNone(self.table[-1])
+        self.assertEqual(files, self.table[-2])
+
+    def test_create_from_list(self):
+        files = [self.file_obj]
+        table = fake_filesystem.FileDescriptorTable([files, None, [], files])
+        self.assertEqual([0, 3], table.fds())
+        self.assertEqual(4, len(table))
+        self.assertEqual(1, table.add(self.file_obj))
+        self.assertEqual(2, table.add(self.file_obj))
+        self.assertEqual(4, table.add(self.file_obj))
+
+    def test_assign_list_to_open_files(self):
+        self.filesystem.open_files = []
+        self.assertEqual(0, len(self.filesystem.open_files))
+        self.filesystem.create_file("/foo")
+        os_module = fake_os.FakeOsModule(self.filesystem)
+        self.assertEqual(0, os_module.open("/foo", os.O_RDONLY))
+
+    def test_skips_fds_set_above_free_fds(self):
+        self.table.add(self.file_obj, 1)
+        self.table.add(self.file_obj, 2)
+        self.assertEqual(0, self.table.add(self.file_obj))
+        self.assertEqual(3, self.table.add(self.file_obj))
+
+    def test_open_file_descriptors(self):
+        self.assertEqual([0, 1, 2], self.filesystem.open_file_descriptors())
+        file_obj = self.filesystem.create_file("/foo")
+        os_module = fake_os.FakeOsModule(self.filesystem)
+        fd = os_module.open("/foo", os.O_RDONLY)
+        os_module.dup2(fd, 10)
+        self.assertEqual([0, 1, 2, 3, 10], self.filesystem.open_file_descriptors())
+        self.assertTrue(self.filesystem.has_open_file(file_obj))
+        os_module.close(10)
+        os_module.close(fd)
+        self.assertEqual([0, 1, 2], self.filesystem.open_file_descriptors())
+        self.assertFalse(self.filesystem.has_open_file(file_obj))
+
+    def test_closed_pipe_file_descriptors_are_freed(self):
+        os_module = fake_os.FakeOsModule(self.filesystem)
+        read_fd, write_fd = os_module.pipe()
+        dup_fd = os_module.dup(write_fd)
+        self.assertEqual([0, 1, 2, 3, 4, 5], self.filesystem.open_file_descriptors())
+        os_module.close(write_fd)
+        os_module.close(dup_fd)
+        os_module.close(read_fd)
+        self.assertEqual([0, 1, 2], self.filesystem.open_file_descriptors())
+
+
 class NormalizePathTest(TestCase):
     def setUp(self):
         self.filesystem = fake_filesystem.FakeFilesystem(path_separator="/")
@@ -638,6 +729,28 @@ class FakeFilesystemUnitTest(TestCase):
         with fake_open(path, encoding="utf8") as f:
             self.assertEqual("", f.read())
 
+    def test_view_contents(self):
+        file_object = self.filesystem.create_file("foo", contents=b"abcdef")
+        with file_object.view() as view:
+            self.assertTrue(view.readonly)
+            self.assertEqual(b"cd", view[2:4])
+        with self.filesystem.create_file("bar").view() as view:
+            self.assertEqual(b"", view)
+
+    def test_view_is_not_changed_by_writing(self):
+        fake_open = fake_filesystem.FakeFileOpen(self.filesystem)
+        file_object = self.filesystem.create_file("foo", contents=b"abc")
+        with fake_open("foo", "r+b") as f:
+            f.write(b"X")
+            f.flush()
+            with file_object.view() as view:
+                f.write(b"Y")
+                f.flush()
+                f.write(b"Z" * 100)
+                f.flush()
+                self.assertEqual(b"Xbc", view)
+        self.assertEqual(b"XY" + b"Z" * 100, file_object.byte_contents)
+
     def test_create_file_with_incorrect_mode_type(self):
         with self.assertRaises(TypeError):
             self.filesystem.create_file("foo", "bar")
@@ -2136,6 +2249,37 @@ class MountPointTest(TestCase):
         self.assertEqual(5, self.filesystem.get_object("!!foo!bar!bip!bop").st_dev)
 
 
+@unittest.skipIf(sys.platform == "win32", "POSIX only test")
+class TempDirCreationTest(TestCase):
+    def test_default_temp_dir(self):
+        with patch.dict(os.environ, {"TMPDIR": "", "TEMP": "", "TMP": ""}):
+            filesystem = fake_filesystem.FakeFilesystem(create_temp_dir=True)
+        self.assertTrue(filesystem.isdir("/tmp"))
+        self.assertFalse(filesystem.islink("/tmp"))
+        self.assertEqual(["tmp"], filesystem.listdir("/"))
+
+    def test_temp_dir_from_environment(self):
+        with patch.dict(os.environ, {"TMPDIR": "/foo/temp"}):
+            filesystem = fake_filesystem.FakeFilesystem(create_temp_dir=True)
+        self.assertTrue(filesystem.isdir("/foo/temp"))
+        self.assertTrue(filesystem.islink("/tmp"))
+        self.assertEqual("/foo/temp", filesystem.readlink("/tmp"))
+        self.assertEqual(0, filesystem.get_disk_usage().used)
+
+    def test_temp_dir_below_tmp(self):
+        with patch.dict(os.environ, {"TMPDIR": "/tmp/foo"}):
+            filesystem = fake_filesystem.FakeFilesystem(create_temp_dir=True)
+        self.assertTrue(filesystem.isdir("/tmp/foo"))
+        self.assertFalse(filesystem.islink("/tmp"))
+
+    def test_reset_recreates_temp_dir(self):
+        with patch.dict(os.environ, {"TMPDIR": "", "TEMP": "", "TMP": ""}):
+            filesystem = fake_filesystem.FakeFilesystem(create_temp_dir=True)
+            filesystem.create_file("/tmp/foo")
+            filesystem.reset()
+        self.assertEqual([], filesystem.listdir("/tmp"))
+
+
 class ConvenienceMethodTest(RealFsTestCase):
     def test_create_link_with_non_existent_parent(self):
         skip_if_symlink_not_supported()
@@ -2712,6 +2856,144 @@ class RealFileSystemAccessTest(RealFsTestCase):
         assert self.filesystem.exists(pytest_dist_path)
         assert self.filesystem.exists(pytest_dist_path / "METADATA")
 
+    @unittest.skipIf(pytest is None, "pytest is not installed")
+    def test_add_package_metadata_is_cached(self):
+        fake_filesystem.FakeFilesystem.PACKAGE_METADATA_CACHE.pop("pytest", None)
+        self.filesystem.add_package_metadata("pytest")
+        self.assertIn("pytest", fake_filesystem.FakeFilesystem.PACKAGE_METADATA_CACHE)
+        filesystem = fake_filesystem.FakeFilesystem()
+        with patch("importlib.metadata.distribution") as distribution:
+            filesystem.add_package_metadata("pytest")
+        distribution.assert_not_called()
+        parent_path = pathlib.Path(pytest.__file__).parent.parent
+        pytest_dist_path = parent_path / f"pytest-{pytest.__version__}.dist-info"
+        assert filesystem.exists(pytest_dist_path / "METADATA")
+
+    @unittest.skipIf(pytest is None, "pytest is not installed")
+    def test_add_packages_metadata(self):
+        self.filesystem.add_packages_metadata(["pytest", "pluggy"])
+        parent_path = pathlib.Path(pytest.__file__).parent.parent
+        assert self.filesystem.exists(
+            parent_path / f"pytest-{pytest.__version__}.dist-info" / "METADATA"
+        )
+        assert any(
+            path.startswith("pluggy-") for path in self.filesystem.listdir(parent_path)
+        )
+
+    def test_overlay_reads_real_directory_once(self):
+        filesystem = fake_filesystem.FakeFilesystem(use_overlay=True)
+        with self.create_real_paths() as root_dir:
+            foo_path = os.path.join(root_dir, "foo")
+            self.assertTrue(filesystem.isdir(foo_path))
+            self.assertFalse(filesystem.exists(os.path.join(foo_path, "new.txt")))
+            with open(os.path.join(foo_path, "new.txt"), "w", encoding="utf8"):
+                pass
+            # the directory listing is cached, including missing entries
+            self.assertFalse(filesystem.exists(os.path.join(foo_path, "new.txt")))
+            filesystem.remove(os.path.join(foo_path, "test.txt"))
+            self.assertFalse(filesystem.exists(os.path.join(foo_path, "test.txt")))
+            self.assertTrue(os.path.exists(os.path.join(foo_path, "test.txt")))
+
+    def test_overlay_is_ignored_for_emulated_os(self):
+        filesystem = fake_filesystem.FakeFilesystem(use_overlay=True)
+        filesystem.os = OSType.WINDOWS if not IS_WIN else OSType.LINUX
+        self.assertFalse(filesystem.exists(os.path.abspath(__file__)))
+
+    def test_add_frozen_tree_to_several_filesystems(self):
+        with self.create_real_paths() as root_dir:
+            frozen_tree = FrozenTree(root_dir)
+            filesystems = [fake_filesystem.FakeFilesystem() for _ in range(2)]
+            for filesystem in filesystems:
+                filesystem.add_frozen_tree(frozen_tree, "/frozen")
+                file_path = os.path.join("/frozen", "foo", "sub", "sub.txt")
+                self.assertEqual("sub", filesystem.get_object(file_path).contents)
+                self.assertEqual(["bar", "foo"], sorted(filesystem.listdir("/frozen")))
+        # entries already read are cached in the frozen tree
+        self.assertFalse(os.path.exists(root_dir))
+        filesystem = fake_filesystem.FakeFilesystem()
+        filesystem.add_frozen_tree(frozen_tree, "/other")
+        fake_open = fake_filesystem.FakeFileOpen(filesystem)
+        with fake_open(os.path.join("/other", "foo", "sub", "sub.txt")) as f:
+            self.assertEqual("sub", f.read())
+
+    def test_add_frozen_tree_uses_source_path_as_default_target(self):
+        with self.create_real_paths() as root_dir:
+            self.filesystem.add_frozen_tree(FrozenTree(root_dir))
+            self.assertTrue(
+                self.filesystem.isfile(os.path.join(root_dir, "foo", "test.txt"))
+            )
+
+    def test_add_frozen_tree_to_existing_path_raises(self):
+        self.filesystem.create_dir("/frozen")
+        with self.create_real_paths() as root_dir:
+            with self.raises_os_error(errno.EEXIST):
+                self.filesystem.add_frozen_tree(FrozenTree(root_dir), "/frozen")
+
+    def test_frozen_tree_is_read_only(self):
+        os_module = fake_os.FakeOsModule(self.filesystem)
+        file_path = os.path.join("/frozen", "foo", "test.txt")
+        with self.create_real_paths() as root_dir:
+            self.filesystem.add_frozen_tree(FrozenTree(root_dir), "/frozen")
+            with self.raises_os_error(errno.EROFS):
+                self.fake_open(file_path, "w")
+            with self.raises_os_error(errno.EROFS):
+                self.fake_open(os.path.join("/frozen", "foo", "new.txt"), "w")
+            with self.raises_os_error(errno.EROFS):
+                os_module.remove(file_path)
+            with self.raises_os_error(errno.EROFS):
+                os_module.mkdir(os.path.join("/frozen", "bar", "baz"))
+            with self.raises_os_error(errno.EROFS):
+                os_module.rename(file_path, "/test.txt")
+            self.assertEqual("test", self.filesystem.get_object(file_path).contents)
+        self.assertEqual(0, self.filesystem.get_disk_usage().used)
+
+    def test_frozen_tree_metadata_is_read_only(self):
+        os_module = fake_os.FakeOsModule(self.filesystem)
+        with self.create_real_paths() as root_dir:
+            self.filesystem.add_frozen_tree(FrozenTree(root_dir), "/frozen")
+            for path in (
+                os.path.join("/frozen", "foo", "test.txt"),
+                os.path.join("/frozen", "foo"),
+            ):
+                st_mode = self.filesystem.stat(path).st_mode
+                with self.raises_os_error(errno.EROFS):
+                    os_module.chmod(path, 0o777)
+                with self.raises_os_error(errno.EROFS):
+                    os_module.utime(path, (1, 2))
+                with self.raises_os_error(errno.EROFS):
+                    os_module.chown(path, 42, 42)
+                self.assertEqual(st_mode, self.filesystem.stat(path).st_mode)
+
+    def test_frozen_tree_symlink_metadata_is_read_only(self):
+        skip_if_symlink_not_supported()
+        os_module = fake_os.FakeOsModule(self.filesystem)
+        with self.create_real_paths() as root_dir:
+            os.symlink(os.path.join("foo", "test.txt"), os.path.join(root_dir, "link"))
+            self.filesystem.add_frozen_tree(FrozenTree(root_dir), "/frozen")
+            link_path = os.path.join("/frozen", "link")
+            with self.raises_os_error(errno.EROFS):
+                self.filesystem.chmod(link_path, 0o777, follow_symlinks=False)
+            if not self.filesystem.is_windows_fs:
+                with self.raises_os_error(errno.EROFS):
+                    os_module.lchmod(link_path, 0o777)
+            with self.raises_os_error(errno.EROFS):
+                os_module.utime(link_path, (1, 2), follow_symlinks=False)
+            with self.raises_os_error(errno.EROFS):
+                os_module.chown(link_path, 42, 42, follow_symlinks=False)
+
+    def test_frozen_tree_contains_symlinks(self):
+        skip_if_symlink_not_supported()
+        with self.create_real_paths() as root_dir:
+            os.symlink(os.path.join("foo", "test.txt"), os.path.join(root_dir, "link"))
+            self.filesystem.add_frozen_tree(FrozenTree(root_dir), "/frozen")
+            link_path = os.path.join("/frozen", "link")
+            self.assertTrue(self.filesystem.islink(link_path))
+            self.assertEqual(
+                os.path.join("foo", "test.txt"), self.filesystem.readlink(link_path)
+            )
+            with self.fake_open(link_path) as f:
+                self.assertEqual("test", f.read())
+
 
 class FileSideEffectTests(TestCase):
     def side_effect(self):
@@ -21,6 +21,7 @@ Test the :py:class`pyfakefs.fake_filesystem_unittest.TestCase` base class.
 import glob
 import importlib.util
 import io
+import json
 import multiprocessing
 import os
 import pathlib
@@ -37,15 +38,16 @@ from unittest import TestCase, mock
 
 import pyfakefs.tests.import_as_example
 import pyfakefs.tests.logsio
-from pyfakefs import fake_filesystem_unittest, fake_filesystem
+from pyfakefs import fake_filesystem_unittest, fake_filesystem, fake_os
 from pyfakefs.fake_filesystem import OSType
 from pyfakefs.fake_filesystem_unittest import (
+    ModuleIndexCache,
     Patcher,
     Pause,
     patchfs,
     PatchMode,
 )
-from pyfakefs.helpers import IS_PYPY
+from pyfakefs.helpers import IS_PYPY, is_called_from_skipped_module
 from pyfakefs.tests.fixtures import module_with_attributes
 
 if sys.version_info < (3, 12):
@@ -92,6 +94,127 @@ class TestPatcher(TestCase):
                     pass
 
 
+class TestModuleIndexer(TestCase):
+    def setUp(self):
+        self.module_dir = tempfile.mkdtemp()
+        sys.path.insert(0, self.module_dir)
+        for name, contents in (
+            ("indexed_module", "import os as _os\nfrom os.path import exists\n"),
+            ("other_indexed_module", ""),
+        ):
+            with open(
+                os.path.join(self.module_dir, name + ".py"), "w", encoding="utf8"
+            ) as f:
+                f.write(contents)
+        importlib.invalidate_caches()
+
+    def tearDown(self):
+        sys.path.remove(self.module_dir)
+        sys.modules.pop("indexed_module", None)
+        sys.modules.pop("other_indexed_module", None)
+        shutil.rmtree(self.module_dir)
+        Patcher.MODULE_INDEX_CACHE = None
+        Patcher.clear_fs_cache()
+
+    def test_module_is_indexed_on_next_import(self):
+        with Patcher():
+            pass
+        self.assertIn(Patcher.MODULE_INDEXER, sys.meta_path)
+        module = importlib.import_module("indexed_module")
+        importlib.import_module("other_indexed_module")
+        self.assertIn(module, Patcher.CACHED_MODULES)
+        with Patcher() as patcher:
+            patcher.fs.create_file("/foo/bar")
+            self.assertTrue(module.exists("/foo/bar"))
+            self.assertTrue(module._os.path.exists("/foo/bar"))
+        self.assertFalse(module.exists("/foo/bar"))
+
+    def index_with_cache(self):
+        cache_path = os.path.join(self.module_dir, "index.json")
+        Patcher.MODULE_INDEX_CACHE = ModuleIndexCache(cache_path)
+        Patcher.MODULE_INDEX_CACHE.load()
+        Patcher.clear_fs_cache()
+        with Patcher():
+            pass
+        Patcher.MODULE_INDEX_CACHE.save()
+        with open(cache_path, encoding="utf8") as f:
+            return json.load(f)["configs"]
+
+    def test_module_index_is_saved(self):
+        module = importlib.import_module("indexed_module")
+        configs = self.index_with_cache()
+        self.assertEqual(1, len(configs))
+        entries = list(configs.values())[0]
+        entry = entries[f"indexed_module:{module.__file__}"]
+        self.assertEqual([["_os", "os"]], entry["modules"])
+        self.assertEqual([["exists", "exists"]], entry["functions"])
+
+    def test_module_index_is_loaded(self):
+        module = importlib.import_module("indexed_module")
+        configs = self.index_with_cache()
+        # remove the function from the entry to check that the entry is used
+        entries = list(configs.values())[0]
+        entries[f"indexed_module:{module.__file__}"]["functions"] = []
+        index_path = os.path.join(self.module_dir, "index.json")
+        with open(index_path, "w", encoding="utf8") as f:
+            json.dump({"version": ModuleIndexCache.VERSION, "configs": configs}, f)
+        self.index_with_cache()
+        with Patcher() as patcher:
+            patcher.fs.create_file("/foo/bar")
+            self.assertTrue(module._os.path.exists("/foo/bar"))
+            self.assertFalse(module.exists("/foo/bar"))
+
+    def test_changed_module_is_indexed_again(self):
+        importlib.import_module("indexed_module")
+        self.index_with_cache()
+        with open(
+            os.path.join(self.module_dir, "indexed_module.py"), "w", encoding="utf8"
+        ) as f:
+            f.write("from os.path import isfile\n")
+        module = importlib.reload(importlib.import_module("indexed_module"))
+        self.index_with_cache()
+        with Patcher() as patcher:
+            patcher.fs.create_file("/foo/bar")
+            self.assertTrue(module.isfile("/foo/bar"))
+
+    def test_invalid_cache_entry_is_ignored(self):
+        module = importlib.import_module("indexed_module")
+        self.index_with_cache()
+        # the module has been changed without changing the file
+        del module._os
+        module._path = os.path
+        self.index_with_cache()
+        with Patcher() as patcher:
+            patcher.fs.create_file("/foo/bar")
+            self.assertTrue(module._path.exists("/foo/bar"))
+
+    def test_cache_entry_with_changed_names_is_ignored(self):
+        module = importlib.import_module("indexed_module")
+        self.index_with_cache()
+        # an additional name is bound, e.g. by a conditional import,
+        # while the recorded attributes are unchanged
+        module._path = os.path
+        self.index_with_cache()
+        with Patcher() as patcher:
+            patcher.fs.create_file("/foo/bar")
+            self.assertTrue(module._path.exists("/foo/bar"))
+
+    def test_unused_cache_entries_are_removed(self):
+        module = importlib.import_module("indexed_module")
+        configs = self.index_with_cache()
+        entries = list(configs.values())[0]
+        entries["removed_module:/foo/removed_module.py"] = {"file": []}
+        configs["unused_config"] = {"other_module:/foo/other.py": {"file": []}}
+        index_path = os.path.join(self.module_dir, "index.json")
+        with open(index_path, "w", encoding="utf8") as f:
+            json.dump({"version": ModuleIndexCache.VERSION, "configs": configs}, f)
+        configs = self.index_with_cache()
+        self.assertEqual(1, len(configs))
+        entries = list(configs.values())[0]
+        self.assertIn(f"indexed_module:{module.__file__}", entries)
+        self.assertNotIn("removed_module:/foo/removed_module.py", entries)
+
+
 class TestPatchfsArgumentOrder(TestCase):
     @patchfs
     @mock.patch("os.system")
@@ -284,6 +407,20 @@ class TestPatchingDefaultArgs(fake_filesystem_unittest.TestCase):
         sut = pyfakefs.tests.import_as_example.TestDefaultArg()
         self.assertTrue(sut.check_if_exists(file_path))
 
+    def test_path_isfile_as_default_arg_in_static_method(self):
+        file_path = "/foo/bar"
+        self.fs.create_file(file_path)
+        sut = pyfakefs.tests.import_as_example.TestDefaultArg
+        self.assertTrue(sut.check_if_isfile(file_path))
+
+    def test_path_exists_as_default_arg_in_inherited_method(self):
+        class DerivedDefaultArg(pyfakefs.tests.import_as_example.TestDefaultArg):
+            pass
+
+        file_path = "/foo/bar"
+        self.fs.create_dir(file_path)
+        self.assertTrue(DerivedDefaultArg().check_if_exists(file_path))
+
     def test_fake_path_exists4(self):
         self.fs.create_file("foo")
         self.assertTrue(pyfakefs.tests.import_as_example.check_if_exists4("foo"))
@@ -301,6 +438,7 @@ class TestAttributesWithFakeModuleNames(TestPyfakefsUnittestBase):
         self.assertEqual(module_with_attributes.pathlib, "pathlib attribute value")
         self.assertEqual(module_with_attributes.shutil, "shutil attribute value")
         self.assertEqual(module_with_attributes.io, "io attribute value")
+        self.assertEqual(module_with_attributes.mmap, "mmap attribute value")
 
 
 import math as path  # noqa: E402 wanted import not at top
@@ -476,6 +614,100 @@ class AdditionalSkipNamesModuleTest(fake_filesystem_unittest.TestCase):
         pyfakefs.tests.import_as_example.return_this_file_path()
 
 
+class PatchOnlyTest(fake_filesystem_unittest.TestCase):
+    """Make sure that only the modules in `patch_only` are patched."""
+
+    def setUp(self):
+        self.setUpPyfakefs(patch_only=["pyfakefs.tests.import_as_example"])
+
+    def test_listed_module_is_patched(self):
+        self.fs.create_file("foo")
+        self.assertTrue(pyfakefs.tests.import_as_example.check_if_exists1("foo"))
+        self.assertTrue(pyfakefs.tests.import_as_example.check_if_exists3("foo"))
+        self.assertTrue(pyfakefs.tests.import_as_example.check_if_exists7("foo"))
+
+    def test_other_modules_are_not_patched(self):
+        self.fs.create_file("/foo/bar")
+        self.assertFalse(os.path.exists("/foo/bar"))
+        self.assertTrue(os.path.exists(__file__))
+
+    def test_pathlib_is_not_patched_in_other_modules(self):
+        self.fs.create_file("/foo/bar")
+        real_file = pathlib.Path(__file__)
+        self.assertTrue(os.path.exists(real_file))
+        self.assertTrue(real_file.exists())
+        self.assertTrue(real_file.is_file())
+        self.assertFalse(os.path.exists("/foo/bar"))
+        self.assertFalse(pathlib.Path("/foo/bar").exists())
+        self.assertTrue(pyfakefs.tests.import_as_example.check_if_exists3("/foo/bar"))
+        self.assertFalse(pyfakefs.tests.import_as_example.check_if_exists3(real_file))
+
+    def test_builtin_open_is_patched(self):
+        self.fs.create_file("/foo/bar", contents="test")
+        with open("/foo/bar", encoding="utf8") as f:
+            self.assertEqual("test", f.read())
+
+    def test_modules_can_be_passed(self):
+        self.patcher.tearDown()
+        with Patcher(patch_only=[pyfakefs.tests.import_as_example]) as patcher:
+            patcher.fs.create_file("foo")
+            self.assertTrue(pyfakefs.tests.import_as_example.check_if_exists2("foo"))
+            self.assertFalse(os.path.exists("foo"))
+        self.patcher.setUp()
+
+
+class PatchPlanTest(TestCase):
+    """Tests the reuse of the compiled patch plan."""
+
+    def test_patch_plan_is_reused(self):
+        with Patcher():
+            pass
+        plan = Patcher.PATCH_PLAN
+        with Patcher():
+            self.assertIs(plan, Patcher.PATCH_PLAN)
+
+    def test_patch_plan_is_recompiled_after_clearing_cache(self):
+        with Patcher():
+            pass
+        plan = Patcher.PATCH_PLAN
+        Patcher.clear_fs_cache()
+        with Patcher():
+            self.assertIsNot(plan, Patcher.PATCH_PLAN)
+
+    def test_module_attributes_are_restored(self):
+        real_os = sys.modules["os"]
+        with Patcher():
+            self.assertIsNot(real_os, pyfakefs.tests.import_as_example.my_os)
+        self.assertIs(real_os, pyfakefs.tests.import_as_example.my_os)
+
+    def test_fake_module_functions_are_reused(self):
+        functions = Patcher()._fake_module_functions
+        self.assertIs(functions, Patcher()._fake_module_functions)
+        patcher = Patcher(modules_to_patch={"foo": fake_os.FakeOsModule})
+        self.assertIsNot(functions, patcher._fake_module_functions)
+
+
+class SkippedModuleCheckTest(TestCase):
+    """Tests the check for calls from skipped modules without patching."""
+
+    def test_module_name_matches(self):
+        self.assertTrue(
+            is_called_from_skipped_module(["fake_filesystem_unittest_test"], True)
+        )
+        self.assertTrue(
+            is_called_from_skipped_module(
+                {"foo", "pyfakefs.tests.fake_filesystem_unittest_test"}, False
+            )
+        )
+
+    def test_module_name_does_not_match(self):
+        self.assertFalse(is_called_from_skipped_module([], True))
+        self.assertFalse(is_called_from_skipped_module(["unittest_test"], True))
+        self.assertFalse(
+            is_called_from_skipped_module(["pyfakefs.fake_filesystem_unittest"], True)
+        )
+
+
 class RuntimeSkipModuleTest(fake_filesystem_unittest.TestCase):
     """Emulates skipping a module using RUNTIME_SKIPMODULES.
     Not all functionality implemented for skip modules will work here."""
@@ -589,6 +821,40 @@ class NoRootUserTest(fake_filesystem_unittest.TestCase):
             open(file_path, "w", encoding="utf8")
 
 
+class OverlayTest(fake_filesystem_unittest.TestCase):
+    """Test use_overlay argument to setUpPyfakefs."""
+
+    def setUp(self):
+        self.real_path = os.path.abspath(__file__)
+        with open(self.real_path, "rb") as f:
+            self.real_contents = f.read()
+        self.setUpPyfakefs(use_overlay=True)
+
+    def test_real_files_are_visible(self):
+        self.assertTrue(os.path.isfile(self.real_path))
+        self.assertIn(
+            os.path.basename(self.real_path),
+            os.listdir(os.path.dirname(self.real_path)),
+        )
+        with open(self.real_path, "rb") as f:
+            self.assertEqual(self.real_contents, f.read())
+
+    def test_changes_are_done_in_fake_filesystem(self):
+        with open(self.real_path, "w", encoding="utf8") as f:
+            f.write("changed")
+        new_path = os.path.join(os.path.dirname(self.real_path), "new.txt")
+        os.rename(self.real_path, new_path)
+        self.assertFalse(os.path.exists(self.real_path))
+        with open(new_path, encoding="utf8") as f:
+            self.assertEqual("changed", f.read())
+        os.remove(new_path)
+        self.assertFalse(os.path.exists(new_path))
+        self.pause()
+        self.assertFalse(os.path.exists(new_path))
+        with open(self.real_path, "rb") as f:
+            self.assertEqual(self.real_contents, f.read())
+
+
 class PauseResumeTest(fake_filesystem_unittest.TestCase):
     def setUp(self):
         self.setUpPyfakefs()
@@ -711,6 +977,32 @@ class PauseResumePatcherTest(fake_filesystem_unittest.TestCase):
             self.assertTrue(os.path.exists(fake_temp_file.name))
             fake_temp_file.close()
 
+    def test_pause_keeps_modules_patched(self):
+        example = pyfakefs.tests.import_as_example
+        with Patcher() as p:
+            patched_os = example.my_os
+            with Pause(p):
+                self.assertIs(patched_os, example.my_os)
+                self.assertTrue(example.check_if_exists1(__file__))
+                self.assertTrue(example.check_if_exists3(__file__))
+                self.assertTrue(example.check_if_exists7(__file__))
+            self.assertFalse(example.check_if_exists1(__file__))
+
+    def test_pause_unpatches_modules_with_emulated_os(self):
+        real_os = sys.modules["os"]
+        with Patcher() as p:
+            p.fs.os = OSType.WINDOWS if sys.platform != "win32" else OSType.LINUX
+            with Pause(p):
+                self.assertIs(real_os, pyfakefs.tests.import_as_example.my_os)
+            self.assertIsNot(real_os, pyfakefs.tests.import_as_example.my_os)
+
+    def test_teardown_while_paused(self):
+        real_os = sys.modules["os"]
+        with Patcher() as p:
+            p.pause()
+        self.assertIs(real_os, pyfakefs.tests.import_as_example.my_os)
+        self.assertTrue(pyfakefs.tests.import_as_example.check_if_exists1(__file__))
+
 
 class TestPyfakefsTestCase(unittest.TestCase):
     def setUp(self):
@@ -0,0 +1,284 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for fake_mmap.FakeMmapModule."""
+
+import errno
+import mmap
+import struct
+import sys
+import unittest
+
+from pyfakefs.fake_filesystem_unittest import Patcher
+from pyfakefs.fake_mmap import FakeMmap, FakeMmapModule
+from pyfakefs.tests.test_utils import RealFsTestCase
+
+
+class FakeMmapModuleTest(RealFsTestCase):
+    def setUp(self):
+        super().setUp()
+        if self.use_real_fs():
+            self.mmap = mmap
+        else:
+            self.mmap = FakeMmapModule(self.filesystem)
+        self.file_path = self.make_path("foo.bin")
+        self.create_file(self.file_path, contents=b"hello\nworld\n")
+
+    def test_read(self):
+        with self.open(self.file_path, "rb") as f:
+            with self.mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                self.assertEqual(12, len(m))
+                self.assertEqual(12, m.size())
+                self.assertEqual(ord("h"), m[0])
+                self.assertEqual(ord("\n"), m[-1])
+                self.assertEqual(b"ello", m[1:5])
+                self.assertEqual(b"hlo", m[0:6:2])
+                self.assertEqual(b"hello\n", m.readline())
+                self.assertEqual(b"wo", m.read(2))
+                self.assertEqual(ord("r"), m.read_byte())
+                self.assertEqual(9, m.tell())
+                self.assertEqual(b"ld\n", m.read())
+                self.assertEqual(b"", m.read())
+                self.assertEqual([b"h", b"e"], list(m)[:2])
+
+    def test_find(self):
+        with self.open(self.file_path, "rb") as f:
+            with self.mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                self.assertEqual(4, m.find(b"o"))
+                self.assertEqual(7, m.find(b"o", 5))
+                self.assertEqual(-1, m.find(b"o", -3))
+                self.assertEqual(7, m.rfind(b"o"))
+                self.assertEqual(4, m.rfind(b"o", 0, 7))
+                m.seek(5)
+                self.assertEqual(7, m.find(b"o"))
+
+    def test_write_is_seen_by_file(self):
+        with self.open(self.file_path, "r+b") as f:
+            with self.mmap.mmap(f.fileno(), 0) as m:
+                m[0] = ord("j")
+                m[1:3] = b"EL"
+                m.seek(6)
+                self.assertEqual(5, m.write(b"WORLD"))
+                m.write_byte(ord("!"))
+                m.flush()
+            self.assertEqual(b"jELlo\nWORLD!", f.read())
+        with self.open(self.file_path, "rb") as f:
+            self.assertEqual(b"jELlo\nWORLD!", f.read())
+
+    def test_file_write_is_seen_by_map(self):
+        with self.open(self.file_path, "r+b") as f:
+            with self.mmap.mmap(f.fileno(), 0) as m:
+                f.write(b"HELLO")
+                f.flush()
+                self.assertEqual(b"HELLO\n", m.readline())
+
+    def test_move(self):
+        with self.open(self.file_path, "r+b") as f:
+            with self.mmap.mmap(f.fileno(), 0) as m:
+                m.move(0, 6, 5)
+                self.assertEqual(b"world\nworld\n", m[:])
+                with self.assertRaises(ValueError):
+                    m.move(10, 0, 5)
+
+    def test_copy_access_does_not_change_file(self):
+        with self.open(self.file_path, "rb") as f:
+            with self.mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY) as m:
+                m[0:5] = b"HELLO"
+                self.assertEqual(b"HELLO\n", m.readline())
+            self.assertEqual(b"hello\nworld\n", f.read())
+
+    def test_read_only_access(self):
+        with self.open(self.file_path, "rb") as f:
+            with self.mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                with self.assertRaises(TypeError):
+                    m[0] = 1
+                with self.assertRaises(TypeError):
+                    m.write(b"a")
+                with self.assertRaises(TypeError):
+                    m.resize(3)
+
+    def test_write_access_needs_writable_file(self):
+        with self.open(self.file_path, "rb") as f:
+            self.assert_raises_os_error(
+                errno.EACCES, self.mmap.mmap, f.fileno(), 0, access=mmap.ACCESS_WRITE
+            )
+
+    def test_map_with_offset(self):
+        size = mmap.ALLOCATIONGRANULARITY
+        self.create_file(self.file_path, contents=b"a" * size + b"bcd")
+        with self.open(self.file_path, "r+b") as f:
+            with self.mmap.mmap(f.fileno(), 2, offset=size) as m:
+                self.assertEqual(2, len(m))
+                self.assertEqual(b"bc", m[:])
+                m[1] = ord("X")
+            self.assertEqual(b"bXd", f.read()[size:])
+
+    def test_invalid_arguments(self):
+        with self.open(self.file_path, "r+b") as f:
+            with self.assertRaises(ValueError):
+                self.mmap.mmap(f.fileno(), 100)
+            with self.assertRaises(OverflowError):
+                self.mmap.mmap(f.fileno(), -1)
+            self.assert_raises_os_error(
+                errno.EINVAL, self.mmap.mmap, f.fileno(), 0, offset=3
+            )
+        empty_path = self.make_path("empty")
+        self.create_file(empty_path)
+        with self.open(empty_path, "rb") as f:
+            with self.assertRaises(ValueError):
+                self.mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def test_out_of_range(self):
+        with self.open(self.file_path, "r+b") as f:
+            with self.mmap.mmap(f.fileno(), 0) as m:
+                with self.assertRaises(IndexError):
+                    m[12]
+                with self.assertRaises(IndexError):
+                    m[0:2] = b"abc"
+                with self.assertRaises(ValueError):
+                    m.seek(13)
+                m.seek(10)
+                with self.assertRaises(ValueError):
+                    m.write(b"abc")
+                m.seek(0, 2)
+                with self.assertRaises(ValueError):
+                    m.read_byte()
+                with self.assertRaises(ValueError):
+                    m.flush(0, 100)
+
+    def test_closed_map(self):
+        with self.open(self.file_path, "rb") as f:
+            m = self.mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.assertFalse(m.closed)
+            m.close()
+            self.assertTrue(m.closed)
+            with self.assertRaises(ValueError):
+                m.read()
+            with self.assertRaises(ValueError):
+                len(m)
+
+    def test_map_stays_valid_after_closing_file(self):
+        with self.open(self.file_path, "r+b") as f:
+            m = self.mmap.mmap(f.fileno(), 0)
+        with m:
+            m[0:5] = b"HELLO"
+        with self.open(self.file_path, "rb") as f:
+            self.assertEqual(b"HELLO\nworld\n", f.read())
+
+    def test_resize(self):
+        self.check_linux_only()
+        with self.open(self.file_path, "r+b") as f:
+            with self.mmap.mmap(f.fileno(), 0) as m:
+                m.resize(5)
+                self.assertEqual(5, len(m))
+                self.assertEqual(5, m.size())
+                self.assertEqual(b"hello", f.read())
+                m.resize(7)
+                self.assertEqual(b"hello\x00\x00", m[:])
+        self.assertEqual(7, self.os.path.getsize(self.file_path))
+
+    def test_bytes(self):
+        with self.open(self.file_path, "rb") as f:
+            with self.mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                self.assertEqual(b"hello\nworld\n", bytes(m))
+
+    @unittest.skipIf(sys.version_info < (3, 12), "buffer protocol needs Python 3.12")
+    def test_struct_unpack_from(self):
+        with self.open(self.file_path, "rb") as f:
+            with self.mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                self.assertEqual((b"hello", 10), struct.unpack_from("5sB", m))
+                self.assertEqual((b"world",), struct.unpack_from("5s", m, 6))
+
+    @unittest.skipIf(sys.version_info < (3, 12), "buffer protocol needs Python 3.12")
+    def test_memoryview(self):
+        with self.open(self.file_path, "r+b") as f:
+            with self.mmap.mmap(f.fileno(), 0) as m:
+                with memoryview(m) as view:
+                    self.assertEqual(12, len(view))
+                    self.assertFalse(view.readonly)
+                    self.assertEqual(b"hello", view[:5])
+                    view[:5] = b"HELLO"
+                    with self.assertRaises(BufferError):
+                        m.close()
+                self.assertEqual(b"HELLO\n", m.readline())
+            self.assertEqual(b"HELLO\nworld\n", f.read())
+
+    @unittest.skipIf(sys.version_info < (3, 12), "buffer protocol needs Python 3.12")
+    def test_read_only_memoryview(self):
+        with self.open(self.file_path, "rb") as f:
+            with self.mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                with memoryview(m) as view:
+                    self.assertTrue(view.readonly)
+                    self.assertEqual(b"world", view[6:11])
+
+    def test_anonymous_map(self):
+        with self.mmap.mmap(-1, 10) as m:
+            m[:3] = b"abc"
+            self.assertEqual(b"abc", m[:3])
+
+
+class RealMmapModuleTest(FakeMmapModuleTest):
+    def use_real_fs(self):
+        return True
+
+
+class PatchedMmapTest(unittest.TestCase):
+    def test_mmap_is_patched(self):
+        with Patcher() as patcher:
+            patcher.fs.create_file("/foo", contents=b"test")
+            with open("/foo", "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                    self.assertEqual(b"test", m[:])
+
+    def test_maps_are_instances_of_mmap_class(self):
+        with Patcher() as patcher:
+            patcher.fs.create_file("/foo", contents=b"test")
+            with open("/foo", "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                    self.assertIsInstance(m, mmap.mmap)
+            with mmap.mmap(-1, 10) as m:
+                self.assertIsInstance(m, mmap.mmap)
+                self.assertNotIsInstance(m, FakeMmap)
+            self.assertTrue(issubclass(RealMmapSubclass, mmap.mmap))
+
+    def test_subclass_of_mmap_class(self):
+        with Patcher() as patcher:
+
+            class MmapSubclass(mmap.mmap):
+                def first_byte(self):
+                    return self[0]
+
+            patcher.fs.create_file("/foo", contents=b"test")
+            with open("/foo", "r+b") as f:
+                with MmapSubclass(f.fileno(), 0) as m:
+                    self.assertIsInstance(m, mmap.mmap)
+                    self.assertEqual(ord("t"), m.first_byte())
+                    m[0] = ord("b")
+                self.assertEqual(b"best", f.read())
+            with MmapSubclass(-1, 10) as m:
+                m[0] = ord("a")
+                self.assertEqual(ord("a"), m.first_byte())
+
+    def test_real_subclass_is_usable(self):
+        with Patcher():
+            with RealMmapSubclass(-1, 10) as m:
+                self.assertIsInstance(m, mmap.mmap)
+                m[0] = ord("a")
+                self.assertEqual(b"a", m[:1])
+
+
+class RealMmapSubclass(mmap.mmap):
+    pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,6 +15,7 @@
 
 """Unit tests for fake_open.FakeOsModule."""
 
+import array
 import errno
 import io
 import os
@@ -25,6 +26,7 @@ import unittest
 
 from pyfakefs import fake_filesystem, helpers
 from pyfakefs.helpers import is_root, IS_PYPY, get_locale_encoding
+from pyfakefs.fake_file import FakeFileIO
 from pyfakefs.fake_io import FakeIoModule
 from pyfakefs.fake_filesystem_unittest import PatchMode, Patcher
 from pyfakefs.tests.skipped_pathlib import read_open
@@ -435,6 +437,53 @@ class FakeFileOpenTest(FakeFileOpenTestBase):
             self.assertEqual(b"", fake_file.read())
             self.assertEqual("ab+", fake_file.mode)
 
+    def test_iterate_over_file_with_aplus(self):
+        file_path = self.make_path("aplus_file")
+        self.create_file(file_path, contents="line 1\n")
+        with self.open(file_path, "a+", encoding="utf8") as f:
+            f.write("line 2\n")
+            f.seek(0)
+            self.assertEqual(["line 1\n", "line 2\n"], list(f))
+            f.write("line 3\n")
+            self.assertEqual([], list(f))
+
+    def test_readinto_with_aplus_binary(self):
+        file_path = self.make_path("aplus_file")
+        self.create_file(file_path, contents=b"abc")
+        with self.open(file_path, "ab+") as f:
+            f.write(b"def")
+            f.seek(2)
+            buffer = bytearray(3)
+            self.assertEqual(3, f.readinto(buffer))
+            self.assertEqual(b"cde", buffer)
+            self.assertEqual(5, f.tell())
+            self.assertEqual(b"f", f.read1())
+
+    def test_readinto_after_write_by_other_instance(self):
+        file_path = self.make_path("foo")
+        self.create_file(file_path, contents=b"abc")
+        with self.open(file_path, "rb", buffering=0) as reader:
+            buffer = bytearray(4)
+            self.assertEqual(2, reader.readinto(memoryview(buffer)[:2]))
+            with self.open(file_path, "ab") as writer:
+                writer.write(b"def")
+            self.assertEqual(4, reader.readinto(buffer))
+            self.assertEqual(b"cdef", buffer)
+            self.assertEqual(6, reader.tell())
+            self.assertEqual(0, reader.readinto(buffer))
+            reader.seek(1)
+            self.assertEqual(b"bcdef", reader.read())
+
+    def test_readinto_non_byte_buffer(self):
+        file_path = self.make_path("foo")
+        self.create_file(file_path, contents=b"\x01\x00\x00\x00" * 3)
+        with self.open(file_path, "rb") as f:
+            buffer = array.array("i", [0, 0])
+            self.assertEqual(8, f.readinto(buffer))
+            self.assertEqual([1, 1], buffer.tolist())
+            self.assertEqual(4, f.readinto(buffer))
+            self.assertEqual([1, 1], buffer.tolist())
+
     def test_read_with_rplus(self):
         # set up
         file_path = self.make_path("rplus_file")
@@ -790,6 +839,94 @@ class FakeFileOpenTest(FakeFileOpenTestBase):
                 f1.flush()
                 self.assertEqual(4, self.os.path.getsize(file_path))
 
+    def test_read_appended_contents_from_other_instance(self):
+        file_path = self.make_path("log")
+        with self.open(file_path, "ab") as writer:
+            with self.open(file_path, "rb") as reader:
+                for i in range(3):
+                    line = b"line %d\n" % i
+                    writer.write(line)
+                    writer.flush()
+                    self.assertEqual(line, reader.read())
+                self.assertEqual(b"", reader.read())
+                reader.seek(0)
+                self.assertEqual(b"line 0\nline 1\nline 2\n", reader.read())
+
+    def test_read_appended_text_from_other_instance(self):
+        file_path = self.make_path("log")
+        with self.open(file_path, "a", encoding="utf8") as writer:
+            with self.open(file_path, "r", encoding="utf8") as reader:
+                writer.write("äöü\n")
+                writer.flush()
+                self.assertEqual("äöü\n", reader.readline())
+                writer.write("line 2\n")
+                writer.flush()
+                self.assertEqual("line 2\n", reader.readline())
+                self.assertEqual("", reader.readline())
+
+    def test_read_overwritten_contents_from_other_instance(self):
+        file_path = self.make_path("log")
+        with self.open(file_path, "wb") as writer:
+            with self.open(file_path, "rb", buffering=0) as reader:
+                writer.write(b"abcdef")
+                writer.flush()
+                self.assertEqual(b"abc", reader.read(3))
+                writer.seek(1)
+                writer.write(b"XYZ")
+                writer.flush()
+                reader.seek(0)
+                self.assertEqual(b"aXYZef", reader.read())
+                writer.truncate(2)
+                reader.seek(0)
+                self.assertEqual(b"aX", reader.read())
+
+    def test_append_to_existing_text_file(self):
+        file_path = self.make_path("log")
+        self.create_file(file_path, contents="first\n")
+        with self.open(file_path, "a", encoding="utf8") as f:
+            self.assertEqual(6, f.tell())
+            f.write("second\n")
+            self.assertEqual(13, f.tell())
+            f.flush()
+            with self.open(file_path, encoding="utf8") as reader:
+                self.assertEqual("first\nsecond\n", reader.read())
+            f.write("third\n")
+        with self.open(file_path, encoding="utf8") as f:
+            self.assertEqual("first\nsecond\nthird\n", f.read())
+
+    def test_append_to_existing_binary_file(self):
+        file_path = self.make_path("log")
+        self.create_file(file_path, contents=b"abc")
+        with self.open(file_path, "ab") as f:
+            self.assertEqual(3, f.tell())
+            f.write(b"def")
+            self.assertEqual(6, f.tell())
+        with self.open(file_path, "rb") as f:
+            self.assertEqual(b"abcdef", f.read())
+
+    def test_append_from_two_instances(self):
+        file_path = self.make_path("log")
+        self.create_file(file_path, contents=b"0")
+        with self.open(file_path, "ab") as writer1:
+            with self.open(file_path, "ab") as writer2:
+                writer1.write(b"1")
+                writer1.flush()
+                writer2.write(b"2")
+                writer2.flush()
+                writer1.write(b"3")
+        with self.open(file_path, "rb") as f:
+            self.assertEqual(b"0123", f.read())
+
+    def test_truncate_existing_file_in_append_mode(self):
+        file_path = self.make_path("log")
+        self.create_file(file_path, contents=b"abcdef")
+        with self.open(file_path, "ab") as f:
+            f.write(b"gh")
+            f.truncate(4)
+            f.write(b"ij")
+        with self.open(file_path, "rb") as f:
+            self.assertEqual(b"abcdij", f.read())
+
     def test_getsize_after_truncate(self):
         # Regression test for #412
         file_path = self.make_path("foo")
@@ -1082,6 +1219,56 @@ class RealFileOpenTest(FakeFileOpenTest):
         return True
 
 
+class NativeIoFileOpenTest(FakeFileOpenTest):
+    """Runs the open tests using the standard io classes
+    on top of the fake unbuffered file stream."""
+
+    def setUp(self):
+        super().setUp()
+        self.filesystem.use_native_io = True
+
+    def test_standard_io_classes_are_used(self):
+        file_path = self.make_path("foo")
+        self.create_file(file_path, contents="test")
+        with self.open(file_path, encoding="utf8") as f:
+            self.assertIsInstance(f, io.TextIOWrapper)
+            self.assertIsInstance(f.buffer, io.BufferedReader)
+            self.assertIsInstance(f.buffer.raw, FakeFileIO)
+            self.assertEqual("r", f.mode)
+            self.assertEqual(file_path, f.name)
+        with self.open(file_path, "r+b") as f:
+            self.assertIsInstance(f, io.BufferedRandom)
+            self.assertEqual("rb+", f.mode)
+        with self.open(file_path, "ab", buffering=0) as f:
+            self.assertIsInstance(f, FakeFileIO)
+            self.assertEqual("ab", f.mode)
+        with self.assertRaises(ValueError):
+            self.open(file_path, "w", buffering=0, encoding="utf8")
+
+    def test_contents_are_written_on_flush(self):
+        file_path = self.make_path("foo")
+        with self.open(file_path, "w", encoding="utf8") as f:
+            f.write("test")
+            self.assertEqual(0, self.os.path.getsize(file_path))
+            f.flush()
+            self.assertEqual(4, self.os.path.getsize(file_path))
+            f.seek(6)
+            f.write("x")
+        self.check_contents(file_path, b"test\0\0x")
+
+    def test_low_level_access_via_file_descriptor(self):
+        file_path = self.make_path("foo")
+        self.create_file(file_path, contents=b"abcdef")
+        with self.open(file_path, "r+b") as f:
+            fd = f.fileno()
+            self.assertEqual(b"ab", self.os.read(fd, 2))
+            self.os.lseek(fd, 4, os.SEEK_SET)
+            self.assertEqual(1, self.os.write(fd, b"X"))
+            f.seek(0)
+            self.assertEqual(b"abcdXf", f.read())
+        self.assert_raises_os_error(errno.EBADF, self.os.read, fd, 1)
+
+
 class FakeFileOpenWithOpenerTest(FakeFileOpenTestBase):
     def opener(self, path, flags):
         return self.os.open(path, flags)
@@ -1511,6 +1698,32 @@ class BufferingModeTest(FakeFileOpenTestBase):
                 lines = f.readlines()
                 self.assertEqual(line_count, len(lines))
 
+    def test_overwriting_with_specific_buffer(self):
+        file_path = self.make_path("buffertest.bin")
+        self.create_file(file_path, contents=b"a" * 3000)
+        with self.open(file_path, "r+b", buffering=512) as f:
+            f.seek(1000)
+            f.write(b"b" * 600)
+            f.write(b"c" * 10)
+            with self.open(file_path, "rb") as r:
+                x = r.read()
+                # buffer exceeded -> written at the correct position
+                self.assertEqual(b"a" * 1000 + b"b" * 600 + b"a" * 1400, x)
+        with self.open(file_path, "rb") as r:
+            x = r.read()
+            self.assertEqual(b"a" * 1000 + b"b" * 600 + b"c" * 10 + b"a" * 1390, x)
+
+    def test_writing_after_reading_in_update_mode(self):
+        file_path = self.make_path("buffertest.bin")
+        self.create_file(file_path, contents=b"a" * 100)
+        with self.open(file_path, "r+b") as f:
+            self.assertEqual(b"a" * 10, f.read(10))
+            f.write(b"bc")
+            self.assertEqual(b"a" * 10, f.read(10))
+            f.write(b"d" * 100)
+        with self.open(file_path, "rb") as r:
+            self.assertEqual(b"a" * 10 + b"bc" + b"a" * 10 + b"d" * 100, r.read())
+
 
 class RealBufferingTest(BufferingModeTest):
     def use_real_fs(self):
@@ -19,6 +19,7 @@ import errno
 import os
 import stat
 import sys
+import threading
 import unittest
 
 from pyfakefs import fake_filesystem, fake_os, fake_open, fake_file
@@ -2961,6 +2962,83 @@ class FakeOsModuleTest(FakeOsModuleTestBase):
         self.os.close(read_fd)
         self.os.close(write_fd)
 
+    def test_read_from_pipe_with_closed_writer(self):
+        read_fd, write_fd = self.os.pipe()
+        self.os.write(write_fd, b"test")
+        self.os.close(write_fd)
+        self.assertEqual(b"te", self.os.read(read_fd, 2))
+        self.assertEqual(b"st", self.os.read(read_fd, 10))
+        self.assertEqual(b"", self.os.read(read_fd, 10))
+        self.os.close(read_fd)
+
+    def test_read_from_pipe_with_duplicated_writer(self):
+        read_fd, write_fd = self.os.pipe()
+        dup_fd = self.os.dup(write_fd)
+        self.os.close(write_fd)
+        self.os.write(dup_fd, b"test")
+        self.assertEqual(b"test", self.os.read(read_fd, 10))
+        self.os.close(dup_fd)
+        self.assertEqual(b"", self.os.read(read_fd, 10))
+        self.os.close(read_fd)
+
+    def test_closed_pipe_fds_are_reused(self):
+        read_fd, write_fd = self.os.pipe()
+        self.os.close(read_fd)
+        self.os.close(write_fd)
+        fds = self.os.pipe()
+        self.os.close(fds[0])
+        self.os.close(fds[1])
+        self.assertEqual((read_fd, write_fd), fds)
+
+    def test_write_to_pipe_with_closed_reader(self):
+        read_fd, write_fd = self.os.pipe()
+        self.os.close(read_fd)
+        self.assert_raises_os_error(errno.EPIPE, self.os.write, write_fd, b"test")
+        self.os.close(write_fd)
+
+    def test_non_blocking_pipe(self):
+        self.check_linux_only()
+        read_fd, write_fd = self.os.pipe()
+        self.assertTrue(self.os.get_blocking(read_fd))
+        self.os.set_blocking(read_fd, False)
+        self.os.set_blocking(write_fd, False)
+        self.assertFalse(self.os.get_blocking(read_fd))
+        self.assert_raises_os_error(errno.EAGAIN, self.os.read, read_fd, 10)
+        self.assertEqual(65536, self.os.write(write_fd, b"x" * 100000))
+        self.assert_raises_os_error(errno.EAGAIN, self.os.write, write_fd, b"x")
+        self.assertEqual(4096, len(self.os.read(read_fd, 4096)))
+        self.assertEqual(4096, self.os.write(write_fd, b"y" * 5000))
+        self.assert_raises_os_error(errno.EAGAIN, self.os.write, write_fd, b"y")
+        self.assertEqual(b"x" * 61440 + b"y" * 4096, self.os.read(read_fd, 100000))
+        self.os.close(read_fd)
+        self.os.close(write_fd)
+
+    def test_pipe2(self):
+        self.check_linux_only()
+        read_fd, write_fd = self.os.pipe2(os.O_NONBLOCK)
+        self.assertFalse(self.os.get_blocking(read_fd))
+        self.assertFalse(self.os.get_blocking(write_fd))
+        self.assert_raises_os_error(errno.EAGAIN, self.os.read, read_fd, 10)
+        self.os.close(read_fd)
+        self.os.close(write_fd)
+
+    def test_blocking_pipe_with_threads(self):
+        read_fd, write_fd = self.os.pipe()
+        contents = b"x" * 200000
+
+        def write_contents():
+            self.os.write(write_fd, contents)
+            self.os.close(write_fd)
+
+        writer = threading.Thread(target=write_contents)
+        writer.start()
+        read_contents = b""
+        while chunk := self.os.read(read_fd, 50000):
+            read_contents += chunk
+        writer.join()
+        self.assertEqual(contents, read_contents)
+        self.os.close(read_fd)
+
     def test_truncate(self):
         file_path = self.make_path("foo", "bar")
         self.create_file(file_path, contents="012345678901234567")
@@ -2980,6 +3058,12 @@ class FakeOsModuleTest(FakeOsModuleTestBase):
         with self.open(file_path, encoding="utf8") as f:
             self.assertEqual("0123456789" + "\0" * 10, f.read())
 
+    def test_truncate_empty_file_to_larger(self):
+        file_path = self.make_path("foo", "bar")
+        self.create_file(file_path)
+        self.os.truncate(file_path, 3)
+        self.check_contents(file_path, b"\0\0\0")
+
     def test_truncate_with_fd(self):
         if os.truncate not in os.supports_fd:
             self.skip_real_fs()
@@ -3007,6 +3091,113 @@ class FakeOsModuleTest(FakeOsModuleTestBase):
         with self.open(file_path, encoding="utf8") as f:
             self.assertEqual("0123456789", f.read())
 
+    def test_ftruncate_file_descriptor(self):
+        file_path = self.make_path("some_file")
+        self.create_file(file_path, contents="0123456789012345")
+        fd = self.os.open(file_path, os.O_RDWR)
+        try:
+            self.os.ftruncate(fd, 4)
+            self.assertEqual(4, self.os.fstat(fd).st_size)
+            self.os.lseek(fd, 2, os.SEEK_SET)
+            self.assertEqual(b"23", self.os.read(fd, 10))
+            self.os.ftruncate(fd, 6)
+            self.assertEqual(b"\0\0", self.os.read(fd, 10))
+        finally:
+            self.os.close(fd)
+
+    def test_ftruncate_read_only_file_descriptor(self):
+        file_path = self.make_path("some_file")
+        self.create_file(file_path, contents="0123456789")
+        fd = self.os.open(file_path, os.O_RDONLY)
+        try:
+            self.assert_raises_os_error(
+                errno.EBADF if self.is_windows else errno.EINVAL,
+                self.os.ftruncate,
+                fd,
+                0,
+            )
+        finally:
+            self.os.close(fd)
+        self.assertEqual(10, self.os.stat(file_path).st_size)
+
+    def test_pread_and_pwrite(self):
+        self.check_posix_only()
+        file_path = self.make_path("some_file")
+        self.create_file(file_path, contents=b"0123456789")
+        fd = self.os.open(file_path, os.O_RDWR)
+        try:
+            self.os.lseek(fd, 2, os.SEEK_SET)
+            self.assertEqual(b"567", self.os.pread(fd, 3, 5))
+            self.assertEqual(b"89", self.os.pread(fd, 5, 8))
+            self.assertEqual(b"", self.os.pread(fd, 5, 20))
+            self.assertEqual(2, self.os.pwrite(fd, b"ab", 4))
+            self.assertEqual(2, self.os.lseek(fd, 0, os.SEEK_CUR))
+            self.assertEqual(b"23ab6789", self.os.read(fd, 20))
+            self.assertEqual(1, self.os.pwrite(fd, b"c", 12))
+        finally:
+            self.os.close(fd)
+        with self.open(file_path, "rb") as f:
+            self.assertEqual(b"0123ab6789\0\0c", f.read())
+
+    def test_pread_and_pwrite_with_file_object(self):
+        self.check_posix_only()
+        file_path = self.make_path("some_file")
+        self.create_file(file_path, contents=b"0123456789")
+        with self.open(file_path, "r+b") as f:
+            f.seek(3)
+            self.os.pwrite(f.fileno(), b"ab", 0)
+            self.assertEqual(b"ab23", self.os.pread(f.fileno(), 4, 0))
+            self.assertEqual(b"345", f.read(3))
+        with self.open(file_path, "rb") as f:
+            self.assertEqual(b"ab23456789", f.read())
+
+    def test_positional_io_with_invalid_access(self):
+        self.check_posix_only()
+        file_path = self.make_path("some_file")
+        self.create_file(file_path, contents=b"0123456789")
+        fd = self.os.open(file_path, os.O_RDONLY)
+        try:
+            self.assert_raises_os_error(errno.EBADF, self.os.pwrite, fd, b"a", 0)
+            self.assert_raises_os_error(errno.EINVAL, self.os.pread, fd, 1, -1)
+            self.assert_raises_os_error(errno.EINVAL, self.os.pread, fd, -1, 0)
+        finally:
+            self.os.close(fd)
+        fd = self.os.open(file_path, os.O_WRONLY)
+        try:
+            self.assert_raises_os_error(errno.EBADF, self.os.pread, fd, 1, 0)
+        finally:
+            self.os.close(fd)
+
+    def test_readv_and_writev(self):
+        self.check_posix_only()
+        file_path = self.make_path("some_file")
+        fd = self.os.open(file_path, os.O_RDWR | os.O_CREAT)
+        try:
+            self.assertEqual(7, self.os.writev(fd, [b"abc", bytearray(b"defg")]))
+            self.os.lseek(fd, 1, os.SEEK_SET)
+            buffers = [bytearray(2), bytearray(3), bytearray(3)]
+            self.assertEqual(6, self.os.readv(fd, buffers))
+            self.assertEqual([b"bc", b"def", b"g\0\0"], buffers)
+            self.assertEqual(0, self.os.readv(fd, buffers))
+        finally:
+            self.os.close(fd)
+
+    def test_preadv_and_pwritev(self):
+        self.check_posix_only()
+        if not hasattr(os, "preadv"):
+            raise unittest.SkipTest("preadv not available")
+        file_path = self.make_path("some_file")
+        self.create_file(file_path, contents=b"0123456789")
+        fd = self.os.open(file_path, os.O_RDWR)
+        try:
+            self.assertEqual(4, self.os.pwritev(fd, [b"ab", b"cd"], 3))
+            buffers = [bytearray(3), bytearray(5)]
+            self.assertEqual(8, self.os.preadv(fd, buffers, 1))
+            self.assertEqual([b"12a", b"bcd78"], buffers)
+            self.assertEqual(0, self.os.lseek(fd, 0, os.SEEK_CUR))
+        finally:
+            self.os.close(fd)
+
     def test_capabilities(self):
         """Make sure that the fake capabilities are the same as the real ones."""
         self.assertEqual(
@@ -3081,6 +3272,24 @@ class FakeOsModuleTest(FakeOsModuleTestBase):
         self.assertEqual(fd1 + 1, fd3)
         self.assertEqual(fd1 + 3, fd4)
 
+    def test_dup2_with_high_fd(self):
+        file_path = self.make_path("foo.txt")
+        self.create_file(file_path, contents="foo")
+        fd1 = self.os.open(file_path, os.O_RDONLY)
+        fd2 = fd1 + 100
+        self.assertEqual(fd2, self.os.dup2(fd1, fd2))
+        fd3 = self.os.open(file_path, os.O_RDONLY)
+        self.assertEqual(fd1 + 1, fd3)
+        self.assertEqual(b"foo", self.os.read(fd2, 3))
+        self.os.close(fd2)
+        with self.assertRaises(OSError) as cm:
+            self.os.read(fd2, 3)
+        self.assertEqual(errno.EBADF, cm.exception.errno)
+        self.os.close(fd3)
+        self.assertEqual(fd3, self.os.dup(fd1))
+        self.os.close(fd3)
+        self.os.close(fd1)
+
     @unittest.skipIf(sys.version_info < (3, 14), "Introduced in Python 3.14")
     def test_readinto(self):
         file_path = self.make_path("foo", "bar.txt")
@@ -4686,6 +4895,54 @@ class FakeOsModuleLowLevelFileOpTest(FakeOsModuleTestBase):
         with self.open(dst_file_path, encoding="utf8") as f:
             self.assertEqual("testcon", f.read())
 
+    def test_sendfile_whole_file(self):
+        self.check_linux_only()
+        src_file_path = self.make_path("foo")
+        dst_file_path = self.make_path("bar")
+        self.create_file(src_file_path, "testcontent")
+        fd1 = self.os.open(src_file_path, os.O_RDONLY)
+        fd2 = self.os.open(dst_file_path, os.O_WRONLY | os.O_CREAT)
+        self.assertEqual(11, self.os.sendfile(fd2, fd1, 0, 100))
+        self.assertEqual(0, self.os.sendfile(fd2, fd1, 11, 100))
+        self.assertEqual(11, self.os.lseek(fd2, 0, os.SEEK_CUR))
+        self.assertEqual(0, self.os.lseek(fd1, 0, os.SEEK_CUR))
+        self.os.write(fd2, b"!")
+        self.os.close(fd2)
+        self.os.close(fd1)
+        self.check_contents(src_file_path, "testcontent")
+        self.check_contents(dst_file_path, "testcontent!")
+
+    def test_copy_file_range(self):
+        self.check_linux_only()
+        src_file_path = self.make_path("foo")
+        dst_file_path = self.make_path("bar")
+        self.create_file(src_file_path, "testcontent")
+        self.create_file(dst_file_path, "0123")
+        fd1 = self.os.open(src_file_path, os.O_RDONLY)
+        fd2 = self.os.open(dst_file_path, os.O_RDWR)
+        self.assertEqual(4, self.os.copy_file_range(fd1, fd2, 4))
+        self.assertEqual(4, self.os.copy_file_range(fd1, fd2, 4, 4, 6))
+        self.assertEqual(7, self.os.copy_file_range(fd1, fd2, 10, None, 10))
+        self.assertEqual(0, self.os.copy_file_range(fd1, fd2, 10, 11))
+        self.assertEqual(4, self.os.lseek(fd2, 0, os.SEEK_CUR))
+        self.assertEqual(11, self.os.lseek(fd1, 0, os.SEEK_CUR))
+        self.os.close(fd2)
+        self.os.close(fd1)
+        self.check_contents(dst_file_path, b"test\x00\x00contcontent")
+
+    def test_copy_file_range_with_invalid_fd(self):
+        self.check_linux_only()
+        src_file_path = self.make_path("foo")
+        dst_file_path = self.make_path("bar")
+        self.create_file(src_file_path, "testcontent")
+        self.create_file(dst_file_path)
+        fd1 = self.os.open(src_file_path, os.O_RDONLY)
+        fd2 = self.os.open(dst_file_path, os.O_WRONLY | os.O_APPEND)
+        self.assert_raises_os_error(errno.EBADF, self.os.copy_file_range, fd2, fd1, 4)
+        self.assert_raises_os_error(errno.EBADF, self.os.copy_file_range, fd1, fd2, 4)
+        self.os.close(fd2)
+        self.os.close(fd1)
+
     @unittest.skipIf(not TestCase.is_macos, "Testing MacOs only behavior")
     def test_no_sendfile_to_regular_file_under_macos(self):
         src_file_path = self.make_path("foo")
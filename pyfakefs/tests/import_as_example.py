@@ -125,3 +125,7 @@ class TestDefaultArg:
     def check_if_exists(self, filepath, file_exists=my_os.path.exists):
         # this is a similar case as in the tempfile implementation under Posix
         return file_exists(filepath)
+
+    @staticmethod
+    def check_if_isfile(filepath, file_isfile=my_os.path.isfile):
+        return file_isfile(filepath)